@@ -1,6 +1,7 @@
 import os
 import sys
 import ctypes
+import multiprocessing
 
 # --- WINDOWS DPI FIX ---
 if os.name == 'nt':
@@ -15,11 +16,16 @@ if os.name == 'nt':
 import arcade
 from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE
 from src.views.start_view import StartView
+from src.managers.map_cache import get_map_cache
+from src.map.expansion_planner import ExpansionPlanner
 
 
 def main():
     """ Main entry point for the game """
 
+    # Map cache workers re-launch the executable when frozen
+    multiprocessing.freeze_support()
+
     # PyInstaller Setup
     if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
         os.chdir(sys._MEIPASS)
@@ -57,6 +63,11 @@ def main():
             # Some other crash
             raise e
 
+    finally:
+        # 4. Stop the background workers (map cache, expansion planning) with the window
+        get_map_cache().shutdown()
+        ExpansionPlanner.shutdown()
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -6,6 +6,10 @@ TILE_SIZE = 20
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 
+# World position of the bottom-left corner of grid cell (0, 0)
+MAP_ORIGIN_X = 0
+MAP_ORIGIN_Y = 0
+
 # Game Economy Constants
 STARTING_MONEY = 100
 STARTING_LIVES = 20
@@ -23,6 +27,19 @@ COLOR_GOAL = arcade.color.RED
 COLOR_BORDER = (46, 38, 25, 255)
 COLOR_BACKGROUND = (20, 20, 20, 255)
 
+# Numeric code of each tile state, used by the map's NumPy grids
+TILE_STATE_CODES = {
+    "empty": 0,
+    "path": 1,
+    "spawn": 2,
+    "goal": 3,
+    "border": 4,
+}
+TILE_STATE_NAMES = {code: state for state, code in TILE_STATE_CODES.items()}
+
+# States enemies can walk on (and that tunnels connect to)
+WALKABLE_STATE_CODES = [TILE_STATE_CODES["path"], TILE_STATE_CODES["spawn"], TILE_STATE_CODES["goal"]]
+
 # Map each tile state to an RGBA color
 TILE_COLORS = {
     "empty": COLOR_EMPTY,
@@ -101,6 +118,8 @@ TOWER_SIZE = (TILE_SIZE-5, TILE_SIZE-5)
 RANGE_DISPLAY_OPACITY = 50     # out of 255
 TARGET_DOT_RADIUS = 2
 COOLDOWN_OPACITY_LIMIT = 230
+GHOST_VALID_TINT = (120, 255, 120)     # placement preview over a buildable tile
+GHOST_INVALID_TINT = (255, 90, 90)     # placement preview over a blocked tile
 
 # Base tower constants
 BASE_TOWER_DAMAGE = 50
@@ -119,6 +138,19 @@ LASER_TOWER_FREQUENCY = .6
 LASER_TOWER_RANGE_RADIUS = 75
 LASER_TOWER_BEAM_LENGTH = 150
 
+# Maze-building mode: towers may block tunnel tiles as long as every spawn still reaches a goal
+MAZE_MODE = False
+
+# Towers only target enemies they can see (rock between tunnels blocks the view)
+TOWER_LINE_OF_SIGHT = False
+
+# Which enemy in range a tower shoots (right click a tower to cycle); the first mode is the default
+#   first / last: least / most route left to walk (flow field distance in maze mode), strongest / weakest: most / least health
+TARGET_PRIORITIES = ("first", "last", "strongest", "weakest", "closest")
+
+# Towers keep their target between full scans; the routine scans are spread round robin over this many frames
+TARGETING_SLICES = 6
+
 # NOTE: Some Tower Visual Constants are in visual_effect.py
 # Steam Puff parameters:
 TOWER_PUFF_SIZE_BASIC = 5       # <-- location (tower/enemy) at entry 1
@@ -131,6 +163,13 @@ BOOM_SPEED = 200
 BULLET_SPEED = 400
 CORRECTION_RATIO = 10
 
+# Projectile impacts are computed when fired and wait in a timing wheel until their sim time
+TIMING_WHEEL_SLOT = 1 / 60      # <-- seconds of sim time per slot
+TIMING_WHEEL_SLOTS = 128        # <-- slots per turn (a turn spans about 2 seconds)
+
+# Projectile sprites are cosmetic: past this many visual effects, new ones are not drawn at all
+MAX_VISUAL_EFFECTS = 400
+
 # Tower textures
 TOWER_TEXTURES = {
     "base": arcade.Texture(
@@ -182,6 +221,7 @@ GET_ENEMY_SPEED = lambda wave: 30 + (wave * 2)
 # 4. When should the map EXPAND?
 # Example: Expands every 5 waves (Wave 5, 10, 15...)
 SHOULD_EXPAND = lambda wave: (wave % 5 == 0)
+MAP_EXPANSION_SIZE = 6      # tiles added to the width and height per expansion
 
 # 5. When should we add a NEW SPAWN point?
 # Example: Adds a spawn every 4 waves (Wave 4, 8, 12...)
@@ -195,5 +235,55 @@ SHOULD_ADD_GOAL = lambda wave: (wave % 6 == 0)
 BASE_ENEMY_SPEED = 30
 BASE_ENEMY_HEALTH = 100
 
+# Minimap constants
+MINIMAP_SIZE = 160                  # longest side of the minimap in pixels
+MINIMAP_MARGIN = 10                 # gap to the bottom-left corner of the screen
+MINIMAP_ENEMY_REFRESH_RATE = 5      # enemy dot refreshes per second
+COLOR_MINIMAP_TOWER = (255, 215, 0, 255)
+COLOR_MINIMAP_ENEMY = (255, 40, 40, 255)
+
+# Camera zoom / level-of-detail constants
+ZOOM_MIN = 0.25
+ZOOM_MAX = 2.0
+ZOOM_STEP = 1.1                 # zoom factor per mouse-wheel notch
+LOD_ZOOM_THRESHOLD = 0.6        # below this zoom the map is drawn from the baked texture
+LOD_CELL_PIXELS = 2             # pixels per tile in the baked low-detail texture
+LOD_ENEMY_POINT_SIZE = 4        # on-screen size of an enemy point when zoomed out
+
+# Map thumbnail (contact sheet) constants
+THUMBNAIL_GAP = 4               # pixels between thumbnails
+THUMBNAIL_LABEL_HEIGHT = 12     # room under each thumbnail for its seed
+
+# Map cache constants
+MAP_DIFFICULTY = 4                      # difficulty of the starting map
+MAP_CACHE_POOL_SIZE = 3                 # pregenerated maps kept ready per size/difficulty
+MAP_CACHE_MAX_BYTES = 16 * 1024 * 1024  # oldest cached maps are evicted past this size
+
+# Job scheduler constants (heavy work spread over frames)
+JOB_FRAME_BUDGET_MS = 4         # time per frame spent on queued jobs
+JOB_PRIORITY_HIGH = 0           # lower value runs first
+JOB_PRIORITY_NORMAL = 1
+JOB_PRIORITY_LOW = 2
+JOB_STEP_NODES = 200            # search nodes / tiles handled between two yields
+
+# Map quality thresholds (seeds failing them are regenerated)
+MAP_QUALITY_MIN_BUILDABLE = 40      # cells a tower can be placed on
+MAP_QUALITY_MIN_COVERAGE = 0.95     # fraction of path tiles a base tower can reach
+MAP_QUALITY_MAX_CORRIDOR = 120      # longest unbranched stretch of tunnel, in tiles
+MAP_QUALITY_MAX_REROLLS = 5         # new seeds tried before keeping a map anyway
+
+# Tower coverage heatmap (toggled with C)
+COLOR_COVERAGE_LOW = (40, 70, 200, 255)     # little enemy traffic in range
+COLOR_COVERAGE_HIGH = (255, 90, 30, 255)    # the most traffic in range
+COLOR_COVERAGE_BEST = (255, 255, 255, 255)  # outline of the best cell
+COVERAGE_OVERLAY_ALPHA = 140
+
+# Map generator instrumentation
+MAP_STATS_ENABLED = False           # count DFS nodes, rejections and phase times on every Map
+
+# Map change reveal ("tunnel carving" animation)
+MAP_REVEAL_DURATION = 0.5       # seconds to show every tile of one map change
+MAP_REVEAL_FADE = 0.15          # seconds each tile takes to fade in
+
 # Debug Constants
 TARGET_DOT = False
@@ -0,0 +1,199 @@
+"""
+Headless contact-sheet renderer for seeded maps.
+
+Generates maps for a range of seeds on several processes and writes them
+as PNG contact sheets, so generator quality can be eyeballed across a large
+seed corpus. Run from the project root:
+
+    python -m src.dev.map_thumbnails --count 10000 --out thumbnails
+"""
+from src.constants import *
+from src.map.map_generator import Map
+from src.map.map_analysis import TOWER_RANGES, analyze_map, rejection_reasons
+from src.map.generation_stats import REJECTION_RULES
+from src.utils.map_raster import STATE_PALETTE
+from multiprocessing import Pool
+from pathlib import Path
+from PIL import Image, ImageDraw
+import numpy as np
+import argparse
+import csv
+import os
+
+
+def generate_state_grid(seed, width, height, difficulty, extra_spawns, extra_goals):
+    """
+    Generates one seeded map (main path plus branches), scores it and returns its state grid.
+
+    Args:
+        seed (int): Map seed
+        width (int): Map width in tiles
+        height (int): Map height in tiles
+        difficulty (int): Map difficulty (1-5)
+        extra_spawns (int): Extra spawns to add (each one carves a branch path)
+        extra_goals (int): Extra goals to add (each one carves a branch path)
+
+    Returns:
+        tuple(int, np.ndarray, dict): (seed, state grid, quality report)
+    """
+    tilemap = Map(width, height, difficulty=difficulty, seed=seed)
+    tilemap.stats.enabled = True
+    tilemap.recursive_path_generation(tilemap.spawns[0], tilemap.goals[0])
+    for _ in range(extra_spawns):
+        tilemap.generate_new_special_point("spawn")
+    for _ in range(extra_goals):
+        tilemap.generate_new_special_point("goal")
+
+    report = analyze_map(tilemap)
+    report["rejected"] = rejection_reasons(report)
+    report["generation"] = tilemap.stats.as_dict()
+    return seed, tilemap.state_grid.copy(), report
+
+
+def _generate_job(job):
+    """Pool entry point (pool.imap passes a single argument)."""
+    return generate_state_grid(*job)
+
+
+def paint_contact_sheet(grids, seeds, columns, cell_px, gap=THUMBNAIL_GAP, label=True, rejected=()):
+    """
+    Paints a page of equally sized state grids into one contact sheet.
+    All grids are colored in a single palette lookup.
+
+    Args:
+        grids (list[np.ndarray]): State grids, all (height, width)
+        seeds (list[int]): Seed of each grid (used for the labels)
+        columns (int): Thumbnails per row
+        cell_px (int): Pixels per tile
+        gap (int): Pixels between thumbnails
+        label (bool): Whether to print the seed under each thumbnail
+        rejected (set[int]): Seeds failing the quality checks (labelled in red)
+
+    Returns:
+        PIL.Image.Image: The contact sheet
+    """
+    count = len(grids)
+    rows = (count + columns - 1) // columns
+    grid_h, grid_w = grids[0].shape
+    label_h = THUMBNAIL_LABEL_HEIGHT if label else 0
+
+    # (count, h, w) -> (count, h, w, 4) in one lookup, flipped so y grows upwards
+    thumbs = STATE_PALETTE[np.stack(grids)][:, ::-1]
+    if cell_px > 1:
+        thumbs = np.repeat(np.repeat(thumbs, cell_px, axis=1), cell_px, axis=2)
+
+    thumb_h, thumb_w = grid_h * cell_px, grid_w * cell_px
+    step_x = thumb_w + gap
+    step_y = thumb_h + label_h + gap
+
+    sheet = np.zeros((rows * step_y + gap, columns * step_x + gap, 4), dtype=np.uint8)
+    sheet[..., :3] = COLOR_BACKGROUND[:3]
+    sheet[..., 3] = 255
+
+    for i in range(count):
+        top = gap + (i // columns) * step_y
+        left = gap + (i % columns) * step_x
+        sheet[top:top + thumb_h, left:left + thumb_w] = thumbs[i]
+
+    image = Image.fromarray(sheet, "RGBA")
+    if label:
+        draw = ImageDraw.Draw(image)
+        for i, seed in enumerate(seeds):
+            top = gap + (i // columns) * step_y + thumb_h
+            left = gap + (i % columns) * step_x
+            color = (255, 80, 80, 255) if seed in rejected else (200, 200, 200, 255)
+            draw.text((left, top), str(seed), fill=color)
+    return image
+
+
+def render_corpus(start_seed, count, width, height, difficulty=4, extra_spawns=1, extra_goals=1,
+                  columns=10, rows=10, cell_px=2, out_dir="thumbnails", workers=None):
+    """
+    Generates `count` seeded maps on a process pool and writes contact sheets,
+    plus scores.csv with the quality metrics and generator stats of every seed.
+
+    Returns:
+        list[Path]: The written sheet files
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    per_sheet = columns * rows
+    jobs = [(seed, width, height, difficulty, extra_spawns, extra_goals)
+            for seed in range(start_seed, start_seed + count)]
+    written = []
+
+    with Pool(processes=workers or os.cpu_count()) as pool, \
+            open(out_dir / "scores.csv", "w", newline="") as scores_file:
+        scores = csv.writer(scores_file)
+        scores.writerow(["seed", "path_tiles", "junctions", "branching_factor", "longest_corridor",
+                         "buildable_cells"] + [f"coverage_{t}" for t in TOWER_RANGES] + ["rejected"]
+                        + ["gen_ms", "dfs_nodes", "backtracks"] + [f"rejected_{r}" for r in REJECTION_RULES])
+        page_seeds, page_grids, page_rejected = [], [], set()
+
+        # imap keeps seed order, so each sheet is a contiguous seed range
+        for seed, grid, report in pool.imap(_generate_job, jobs, chunksize=16):
+            page_seeds.append(seed)
+            page_grids.append(grid)
+            if report["rejected"]:
+                page_rejected.add(seed)
+            gen = report["generation"]     # <-- branch time is already part of special_point
+
+            scores.writerow(
+                [seed, report["path_tiles"], report["junctions"], f"{report['branching_factor']:.4f}",
+                 report["longest_corridor"], report["buildable_cells"]]
+                + [f"{report['coverage'][t]:.3f}" for t in TOWER_RANGES]
+                + ["; ".join(report["rejected"])]
+                + [f"{(gen['phase_time'].get('main_path', 0) + gen['phase_time'].get('special_point', 0)) * 1000:.2f}", gen["nodes_expanded"], gen["backtracks"]]
+                + [gen["rejections"][r] for r in REJECTION_RULES]
+            )
+
+            if len(page_grids) == per_sheet:
+                written.append(_write_sheet(page_grids, page_seeds, columns, cell_px, out_dir, page_rejected))
+                page_seeds, page_grids, page_rejected = [], [], set()
+
+        if page_grids:
+            written.append(_write_sheet(page_grids, page_seeds, columns, cell_px, out_dir, page_rejected))
+
+    return written
+
+
+def _write_sheet(grids, seeds, columns, cell_px, out_dir, rejected=()):
+    """Paints and saves one contact sheet named after its seed range."""
+    path = out_dir / f"seeds_{seeds[0]:06d}-{seeds[-1]:06d}.png"
+    paint_contact_sheet(grids, seeds, columns, cell_px, rejected=rejected).save(path)
+    print(f"Wrote {path}")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render contact sheets of seeded maps.")
+    parser.add_argument("--start-seed", type=int, default=0)
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--width", type=int, default=SCREEN_WIDTH // TILE_SIZE)
+    parser.add_argument("--height", type=int, default=SCREEN_HEIGHT // TILE_SIZE)
+    parser.add_argument("--difficulty", type=int, default=4)
+    parser.add_argument("--extra-spawns", type=int, default=1)
+    parser.add_argument("--extra-goals", type=int, default=1)
+    parser.add_argument("--columns", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=10)
+    parser.add_argument("--cell-px", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default="thumbnails")
+    args = parser.parse_args()
+
+    render_corpus(
+        args.start_seed, args.count, args.width, args.height,
+        difficulty=args.difficulty,
+        extra_spawns=args.extra_spawns,
+        extra_goals=args.extra_goals,
+        columns=args.columns,
+        rows=args.rows,
+        cell_px=args.cell_px,
+        out_dir=args.out,
+        workers=args.workers,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,15 @@ from src.constants import *
 from src.map.map_generator import Map
 from src.entities.tile import Tile
 from src.entities.enemy import Enemy
+from src.map.polyline import Polyline
 from src.entities.tower import BaseTower, AOETower, LaserTower
 import arcade
 import arcade.gui
 import random
 from src.managers.game_manager import GameManager
+from src.managers.sound_manager import SoundManager
+from src.managers.timing_wheel import TimingWheel
+from src.managers.damage_buffer import DamageBuffer
 
 
 class MapViewer(arcade.Window):
@@ -41,6 +45,10 @@ class MapViewer(arcade.Window):
 
         # Initialize Managers
         self.game_manager = GameManager()
+        self.sound_manager = SoundManager()
+        self.sim_time = 0.0     # <-- clock the tower cooldowns run on
+        self.impacts = TimingWheel()
+        self.damage_buffer = DamageBuffer(self.game_manager)
 
         # GUI Camera
         # We use a second camera for the UI so it stays static
@@ -153,7 +161,7 @@ class MapViewer(arcade.Window):
 
         # Draw cooldown displays
         for tower in self.tower_list:
-            tower.cooldown_effect.draw()
+            tower.cooldown_effect.draw(self.sim_time)
 
         # Draw visual effects
         for vis in self.visual_effect_list:
@@ -171,13 +179,14 @@ class MapViewer(arcade.Window):
         # Update all enemies
         self.enemy_list.update()
 
-        # Update all towers
-        self.tower_list.update()
-
-        # Update tower detection
+        # Update tower detection (towers whose cooldown ended)
+        self.sim_time += delta_time
         for tower in self.tower_list:
-            tower.acquire_target(self.enemy_list)
-            tower.attack_update(delta_time, self.visual_effect_list)
+            if tower.ready_at <= self.sim_time:
+                tower.acquire_target(self.enemy_list)
+                tower.fire(self.sim_time, self.visual_effect_list, self.sound_manager)
+        self.impacts.advance(self.sim_time)
+        self.damage_buffer.resolve()
 
         # Update visual effects
         for vis in self.visual_effect_list[:]:
@@ -210,10 +219,9 @@ class MapViewer(arcade.Window):
         world_x, world_y, _ = world_point  # `unproject` returns a Vec3
 
         # get the tile on the position
-        clicked_tile = arcade.get_sprites_at_point(
-            (world_x, world_y),
-            self.background_list
-        )[0]
+        clicked_tile = self.map.get_tile_at(world_x, world_y)
+        if clicked_tile is None:
+            return
 
         # mouse left click
         if button == arcade.MOUSE_BUTTON_LEFT:
@@ -338,8 +346,8 @@ class MapViewer(arcade.Window):
             return
 
         # 3. Convert Tile objects to Pixel Coordinates for the Enemy class
-        # The Enemy needs [(x,y), (x,y)...] to move.
-        path_pixels = [(t.center_x, t.center_y) for t in path_tiles]
+        # The Enemy walks a Polyline through the tile centers.
+        path_pixels = Polyline([(t.center_x, t.center_y) for t in path_tiles])
 
         # 4. Create Enemy
         enemy = Enemy(
@@ -391,7 +399,6 @@ class MapViewer(arcade.Window):
                 tile.update_texture()
                 self.background_list.append(tile)
                 if tile.tower:
-                    tile.tower.update()
                     self.tower_list.append(tile.tower)
                     self.range_display_list.append(tile.tower.range_display)
                     self.range_display_list.append(tile.tower.target_dot)
@@ -416,7 +423,9 @@ class MapViewer(arcade.Window):
             return
 
         # add tower and link it to the tile
-        tile.link_tower(tower)
+        tower.impacts = self.impacts
+        tower.damage_buffer = self.damage_buffer
+        self.map.place_tower(tile, tower)
 
         # add tower to the tower list
         self.tower_list.append(tower)
@@ -1,7 +1,8 @@
 from src.constants import *
 from src.map.map_generator import Map
+from src.utils.map_raster import paint_state_grid
 import arcade
-from PIL import Image, ImageDraw
+from PIL import Image
 
 
 class MapViewer(arcade.Window):
@@ -100,41 +101,12 @@ class MapViewer(arcade.Window):
         texture_width = self.map.width * self.tile_size
         texture_height = self.map.height * self.tile_size
 
-        # Create a blank PIL image
-        img = Image.new("RGBA", (texture_width, texture_height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-
-        # Draw each tile onto the PIL image
-        for y in range(self.map.height):
-            for x in range(self.map.width):
-                cell = self.map.map[y][x]
-
-                if cell.color == 0:
-                    color = COLOR_EMPTY
-                elif cell.color == 1:
-                    color = COLOR_PATH
-                elif cell.color == 2:
-                    color = COLOR_SPAWN
-                elif cell.color == 3:
-                    color = COLOR_GOAL
-                elif cell.color == 4:
-                    color = COLOR_BORDER
-                else:
-                    color = arcade.color.BLACK
-
-                # Convert Arcade RGB tuple → PIL RGBA
-                rgba = (*color, 255)
-
-                # Draw pixel rect
-                left = x * self.tile_size
-                top = y * self.tile_size
-                right = left + self.tile_size - 1
-                bottom = top + self.tile_size - 1
-
-                draw.rectangle([left, top, right, bottom], fill=color)
+        # Paint the whole state grid in one vectorized pass
+        rgba = paint_state_grid(self.map.state_grid, cell_px=self.tile_size)
+        img = Image.fromarray(rgba, "RGBA")
 
         # Convert PIL image → Arcade texture
-        texture = arcade.Texture("map_texture", img)
+        texture = arcade.Texture(img)
 
         # Create sprite
         self.map_sprite = arcade.Sprite(
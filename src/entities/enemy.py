@@ -6,7 +6,7 @@ from src.ui.indicator_bar import IndicatorBar
 ASSETS_PATH = Path(__file__).parent.parent.parent / "assets"
 
 class Enemy(arcade.Sprite):
-    def __init__(self, path, game_manager, bar_list, health=BASE_ENEMY_HEALTH, damage=ENEMY_PENALTY, speed=BASE_ENEMY_SPEED, reward=ENEMY_REWARD):
+    def __init__(self, path, game_manager, bar_list, health=BASE_ENEMY_HEALTH, damage=ENEMY_PENALTY, speed=BASE_ENEMY_SPEED, reward=ENEMY_REWARD, occupancy=None, store=None):
         # 1. Load Texture
         super().__init__()
         # --- ANIMATION SETUP ---
@@ -38,16 +38,26 @@ class Enemy(arcade.Sprite):
         desired_size = TILE_SIZE * 1
         self.scale = desired_size / max(self.texture.width, self.texture.height)
 
-        self.path = path
+        self.path = path        # <-- Polyline walked, shared by every enemy on the same route
         self.game_manager = game_manager
 
+        # Row in the EnemyStore that simulates this enemy (None: it updates itself)
+        self.store = store
+        self.row = None
+
         # Stats
         self.max_health = health  # Track Max Health for percentage calc
         self.health = health
         self.damage = damage
         self.speed = speed
         self.reward = reward
-        self.current_point_index = 0
+        self.distance = 0.0     # <-- arc length travelled along the path
+        self.segment = 0        # <-- path segment the enemy is on
+        self.route = None       # <-- (RoutePlanner, goal) when walking a flow field (maze mode)
+
+        # Tile bucket for spatial queries (see OccupancyGrid)
+        self.occupancy = occupancy
+        self.cell = None
 
         # Setup Health Bar
         # We make it small (width=16) to fit the tile size (20)
@@ -62,9 +72,51 @@ class Enemy(arcade.Sprite):
         )
 
         # Set initial position
-        if self.path and len(self.path) > 0:
-            self.center_x, self.center_y = self.path[0]
+        if len(self.path) > 0:
+            self.center_x, self.center_y = self.path.point_at(0.0)
             self.indicator_bar.position = (self.center_x, self.center_y + 12)
+            if self.occupancy is not None:
+                self.occupancy.update_enemy(self)
+
+        if self.store is not None:
+            self.store.add(self)
+
+    @property
+    def health(self):
+        if self.row is None:
+            return self._health
+        return float(self.store.health[self.row])
+
+    @health.setter
+    def health(self, value):
+        if self.row is None:
+            self._health = value
+        else:
+            self.store.health[self.row] = value
+
+    @property
+    def sim_position(self):
+        """
+        Where the enemy is in the simulation. A stored enemy's sprite only
+        catches up when it is drawn, so gameplay reads this, not center_x / center_y.
+        """
+        if self.row is None:
+            return self.center_x, self.center_y
+        x, y = self.store.position[self.row].tolist()
+        return x, y
+
+    @property
+    def distance(self):
+        if self.row is None:
+            return self._distance
+        return float(self.store.distance[self.row])
+
+    @distance.setter
+    def distance(self, value):
+        if self.row is None:
+            self._distance = value
+        else:
+            self.store.distance[self.row] = value
 
     def deal_damage(self, ext_damage):
         self.health -= ext_damage
@@ -87,43 +139,36 @@ class Enemy(arcade.Sprite):
         # We must remove the health bar sprites when the enemy is removed!
         if self.indicator_bar:
             self.indicator_bar.kill()
+        if self.occupancy is not None:
+            self.occupancy.remove(self)
+        if self.store is not None:
+            self.store.remove(self)
         super().kill()
 
     def update(self, delta_time: float = 1 / 60):
         # 0. Safety Check
-        if not self.path or self.current_point_index >= len(self.path):
+        if len(self.path) == 0:
             return
 
-            # 1. Navigation Logic
-        target_point = self.path[self.current_point_index]
-        dest_x, dest_y = target_point
-
-        start_x = self.center_x
-        start_y = self.center_y
-
-        x_diff = dest_x - start_x
-        y_diff = dest_y - start_y
-
-        distance = math.sqrt(x_diff ** 2 + y_diff ** 2)
-        move_distance = self.speed * delta_time
+        # 1. Navigation Logic: walk along the path, moving to the next segment when past its end
+        self.distance += self.speed * delta_time
+        if self.distance >= self.path.segment(self.segment)[3] and not self.advance_segment():
+            return
+        start, direction, segment_start, _ = self.path.segment(self.segment)
+        offset = self.distance - segment_start
 
         # 2. Determine Facing Direction
-        if x_diff > 0.1:
+        if direction[0] > 0:
             self.facing_right = True
-        elif x_diff < -0.1:
+        elif direction[0] < 0:
             self.facing_right = False
 
         # 3. Move
-        if distance <= move_distance:
-            self.center_x = dest_x
-            self.center_y = dest_y
-            self.current_point_index += 1
-            if self.current_point_index >= len(self.path):
-                self.reach_goal()
-        else:
-            angle_rad = math.atan2(y_diff, x_diff)
-            self.center_x += math.cos(angle_rad) * move_distance
-            self.center_y += math.sin(angle_rad) * move_distance
+        self.center_x = float(start[0] + direction[0] * offset)
+        self.center_y = float(start[1] + direction[1] * offset)
+
+        if self.occupancy is not None:
+            self.occupancy.update_enemy(self)
 
         # 4. Animate Texture
         self.time_since_last_swap += delta_time
@@ -143,5 +188,73 @@ class Enemy(arcade.Sprite):
         if self.indicator_bar:
             self.indicator_bar.position = (self.center_x, self.center_y + 12)
 
+    def advance_segment(self):
+        """
+        Moves the segment cursor up to the distance travelled. Past the last
+        point the route is extended (maze mode) or the goal is reached.
+
+        Returns:
+            bool: False if the enemy reached its goal (and is gone)
+        """
+        while True:
+            lengths = self.path.lengths
+            last = len(lengths) - 1
+            if self.segment < last and self.distance < lengths[self.segment + 1]:
+                break                                   # <-- on the segment
+            if self.segment + 1 < last:
+                self.segment += 1
+                continue
+
+            # Past the last point: walk on or arrive
+            if not self.extend_route():
+                self.reach_goal()
+                return False
+            if len(self.path) - 1 == last:
+                self.distance = float(lengths[last])    # <-- cut off: wait at the end
+                break
+            self.segment = last
+
+        if self.store is not None:
+            self.store.set_segment(self)
+        return True
+
+    def extend_route(self):
+        """
+        Appends the next flow field step to the path (maze mode).
+
+        Returns:
+            bool: True if the enemy walks on (or waits), False at the goal or without a route
+        """
+        if self.route is None:
+            return False
+        planner, goal = self.route
+        point = planner.next_point(goal, *self.path.end)
+        if point is None:
+            return False
+        if point != self.path.end:
+            self.path.extend(point)
+        return True
+
+    def route_length(self):
+        """
+        Length of the whole walk to the goal: the path, plus in maze mode the
+        flow field steps still ahead of its last point (the path grows as it goes).
+        """
+        if self.route is None:
+            return self.path.length
+        planner, goal = self.route
+        return self.path.length + planner.steps_left(goal, *self.path.end) * TILE_SIZE
+
+    def turn_back_from(self, point):
+        """Heads back to the last waypoint if the enemy is walking onto `point` (just blocked)."""
+        if self.segment == len(self.path) - 2 and self.path.end == point:
+            self.path.turn_back(self.distance)
+            if self.store is not None:
+                self.store.set_segment(self)
+
+    def position_in(self, seconds):
+        """Where the enemy will be after walking on for `seconds` (its path so far, at its speed)."""
+        return self.path.point_at(self.distance + self.speed * seconds)
+
     def distance_to(self, other):
         return math.sqrt((self.center_x - other.center_x) ** 2 + (self.center_y - other.center_y) ** 2)
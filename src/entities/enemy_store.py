@@ -0,0 +1,227 @@
+from src.constants import *
+import numpy as np
+
+
+class EnemyStore:
+    """
+    Simulation state of every live enemy, one row per enemy in NumPy arrays
+    (struct of arrays). A frame advances all of them with one vectorized step;
+    only enemies passing the end of a path segment, changing tile or being
+    drawn go back to Python.
+
+    Each row keeps a copy of the path segment its enemy is on (start point,
+    unit direction, distance range), so positions come from the distance
+    travelled without touching the shared Polyline.
+
+    Sprites are only written when drawn, and only for the enemies in view
+    (see sync_visuals); gameplay reads positions from the rows (Enemy.sim_position).
+
+    Rows stay packed: removing an enemy moves the last row into its place.
+    """
+
+    def __init__(self, capacity=256):
+        self.enemies = []                                   # <-- row -> Enemy
+        self.position = np.zeros((capacity, 2))
+        self.distance = np.zeros(capacity)                  # <-- arc length travelled
+        self.seg_start = np.zeros((capacity, 2))
+        self.seg_dir = np.zeros((capacity, 2))
+        self.seg_from = np.zeros(capacity)                  # <-- distance at the segment start
+        self.seg_to = np.zeros(capacity)                    # <-- distance at the segment end
+        self.path_length = np.zeros(capacity)              # <-- length of the whole route (Enemy.route_length)
+        self.speed = np.zeros(capacity)
+        self.health = np.zeros(capacity)
+        self.anim_time = np.zeros(capacity)
+        self.frame = np.zeros(capacity, dtype=np.int8)
+        self.facing_right = np.ones(capacity, dtype=bool)
+        self.cell = np.zeros((capacity, 2), dtype=np.int64)  # <-- occupancy tile of each row
+
+        # Path left to walk per row, rebuilt at most once per frame (see priority_key)
+        self.remaining = None
+
+        # What the sprites currently show (textures only change when drawn)
+        self.shown_frame = np.full(capacity, -1, dtype=np.int8)
+        self.shown_facing = np.ones(capacity, dtype=bool)
+        self.shown_visible = np.ones(capacity, dtype=bool)     # <-- sprites off view are hidden, not moved
+
+    def __len__(self):
+        return len(self.enemies)
+
+    def _grow(self):
+        """Doubles the capacity of every array."""
+        for name in ("position", "distance", "seg_start", "seg_dir", "seg_from", "seg_to", "path_length", "speed", "health", "anim_time", "frame",
+                     "facing_right", "cell", "shown_frame", "shown_facing", "shown_visible"):
+            array = getattr(self, name)
+            grown = np.zeros((2 * len(array),) + array.shape[1:], dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+    def add(self, enemy):
+        """Gives an enemy a row, filled from its current state."""
+        row = len(self.enemies)
+        if row == len(self.speed):
+            self._grow()
+        self.enemies.append(enemy)
+        enemy.row = row
+        self.remaining = None
+
+        self.position[row] = (enemy.center_x, enemy.center_y)
+        self.distance[row] = enemy._distance
+        self.speed[row] = enemy.speed
+        self.health[row] = enemy._health
+        self.anim_time[row] = enemy.time_since_last_swap
+        self.frame[row] = enemy.cur_texture_index
+        self.facing_right[row] = enemy.facing_right
+        self.cell[row] = ((enemy.center_x - MAP_ORIGIN_X) // TILE_SIZE, (enemy.center_y - MAP_ORIGIN_Y) // TILE_SIZE)
+        self.shown_frame[row] = -1
+        self.shown_visible[row] = True
+        self.set_segment(enemy)
+
+    def remove(self, enemy):
+        """Drops an enemy's row, handing its last health, distance and position back to the enemy."""
+        row = enemy.row
+        if row is None:
+            return
+        enemy._health = float(self.health[row])
+        enemy._distance = float(self.distance[row])
+        enemy.position = tuple(self.position[row].tolist())
+        enemy.row = None
+
+        # Move the last row into the hole
+        last = len(self.enemies) - 1
+        if row != last:
+            moved = self.enemies[last]
+            for array in (self.position, self.distance, self.seg_start, self.seg_dir, self.seg_from, self.seg_to,
+                          self.path_length, self.speed, self.health, self.anim_time,
+                          self.frame, self.facing_right, self.cell, self.shown_frame, self.shown_facing,
+                          self.shown_visible):
+                array[row] = array[last]
+            self.enemies[row] = moved
+            moved.row = row
+        self.enemies.pop()
+        self.remaining = None
+
+    def set_segment(self, enemy):
+        """Copies the path segment the enemy is on into its row."""
+        row = enemy.row
+        self.seg_start[row], self.seg_dir[row], self.seg_from[row], self.seg_to[row] = enemy.path.segment(enemy.segment)
+        self.path_length[row] = enemy.route_length()     # <-- maze mode: path so far plus the flow field steps left
+        self.remaining = None
+
+    def priority_key(self, priority):
+        """
+        The per-row values a targeting priority ranks enemies by, so a tower
+        picks its target with one lookup over its candidates' rows.
+        Remaining path lengths are computed once per frame; health is read live.
+
+        Args:
+            priority (str): One of TARGET_PRIORITIES except "closest"
+
+        Returns:
+            tuple(np.ndarray, bool): (values by row, True if the highest value wins)
+        """
+        n = len(self.enemies)
+        if priority in ("first", "last"):
+            if self.remaining is None:
+                self.remaining = self.path_length[:n] - self.distance[:n]
+            return self.remaining, priority == "last"
+        return self.health[:n], priority == "strongest"
+
+    def update(self, delta_time):
+        """
+        Advances every enemy by one frame:
+        1. Add each row's step to its distance travelled
+        2. Move the enemies past the end of their segment onto the next one (or their goal)
+        3. Place every row on its segment and advance the walk animations
+        4. Re-bucket the enemies that changed tile (sprites are written when drawn, see sync_visuals)
+
+        Args:
+            delta_time (float): Time elapsed since last frame
+        """
+        n = len(self.enemies)
+        if n == 0:
+            return
+
+        # 1. Walk
+        distance = self.distance[:n]
+        distance += self.speed[:n] * delta_time
+        self.remaining = None
+
+        # 2. Segment ends passed (rows may shift as enemies leave, so keep the objects)
+        enemies = self.enemies
+        for enemy in [enemies[row] for row in np.flatnonzero(distance >= self.seg_to[:n]).tolist()]:
+            enemy.advance_segment()
+        n = len(enemies)
+        if n == 0:
+            return
+
+        # 3. Position = segment start + direction * distance into the segment
+        position = self.position[:n]
+        seg_dir = self.seg_dir[:n]
+        np.multiply(seg_dir, (self.distance[:n] - self.seg_from[:n])[:, None], out=position)
+        position += self.seg_start[:n]
+
+        facing = self.facing_right[:n]
+        facing[seg_dir[:, 0] > 0] = True
+        facing[seg_dir[:, 0] < 0] = False
+
+        anim_time = self.anim_time[:n]
+        anim_time += delta_time
+        swap = anim_time > 0.1
+        anim_time[swap] = 0.0
+        self.frame[:n][swap] = (self.frame[:n][swap] + 1) % 8
+
+        # 4. Tile buckets
+        cells = np.floor_divide(position - (MAP_ORIGIN_X, MAP_ORIGIN_Y), TILE_SIZE).astype(np.int64)
+        moved = np.flatnonzero((cells != self.cell[:n]).any(axis=1))
+        self.cell[moved] = cells[moved]
+        for row, cell in zip(moved.tolist(), cells[moved].tolist()):
+            enemy = enemies[row]
+            if enemy.occupancy is not None:
+                enemy.occupancy.update_enemy(enemy, tuple(cell))
+
+    def sync_visuals(self, view=None):
+        """
+        Brings the sprites up to date before they are drawn: position,
+        texture and health bar of every enemy in view. Enemies out of view
+        are hidden instead, and only touched again once they come back.
+
+        Args:
+            view (tuple): (left, right, bottom, top) of the visible world, None for everything
+        """
+        n = len(self.enemies)
+        if n == 0:
+            return
+        enemies = self.enemies
+        position = self.position[:n]
+
+        # 1. Show / hide the enemies crossing the edge of the view
+        if view is None:
+            shown = np.ones(n, dtype=bool)
+        else:
+            left, right, bottom, top = view
+            x, y = position[:, 0], position[:, 1]
+            shown = (x >= left - TILE_SIZE) & (x <= right + TILE_SIZE) & (y >= bottom - TILE_SIZE) & (y <= top + TILE_SIZE)
+        for row in np.flatnonzero(shown != self.shown_visible[:n]).tolist():
+            enemy = enemies[row]
+            enemy.visible = bool(shown[row])
+            enemy.indicator_bar.visible = bool(shown[row])
+        self.shown_visible[:n] = shown
+
+        # 2. Positions and health bars of the enemies in view
+        rows = np.flatnonzero(shown)
+        for row, (x, y) in zip(rows.tolist(), position[rows].tolist()):
+            enemy = enemies[row]
+            enemy.position = (x, y)
+            enemy.indicator_bar.position = (x, y + 12)
+
+        # 3. Textures only where the frame or facing changed
+        frame, facing = self.frame[:n], self.facing_right[:n]
+        changed = np.flatnonzero(((frame != self.shown_frame[:n]) | (facing != self.shown_facing[:n])) & shown)
+        for row in changed.tolist():
+            enemy = enemies[row]
+            textures = enemy.walk_right_textures if facing[row] else enemy.walk_left_textures
+            enemy.cur_texture_index = int(frame[row])
+            enemy.facing_right = bool(facing[row])
+            enemy.texture = textures[enemy.cur_texture_index]
+        self.shown_frame[:n][changed] = frame[changed]
+        self.shown_facing[:n][changed] = facing[changed]
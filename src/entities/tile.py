@@ -20,8 +20,8 @@ class Tile(arcade.Sprite):
 
     def matrix_to_pixel_position(self):
         """Converts the tile's matrix position to pixel position."""
-        self.center_x = self.x * TILE_SIZE + TILE_SIZE / 2
-        self.center_y = self.y * TILE_SIZE + TILE_SIZE / 2
+        self.center_x = MAP_ORIGIN_X + self.x * TILE_SIZE + TILE_SIZE / 2
+        self.center_y = MAP_ORIGIN_Y + self.y * TILE_SIZE + TILE_SIZE / 2
 
     def set_state(self, state):
         """Set the tile's state. Valid states: 'spawn', 'goal', 'border', 'path', 'empty'."""
@@ -97,6 +97,7 @@ class Tile(arcade.Sprite):
     def is_valid_tower_location(self, tilemap):
         """
         Check if the tile is a valid location for a tower.
+        Reads the map's precomputed buildable mask instead of scanning neighbours.
 
         Args:
             tilemap (Map): The tilemap to check against.
@@ -104,9 +105,5 @@ class Tile(arcade.Sprite):
         Returns:
             bool: True if the tile is a valid location for a tower, False otherwise.
         """
-        # tile must be empty
-        if self.get_state() != 'empty':
-            return False
-
-        # tile must touch a path
-        return self.is_adjacent_to_path(tilemap)
\ No newline at end of file
+        # tile must be empty, free of towers and touch a path
+        return tilemap.is_buildable(self)
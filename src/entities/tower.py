@@ -2,7 +2,18 @@ from src.utils.helper_functions import *
 from src.utils.visual_effect import *
 from src.constants import *
 from src.entities.enemy import Enemy
+from src.map.line_of_sight import cells_in_view
 import arcade
+import math
+import numpy as np
+
+# Values each targeting priority ranks enemies by (lowest wins), for enemies outside an EnemyStore
+PRIORITY_KEYS = {
+    "first": lambda enemy: enemy.route_length() - enemy.distance,
+    "last": lambda enemy: enemy.distance - enemy.route_length(),
+    "strongest": lambda enemy: -enemy.health,
+    "weakest": lambda enemy: enemy.health,
+}
 
 class Tower(arcade.Sprite):
     def __init__(self, tile, range_r, freq, damage):
@@ -22,8 +33,22 @@ class Tower(arcade.Sprite):
 
         self.frequency = freq       #<-- How often the tower attacks [1/second]
         self.on_target: Enemy | None = None       #<-- Enemy currently being targeted
+        self.priority = TARGET_PRIORITIES[0]       #<-- Which enemy in range to target
         self.damage = damage
-        self.cooldown = 0.0
+        self.ready_at = 0.0     #<-- Sim time the cooldown ends (towers wait in a CooldownQueue)
+
+        # Path cells an enemy in range can stand on (in view, with TOWER_LINE_OF_SIGHT).
+        # With an occupancy grid, targeting only visits the enemies bucketed on them
+        self.occupancy = None           # <-- OccupancyGrid of the game, set when placed
+        self.enemy_store = None         # <-- EnemyStore of the game, set when placed (priority lookups)
+        self.impacts = None             # <-- TimingWheel of the game, set when placed (projectile hits)
+        self.damage_buffer = None       # <-- DamageBuffer of the game, set when placed (hits applied once per frame)
+        self.target_cells = []
+        self.targeting_revision = -1    # <-- map terrain_revision the cells were computed at
+
+        # Line of sight, for targeting from a plain enemy list: path cells in view as
+        # (dx, dy) from the tower, None when nothing in range is hidden
+        self.sight = None
 
         # Set the tower's position to the tile's center
         self.center_x = tile.center_x
@@ -32,15 +57,14 @@ class Tower(arcade.Sprite):
         # initialize the tower's cooldown display
         self.cooldown_effect = CooldownEffect(self)
 
-    def update(self, *args, **kwargs):
+    def refresh_target_display(self):
         """
-        Updates the tower's internal logic
+        Brings the range ring and target dot in line with on_target.
+        Called when the target changes (scan, shot), not every frame.
         """
-        self.update_position_for_map_expansion()
         self.update_display_texture()
         if TARGET_DOT:
             self.update_target_dot()
-        self.cooldown_effect.update()
 
     def update_position_for_map_expansion(self):
         """
@@ -54,6 +78,10 @@ class Tower(arcade.Sprite):
         self.range_display.center_x = self.tile.center_x
         self.range_display.center_y = self.tile.center_y
 
+        # The target dot rests on the tower while it has no target
+        if TARGET_DOT:
+            self.update_target_dot()
+
     def create_range_display(self):
         """Creates a HOLLOW RING range display."""
         diameter = int(self.range_radius * 2)
@@ -69,6 +97,7 @@ class Tower(arcade.Sprite):
         # Increase opacity for the thin line (was 50)
         self.range_display.alpha = 150
         self.range_display.visible = False  # Start hidden by default
+        self.showing_target = False         # <-- whether the ring currently shows the red texture
 
     def toggle_range_display(self):
         """Hide or show the range display"""
@@ -76,41 +105,100 @@ class Tower(arcade.Sprite):
 
     def update_display_texture(self):
         """Updates the range display texture based on the tower's state"""
+        # The texture only changes when the tower gains or loses its target
+        on_target = self.on_target is not None
+        if on_target == self.showing_target:
+            return
+        self.showing_target = on_target
+
         # If tower is on target, color red, else gray
-        if self.on_target:
+        if on_target:
             color = (255, 50, 50, 255)  # Red
         else:
             color = (200, 200, 200, 255)  # Gray
 
         diameter = int(self.range_radius * 2)
-        new_tex = make_ring_texture(diameter, color, thickness=2)
-
-        self.range_display.texture = new_tex
+        self.range_display.texture = make_ring_texture(diameter, color, thickness=2)     # <-- cached
         self.range_display.alpha = 150
 
+    def refresh_targeting(self, tilemap):
+        """
+        Recomputes the path cells the tower can reach (and see), if the map's tiles changed since.
+
+        Args:
+            tilemap (Map): The map the tower stands on
+        """
+        if tilemap.terrain_revision == self.targeting_revision:
+            return
+
+        # Pad the range by a tile: an enemy in range may stand off its cell's center
+        x, y = self.tile.x, self.tile.y
+        self.target_cells, hidden = cells_in_view(
+            tilemap.state_grid, (x, y), self.range_radius + TILE_SIZE, TOWER_LINE_OF_SIGHT)
+        self.sight = {(cx - x, cy - y) for cx, cy in self.target_cells} if hidden else None
+        self.targeting_revision = tilemap.terrain_revision
+
+    def cycle_priority(self):
+        """Switches to the next targeting priority and returns it."""
+        index = TARGET_PRIORITIES.index(self.priority)
+        self.priority = TARGET_PRIORITIES[(index + 1) % len(TARGET_PRIORITIES)]
+        return self.priority
+
     def acquire_target(self, enemy_list):
         """
-        Acquires the closest enemy within range
+        Acquires the enemy within range that ranks best under the tower's priority
 
         Args:
             enemy_list (list): List of all enemies from the src/window
+                               (only used without an occupancy grid)
         """
         # Initialize variables
         closest = None
-        min_dist_sq = self.range_radius * self.range_radius
+        range_sq = self.range_radius * self.range_radius
+        min_dist_sq = range_sq
+        in_range = []
+        sight = self.sight
+
+        # Candidates: the enemies on the cells in reach (already in view), or everyone
+        occupancy = self.occupancy
+        if occupancy is not None:
+            enemy_list = [enemy for cell in self.target_cells for enemy in occupancy.enemies_at(cell)]
+            sight = None
+
+        # Positions: one read of the store's rows (stored sprites only move when drawn)
+        if self.enemy_store is not None:
+            positions = self.enemy_store.position[[enemy.row for enemy in enemy_list]].tolist()
+        else:
+            positions = [(enemy.center_x, enemy.center_y) for enemy in enemy_list]
 
         # Iterate through all enemies
-        for enemy in enemy_list:
-            dx = self.center_x - enemy.center_x
-            dy = self.center_y - enemy.center_y
+        for enemy, (enemy_x, enemy_y) in zip(enemy_list, positions):
+            dx = self.center_x - enemy_x
+            dy = self.center_y - enemy_y
             dist_sq = dx*dx + dy*dy
 
-            # Update the closest enemy if within range and closer
-            if dist_sq <= min_dist_sq and (closest is None or dist_sq < min_dist_sq):
+            if dist_sq > range_sq:
+                continue
+            # Only enemies in range get the sight check, so it costs little
+            if sight is not None and (round(-dx / TILE_SIZE), round(-dy / TILE_SIZE)) not in sight:
+                continue
+            in_range.append(enemy)
+
+            # Update the closest enemy if closer
+            if closest is None or dist_sq < min_dist_sq:
                 closest = enemy
                 min_dist_sq = dist_sq
 
-        self.on_target = closest
+        if self.priority == "closest" or len(in_range) < 2:
+            self.on_target = closest
+        elif self.enemy_store is not None:
+            # One lookup over the candidates' rows in the store
+            values, highest_wins = self.enemy_store.priority_key(self.priority)
+            values = values[[enemy.row for enemy in in_range]]
+            self.on_target = in_range[int(values.argmax() if highest_wins else values.argmin())]
+        else:
+            self.on_target = min(in_range, key=PRIORITY_KEYS[self.priority])
+        self.refresh_target_display()
 
     def create_target_dot(self):
         """Creates a circular target aim as a Sprite"""
@@ -124,36 +212,56 @@ class Tower(arcade.Sprite):
         """Updates the target dot's position to the tower's tile"""
         if TARGET_DOT:
             if self.on_target:
-                self.target_dot.center_x = self.on_target.center_x
-                self.target_dot.center_y = self.on_target.center_y
+                self.target_dot.position = self.on_target.sim_position
                 self.target_dot.visible = True
             else:
                 self.target_dot.center_x = self.center_x
                 self.target_dot.center_y = self.center_y
                 self.target_dot.visible = False
 
-    def _fire_condition(self, delta_time: float):
+    def cooldown_left(self, now):
+        """Seconds of sim time until the tower can fire again (0 when ready)."""
+        return max(0.0, self.ready_at - now)
+
+    def _start_cooldown(self, now):
         """
-        Update the cooldown timer.
-        Returns True if the tower is ready to attack this frame.
+        Sets the sim time the next shot is possible and lets go of the target:
+        a cooling tower aims at nothing (the enemy may die meanwhile) until it scans again.
         """
-        # Reduce cooldown
-        self.cooldown = max(0.0, self.cooldown - delta_time)
-
-        # Early exit conditions
-        if self.on_target is None:
-            return False  # no target, cannot fire
-        if self.cooldown > 0:
-            return False  # still cooling down
+        self.ready_at = now + 1.0 / self.frequency
+        self.on_target = None
+        self.refresh_target_display()
+
+    def _schedule_impact(self, time, action, *args):
+        """Runs a projectile hit at its sim time (at once without a timing wheel)."""
+        if self.impacts is not None:
+            self.impacts.schedule(time, action, *args)
+        else:
+            action(*args)
 
-        # Cooldown expired and target exists
-        return True
+    def _deal_damage(self, enemy, damage):
+        """Hits an enemy: through the frame's damage buffer, or at once without one."""
+        if self.damage_buffer is not None:
+            self.damage_buffer.add(enemy, damage)
+        else:
+            enemy.deal_damage(damage)
 
     def upgrade(self):
         self.level += 1
 
-    def attack_update(self, delta_time, visual_effect_list, sound_manager):
-        pass  # Base implementation
+    def fire(self, now, visual_effect_list, sound_manager):
+        """
+        Fires at the current target. Only called once the cooldown has ended.
+
+        Args:
+            now (float): Sim time (see CooldownQueue)
+            visual_effect_list (list): List of all visual effects in the src
+            sound_manager: for playing sound effects
+
+        Returns:
+            bool: True if the tower fired (and is cooling down again)
+        """
+        return False  # Base implementation
 
 
 
@@ -167,17 +275,20 @@ class BaseTower(Tower):
         )
         self.texture = TOWER_TEXTURES['base']
 
-    def attack_update(self, delta_time, visual_effect_list, sound_manager):
+    def fire(self, now, visual_effect_list, sound_manager):
         """
         Attack the target enemy alone
 
         Args:
-            delta_time (float): Time elapsed since last frame
+            now (float): Sim time (see CooldownQueue)
             visual_effect_list (list): List of all visual effects in the src
             sound_manager: for playing sound effects
+
+        Returns:
+            bool: True if the tower fired
         """
-        # Early exit if not ready to attack
-        if not super()._fire_condition(delta_time): return
+        # Early exit if there is nothing to shoot
+        if self.on_target is None: return False
 
         sound_manager.play_sound("base_shoot", volume=0.4)
 
@@ -187,25 +298,33 @@ class BaseTower(Tower):
                 self.center_x, self.center_y,
                 size=TOWER_PUFF_SIZE_BASIC))
 
-        # 2. Bullet (Pass damage/target here!)
-        visual_effect_list.append(
+        # 2. The hit: the bullet flies to where the target stands now
+        target = self.on_target
+        target_x, target_y = target.sim_position
+        flight_time = math.hypot(target_x - self.center_x, target_y - self.center_y) / BULLET_SPEED
+        self._schedule_impact(now + flight_time, self.bullet_hit, target)
+
+        # 3. Bullet (cosmetic only)
+        add_cosmetic_effect(
+            visual_effect_list,
             Bullet(
                 start_x=self.center_x,
                 start_y=self.center_y,
-                target_x=self.on_target.center_x,
-                target_y=self.on_target.center_y,
-                visual_effect_list=visual_effect_list,
-                # --- NEW ARGS ---
-                target_enemy=self.on_target,
-                damage=self.damage
+                target_x=target_x,
+                target_y=target_y,
+                flight_time=flight_time,
+                visual_effect_list=visual_effect_list
             )
         )
 
-        # --- REMOVED: Immediate Damage ---
-        # self.on_target.deal_damage(self.damage)  <-- DELETED
-
         # Reset cooldown
-        self.cooldown = 1.0 / self.frequency
+        self._start_cooldown(now)
+        return True
+
+    def bullet_hit(self, enemy):
+        """Damages the enemy a bullet was fired at, if it is still alive."""
+        if enemy.health > 0:
+            self._deal_damage(enemy, self.damage)
 
 
 
@@ -221,29 +340,21 @@ class AOETower(Tower):
 
         # AOE specific variables
         self.AOE_radius = AOE_DAMAGE_RADIUS
-        self.damage_enemy_list : list[Enemy] = []
-        self.boom_trajectory_visual_effect = None
+        self.enemy_list = []        # <-- scanned for the blast only without an occupancy grid
 
-    def attack_update(self, delta_time, visual_effect_list, sound_manager):
+    def fire(self, now, visual_effect_list, sound_manager):
         """
         Attack all enemies within the AOE radius
 
         args:
-            delta_time (float): Time elapsed since last frame
+            now (float): Sim time (see CooldownQueue)
             visual_effect_list (list): List of all visual effects in the src
+
+        Returns:
+            bool: True if the tower fired
         """
-        # reset the trajectory
-        if (self.boom_trajectory_visual_effect
-                and self.boom_trajectory_visual_effect.can_be_removed):
-            self.boom_trajectory_visual_effect = None
-
-        # Early exit if not ready to attack
-        if not super()._fire_condition(delta_time):
-            # Update the trajectory direction if there is a target
-            if self.boom_trajectory_visual_effect and self.on_target :
-                self.boom_trajectory_visual_effect.target_x = self.on_target.center_x
-                self.boom_trajectory_visual_effect.target_y = self.on_target.center_y
-            return
+        # Early exit if there is nothing to shoot
+        if self.on_target is None: return False
 
         # play shooting sound
         sound_manager.play_sound("aoe_shoot", volume=0.6)
@@ -256,35 +367,63 @@ class AOETower(Tower):
                 self.center_y,
                 size = TOWER_PUFF_SIZE_AOE))
 
-        # Add steam boom and store it as an attribute
-        # NOTE: THIS VISUAL ALSO CONTAINS THE METHOD TO DEAL DAMAGE
-        self.boom_trajectory_visual_effect = SteamBoom(
-                self, visual_effect_list)
-        visual_effect_list.append(self.boom_trajectory_visual_effect)
+        # Lead the target: aim where it will be when the shell lands (a few fixed point steps)
+        target = self.on_target
+        impact_x, impact_y = target.sim_position
+        for _ in range(3):
+            flight_time = math.hypot(impact_x - self.center_x, impact_y - self.center_y) / BOOM_SPEED
+            impact_x, impact_y = target.position_in(flight_time)
+        flight_time = math.hypot(impact_x - self.center_x, impact_y - self.center_y) / BOOM_SPEED
+        self._schedule_impact(now + flight_time, self.blast, impact_x, impact_y)
+
+        # Add steam boom (cosmetic only)
+        add_cosmetic_effect(
+            visual_effect_list,
+            SteamBoom(self.center_x, self.center_y, impact_x, impact_y, flight_time, visual_effect_list))
 
         # Reset cooldown
-        self.damage_enemy_list.clear()
-        self.cooldown = 1.0 / self.frequency
+        self._start_cooldown(now)
+        return True
 
     def acquire_target(self, enemy_list):
         """
-        Acquire all enemies within the AOE radius
+        Acquire the enemy in range that ranks best under the tower's priority (the blast itself is resolved on impact)
         """
-        # Acquire the closest enemy
         super().acquire_target(enemy_list)
+        self.enemy_list = enemy_list
 
-        # check if the closest enemy is within the AOE radius
-        if self.on_target is None:
-            return
+    def blast(self, x, y):
+        """Damages everyone in the blast of a shell landing at (x, y)."""
+        for enemy in self.enemies_in_blast(x, y):
+            self._deal_damage(enemy, self.damage)
 
-        # Acquire all enemies within the AOE radius
-        self.damage_enemy_list = []
-        for enemy in enemy_list:
-            dx = enemy.center_x - self.on_target.center_x
-            dy = enemy.center_y - self.on_target.center_y
-            dist_sq = dx*dx + dy*dy
-            if dist_sq <= self.AOE_radius * self.AOE_radius:    #<-- If enemy is within AOE radius
-                self.damage_enemy_list.append(enemy)        #<-- Add enemy to the list
+    def enemies_in_blast(self, x, y):
+        """
+        Finds the enemies caught by a shell landing at (x, y).
+        Called once per shell, when it lands, so the splash matches where
+        the explosion actually is.
+
+        Args:
+            x (float): World x of the impact
+            y (float): World y of the impact
+
+        Returns:
+            list[Enemy]: The enemies within the AOE radius
+        """
+        # Only the tiles around the impact can hold enemies in the blast
+        if self.occupancy is not None:
+            return self.occupancy.enemies_near(x, y, self.AOE_radius)
+
+        # Without an occupancy grid: scan every enemy
+        radius_sq = self.AOE_radius * self.AOE_radius
+        hit = []
+        for enemy in self.enemy_list:
+            enemy_x, enemy_y = enemy.sim_position
+            dx = enemy_x - x
+            dy = enemy_y - y
+            if dx*dx + dy*dy <= radius_sq:      #<-- If enemy is within AOE radius
+                hit.append(enemy)
+        return hit
 
 
 
@@ -300,20 +439,26 @@ class LaserTower(Tower):
 
         # Laser specific variables
         self.laser_enemy_list : list[Enemy] = []
-        self.is_laser_list_complete = False
         self.laser_length = LASER_TOWER_BEAM_LENGTH
         self.pt_beam_end = (0, 0)
+        self.enemy_list = []        # <-- scanned for beam hits only without an occupancy grid
 
-    def attack_update(self, delta_time, visual_effect_list, sound_manager):
+    def fire(self, now, visual_effect_list, sound_manager):
         """
         Attack all enemies in the chain
 
         args:
-            delta_time (float): Time elapsed since last frame
+            now (float): Sim time (see CooldownQueue)
             visual_effect_list (list): List of all visual effects in the src
+
+        Returns:
+            bool: True if the tower fired
         """
         # Early exit conditions
-        if not self._fire_condition(delta_time): return
+        if self.on_target is None: return False
+
+        # The beam is only traced on the frames the tower fires
+        self.trace_beam()
 
         # Play sound
 
@@ -329,28 +474,34 @@ class LaserTower(Tower):
 
         # Fire! Damage all enemies in the list
         for enemy in self.laser_enemy_list:
-            enemy.deal_damage(self.damage)
+            self._deal_damage(enemy, self.damage)
 
         # Reset laser list and cooldown
         self.laser_enemy_list.clear()
-        self.cooldown = 1.0 / self.frequency        #<-- Reset cooldown
+        self._start_cooldown(now)        #<-- Reset cooldown
+        return True
 
     def acquire_target(self, enemy_list: list[Enemy]):
         """
-        Acquire all enemies within the AOE radius
+        Acquire the enemy in range that ranks best under the tower's priority (the beam is traced when firing)
         """
-        # Acquire the closest enemy and return if none
         super().acquire_target(enemy_list)
-        if self.on_target is None:
-            return
+        self.enemy_list = enemy_list
 
+    def trace_beam(self):
+        """
+        Aims the beam at the current target and collects every enemy it hits.
+        """
         '''create beam geometry'''
         # create vector of the tower to the target
-        dx = self.on_target.center_x - self.center_x
-        dy = self.on_target.center_y - self.center_y
+        target_x, target_y = self.on_target.sim_position
+        dx = target_x - self.center_x
+        dy = target_y - self.center_y
 
         # normalize the vector
         length = (dx*dx + dy*dy) ** 0.5
+        if length == 0:
+            dx, dy, length = 1.0, 0.0, 1.0      # <-- target right on the tower: any direction
         dx /= length
         dy /= length
 
@@ -360,12 +511,18 @@ class LaserTower(Tower):
         self.pt_beam_end = (x_beam_end, y_beam_end)     #<-- Store the end point of the beam
 
         '''add enemy to the list if it's on the beam'''
+        # Only the tiles along the beam are searched when enemies are bucketed
+        if self.occupancy is not None:
+            self.laser_enemy_list = self.occupancy.enemies_along(
+                self.center_x, self.center_y, x_beam_end, y_beam_end, TILE_SIZE / 2)
+            return
+
         self.laser_enemy_list = []
-        for enemy in enemy_list:
+        for enemy in self.enemy_list:
             dist_to_beam = distance_point_to_segment(
-                enemy.center_x, enemy.center_y,
+                *enemy.sim_position,
                 self.center_x, self.center_y,
                 x_beam_end, y_beam_end
             )
             if dist_to_beam <= TILE_SIZE / 2:
-                self.laser_enemy_list.append(enemy)
\ No newline at end of file
+                self.laser_enemy_list.append(enemy)
@@ -0,0 +1,36 @@
+import heapq
+
+
+class CooldownQueue:
+    """
+    Towers cooling down, in a heap keyed by the sim time their cooldown ends
+    (tower.ready_at). Each frame only the towers whose time has come are
+    popped; the others cost nothing until then.
+    """
+
+    def __init__(self):
+        self.now = 0.0          # <-- sim time: only runs while the game does (pause, 2x speed)
+        self.heap = []          # <-- heap of (ready_at, sequence, tower)
+        self.sequence = 0
+
+    def advance(self, delta_time):
+        """Moves sim time on by one frame."""
+        self.now += delta_time
+
+    def push(self, tower):
+        """Queues a tower until its ready_at."""
+        heapq.heappush(self.heap, (tower.ready_at, self.sequence, tower))
+        self.sequence += 1
+
+    def pop_ready(self):
+        """
+        Pops every tower whose cooldown has ended.
+
+        Returns:
+            list[Tower]: The towers ready to fire, earliest first
+        """
+        ready = []
+        heap = self.heap
+        while heap and heap[0][0] <= self.now:
+            ready.append(heapq.heappop(heap)[2])
+        return ready
@@ -0,0 +1,51 @@
+class DamageBuffer:
+    """
+    Damage dealt during a frame, summed per enemy and applied in one pass
+    at the end of it. However many hits an enemy takes in a frame, its
+    health and health bar change once, and the dead are rewarded and
+    despawned together after every tower has fired.
+    """
+
+    def __init__(self, game_manager):
+        self.game_manager = game_manager
+        self.pending = {}       # <-- enemy -> damage this frame, in order of first hit
+
+    def __len__(self):
+        return len(self.pending)
+
+    def add(self, enemy, damage):
+        """Records a hit, applied on the next resolve()."""
+        self.pending[enemy] = self.pending.get(enemy, 0) + damage
+
+    def resolve(self):
+        """
+        Applies the damage of the frame:
+        1. Take each enemy's summed damage off its health and refresh its bar
+        2. Grant the rewards of everyone killed at once
+        3. Despawn the dead
+
+        Returns:
+            list[Enemy]: The enemies killed this frame
+        """
+        if not self.pending:
+            return []
+        pending, self.pending = self.pending, {}
+
+        # 1. One health and bar update per enemy
+        dead = []
+        for enemy, damage in pending.items():
+            if not enemy.sprite_lists:
+                continue        # <-- already gone (reached its goal this frame)
+            enemy.health -= damage
+            enemy.indicator_bar.fullness = enemy.health / enemy.max_health
+            if enemy.health <= 0:
+                dead.append(enemy)
+
+        # 2. Rewards
+        if dead:
+            self.game_manager.add_money(sum(enemy.reward for enemy in dead))
+
+        # 3. Despawn
+        for enemy in dead:
+            enemy.kill()
+        return dead
@@ -0,0 +1,117 @@
+from src.constants import *
+import heapq
+import time
+
+
+class Job:
+    """
+    One resumable task: a generator advanced a step at a time by the scheduler.
+    Each `yield` marks a point where the work may be paused until a later frame;
+    the generator's return value becomes the job's result.
+    """
+
+    def __init__(self, generator, priority, tag, on_complete):
+        self.generator = generator
+        self.priority = priority
+        self.tag = tag                  # <-- lets callers find or cancel related jobs
+        self.on_complete = on_complete  # <-- called with the result when finished
+
+        self.done = False
+        self.cancelled = False
+        self.result = None
+        self.steps = 0
+
+    def cancel(self):
+        """Stops the job before its next step (the callback is never called)."""
+        self.cancelled = True
+
+
+class JobScheduler:
+    """
+    Cooperative scheduler for heavy work on the main loop.
+    Every frame, run() advances the waiting jobs (lowest priority value first,
+    oldest first within a priority) until the frame's time budget is spent,
+    so long operations are spread over several frames instead of stalling one.
+    """
+
+    def __init__(self, budget_ms=JOB_FRAME_BUDGET_MS):
+        self.budget_ms = budget_ms
+        self.queue = []     # <-- heap of (priority, sequence, job)
+        self.sequence = 0
+
+    def add(self, generator, priority=JOB_PRIORITY_NORMAL, tag=None, on_complete=None):
+        """
+        Queues a generator as a job.
+
+        Args:
+            generator (Generator): The work; yields between steps, returns its result
+            priority (int): JOB_PRIORITY_* (lower runs first)
+            tag (str): Optional label, see has_jobs() and cancel_tag()
+            on_complete (callable): Called with the result when the job finishes
+
+        Returns:
+            Job: The queued job
+        """
+        job = Job(generator, priority, tag, on_complete)
+        heapq.heappush(self.queue, (priority, self.sequence, job))
+        self.sequence += 1
+        return job
+
+    def has_jobs(self, tag=None):
+        """True if any (or any `tag`) job is still waiting to finish."""
+        return any(not job.done and not job.cancelled and (tag is None or job.tag == tag)
+                   for _, _, job in self.queue)
+
+    def cancel_tag(self, tag):
+        """Cancels every waiting job with the given tag."""
+        for _, _, job in self.queue:
+            if job.tag == tag:
+                job.cancel()
+
+    def run(self, budget_ms=None):
+        """
+        Advances jobs until the time budget is used up.
+        At least one step runs per call, so progress is always made.
+
+        Args:
+            budget_ms (float): Time budget for this call (default: self.budget_ms)
+        """
+        budget = (self.budget_ms if budget_ms is None else budget_ms) / 1000.0
+        deadline = time.perf_counter() + budget
+
+        while self.queue:
+            job = self.queue[0][2]
+            if job.done or job.cancelled:
+                heapq.heappop(self.queue)
+                job.generator.close()
+                continue
+
+            self._step(job)
+            if time.perf_counter() >= deadline:
+                break
+
+    def flush(self, tag=None):
+        """Runs every (or every `tag`) job to completion right now."""
+        while True:
+            # Callbacks may queue follow-up jobs, so look again after each pass
+            waiting = [job for _, _, job in sorted(self.queue)
+                       if not job.done and not job.cancelled and (tag is None or job.tag == tag)]
+            if not waiting:
+                break
+            for job in waiting:
+                while not job.done and not job.cancelled:
+                    self._step(job)
+
+        self.queue = [entry for entry in self.queue if not entry[2].done and not entry[2].cancelled]
+        heapq.heapify(self.queue)
+
+    def _step(self, job):
+        """Advances a job by one step, finishing it if the generator returns."""
+        try:
+            next(job.generator)
+            job.steps += 1
+        except StopIteration as stop:
+            job.done = True     # <-- dropped from the queue on the next pass
+            job.result = stop.value
+            if job.on_complete is not None:
+                job.on_complete(job.result)
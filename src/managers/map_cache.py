@@ -0,0 +1,174 @@
+from src.constants import *
+from src.managers.game_manager import USER_DATA_DIR
+from src.map.map_generator import Map
+from src.map.map_io import save_map, read_map_data
+from src.map.map_analysis import analyze_map, rejection_reasons
+from concurrent.futures import ProcessPoolExecutor
+import random
+import os
+
+MAP_CACHE_DIR = USER_DATA_DIR / "map_cache"
+
+
+def generate_cached_map(cache_dir, width, height, difficulty, seed):
+    """
+    Generates one complete starting map and writes it into the cache.
+    Seeds that fail the quality checks are replaced by derived ones, so
+    players never get a rejected layout.
+    Runs in the worker process, so it must stay a top-level function.
+
+    Returns:
+        str: Path of the written cache file
+    """
+    for _ in range(MAP_QUALITY_MAX_REROLLS + 1):
+        tilemap = Map(width, height, difficulty=difficulty, seed=seed)
+        tilemap.recursive_path_generation(tilemap.spawns[0], tilemap.goals[0])
+
+        reasons = rejection_reasons(analyze_map(tilemap))
+        if not reasons:
+            break
+        print(f"Rejected map seed {seed}: {', '.join(reasons)}")
+        seed = random.Random(seed).getrandbits(31)
+
+    tilemap.calculate_autotiling()
+
+    path = MapCache.path_for(cache_dir, width, height, difficulty, seed)
+    tmp_path = path.with_suffix(".tmp")
+    save_map(tilemap, tmp_path)
+    os.replace(tmp_path, path)      # <-- readers never see a half-written file
+    return str(path)
+
+
+class MapCache:
+    """
+    On-disk cache of pregenerated maps keyed by size, difficulty and seed.
+    A background process keeps a small pool of ready layouts for each key,
+    so starting a game only has to load one. The total size is capped with
+    least-recently-used eviction.
+    """
+
+    def __init__(self, cache_dir=MAP_CACHE_DIR, max_bytes=MAP_CACHE_MAX_BYTES, pool_size=MAP_CACHE_POOL_SIZE):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.pool_size = pool_size
+
+        self.executor = None        # <-- created on first prefill
+        self.pending = []           # <-- futures of maps being generated
+
+    @staticmethod
+    def path_for(cache_dir, width, height, difficulty, seed):
+        """Cache file of one exact map."""
+        return cache_dir / f"{width}x{height}_d{difficulty}_s{seed}.stmap"
+
+    def entries(self, width, height, difficulty):
+        """
+        Lists the cached maps for a size and difficulty, oldest first.
+
+        Returns:
+            list[Path]: Cache files
+        """
+        if not self.cache_dir.exists():
+            return []
+        files = self.cache_dir.glob(f"{width}x{height}_d{difficulty}_s*.stmap")
+        return sorted(files, key=lambda p: p.stat().st_mtime)
+
+    def get(self, width, height, difficulty, seed):
+        """
+        Loads one exact cached map (e.g. a map pinned for a benchmark).
+
+        Returns:
+            MapData: The map, or None if it is not cached
+        """
+        path = self.path_for(self.cache_dir, width, height, difficulty, seed)
+        try:
+            data = read_map_data(path)
+        except (OSError, ValueError):
+            return None
+
+        # Mark as recently used
+        os.utime(path)
+        return data
+
+    def take(self, width, height, difficulty):
+        """
+        Removes one pregenerated map from the pool and returns it.
+
+        Returns:
+            MapData: A ready map, or None if the pool is empty
+        """
+        for path in self.entries(width, height, difficulty):
+            try:
+                data = read_map_data(path)
+            except (OSError, ValueError) as e:
+                print(f"Discarding unreadable cached map {path.name}: {e}")
+                data = None
+
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+            if data is not None:
+                return data
+        return None
+
+    def prefill(self, width, height, difficulty):
+        """
+        Queues background generation until the pool for this key is full.
+        Returns immediately; the work happens in a worker process.
+        """
+        self.pending = [f for f in self.pending if not f.done()]
+        missing = self.pool_size - len(self.entries(width, height, difficulty)) - len(self.pending)
+        if missing <= 0:
+            return
+
+        self.enforce_size_cap()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=1)
+
+        for _ in range(missing):
+            seed = random.getrandbits(31)
+            future = self.executor.submit(
+                generate_cached_map, self.cache_dir, width, height, difficulty, seed)
+            self.pending.append(future)
+
+    def enforce_size_cap(self):
+        """Deletes least recently used maps until the cache fits max_bytes."""
+        if not self.cache_dir.exists():
+            return
+
+        files = []
+        for path in self.cache_dir.glob("*.stmap"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+
+    def shutdown(self):
+        """Stops the worker process (pending maps are dropped). Called on exit."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+_shared_cache = None
+
+
+def get_map_cache():
+    """Returns the map cache shared by all views."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = MapCache()
+    return _shared_cache
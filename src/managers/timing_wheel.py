@@ -0,0 +1,63 @@
+from src.constants import *
+
+
+class TimingWheel:
+    """
+    Actions scheduled at a sim time (projectile impacts), hashed by time into
+    a ring of slots. Scheduling is O(1); advance() only visits the slots the
+    clock passed since the last call, and runs what is due in time order.
+
+    Events further ahead than one turn of the wheel share a slot with nearer
+    ones and simply wait there until their turn comes round.
+    """
+
+    def __init__(self, slot_duration=TIMING_WHEEL_SLOT, slot_count=TIMING_WHEEL_SLOTS):
+        self.slot_duration = slot_duration
+        self.slots = [[] for _ in range(slot_count)]
+        self.tick = 0           # <-- first slot (absolute tick) not fully processed yet
+        self.sequence = 0       # <-- keeps same-time events in scheduling order
+        self.pending = 0
+
+    def __len__(self):
+        return self.pending
+
+    def schedule(self, time, action, *args):
+        """
+        Runs `action(*args)` once the clock reaches `time`.
+
+        Args:
+            time (float): Sim time of the event
+            action (callable): Called when the event is due
+        """
+        tick = max(int(time // self.slot_duration), self.tick)
+        self.slots[tick % len(self.slots)].append((time, self.sequence, tick, action, args))
+        self.sequence += 1
+        self.pending += 1
+
+    def advance(self, now):
+        """
+        Runs every event due by `now`, earliest first.
+
+        Args:
+            now (float): Current sim time
+        """
+        if not self.pending:
+            self.tick = int(now // self.slot_duration)
+            return
+
+        last = int(now // self.slot_duration)
+        due = []
+        for tick in range(self.tick, min(last, self.tick + len(self.slots) - 1) + 1):
+            slot = self.slots[tick % len(self.slots)]
+            if not slot:
+                continue
+            keep = [event for event in slot if event[2] > last or event[0] > now]
+            if len(keep) < len(slot):
+                due.extend(event for event in slot if event[2] <= last and event[0] <= now)
+                slot[:] = keep
+        self.tick = last        # <-- the current slot may still hold later events
+
+        due.sort(key=lambda event: (event[0], event[1]))
+        self.pending -= len(due)
+        for _, _, _, action, args in due:
+            action(*args)
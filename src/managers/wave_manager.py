@@ -1,5 +1,7 @@
 import random
 from src.constants import *
+from src.map.expansion_planner import ExpansionPlanner
+from src.utils.helper_functions import run_to_completion
 
 
 class WaveManager:
@@ -7,7 +9,7 @@ class WaveManager:
         self.game = game_view  # Reference to the main src to call methods
         self.current_wave = 0
 
-        # State: "BETWEEN_WAVES", "SPAWNING", "WAITING_FOR_CLEAR"
+        # State: "BETWEEN_WAVES", "CHANGING_MAP", "SPAWNING", "WAITING_FOR_CLEAR"
         self.state = "BETWEEN_WAVES"
 
         # Timers
@@ -20,15 +22,24 @@ class WaveManager:
         self.spawn_timer = 0
         self.current_speed = 0
 
+        # Next wave's map changes, computed in the background
+        self.planner = ExpansionPlanner()
+
     def start_next_wave(self):
         """Calculates all the numbers for the upcoming wave."""
         self.current_wave += 1
         print(f"--- STARTING WAVE {self.current_wave} ---")
 
-        # 1. Apply Map Changes based on curves
+        # 1. Apply Map Changes based on curves (may take a few frames)
         if self.current_wave > 1:  # Don't expand on wave 1
-            self.apply_map_changes()
+            if self.apply_map_changes():
+                self.state = "CHANGING_MAP"
+                return
+
+        self.begin_spawning()
 
+    def begin_spawning(self, _result=None):
+        """Starts spawning the current wave (also the map-change job's callback)."""
         # 2. Calculate Enemy Data
         self.enemies_to_spawn = GET_ENEMY_COUNT(self.current_wave)
         self.spawn_interval = GET_SPAWN_INTERVAL(self.current_wave)
@@ -37,38 +48,75 @@ class WaveManager:
         self.state = "SPAWNING"
         self.spawn_timer = 0
 
+        # 3. Start working out the next wave's map changes
+        self.plan_map_changes(self.current_wave + 1)
+
+    def plan_map_changes(self, wave):
+        """Hands the map changes of `wave` (if any) to the background planner."""
+        expand = SHOULD_EXPAND(wave)
+        add_spawn = SHOULD_ADD_SPAWN(wave)
+        add_goal = SHOULD_ADD_GOAL(wave)
+
+        if wave > 1 and (expand or add_spawn or add_goal):
+            self.planner.request(self.game.map, wave, expand, add_spawn, add_goal)
+
     def apply_map_changes(self):
-        """Checks the curves and modifies the map if needed."""
-        map_changed = False
+        """
+        Checks the curves and modifies the map if needed.
+
+        Returns:
+            bool: True if the changes were queued as a job (spawning waits for it)
+        """
+        # Commit the precomputed changes if they still fit the map
+        plan = self.planner.take(self.current_wave)
+        if plan is not None and run_to_completion(
+                self.game.tile_reveal.iter_revealing(self.game.map.iter_apply_change_plan(plan))):
+            if plan.expanded:
+                print(">>> MAP EXPANDING!")
+            if plan.spawn_added:
+                print(">>> NEW SPAWN ADDED!")
+                self.game.sound_manager.play_sound("easter_egg", volume=0.5)
+            if plan.goal_added:
+                print(">>> NEW GOAL ADDED!")
+            return False
+
+        # Fallback: compute the changes now, spread over frames
+        if not (SHOULD_EXPAND(self.current_wave) or SHOULD_ADD_SPAWN(self.current_wave)
+                or SHOULD_ADD_GOAL(self.current_wave)):
+            return False
+
+        self.game.scheduler.add(
+            self.iter_map_changes(), JOB_PRIORITY_HIGH, tag="map", on_complete=self.begin_spawning)
+        return True
+
+    def iter_map_changes(self):
+        """
+        Step-wise map changes of the current wave (a JobScheduler job).
+        New and carved tiles are streamed into the view's tile reveal.
+        """
+        tilemap = self.game.map
+        reveal = self.game.tile_reveal
 
         # Expansion
         if SHOULD_EXPAND(self.current_wave):
             print(">>> MAP EXPANDING!")
-            self.game.map.expand_map(add_width=6, add_height=6)
-            self.game.rebuild_background_list()
-            map_changed = True
+            yield from reveal.iter_revealing(
+                tilemap.iter_expand_map(add_width=MAP_EXPANSION_SIZE, add_height=MAP_EXPANSION_SIZE))
 
         # New Spawn
         if SHOULD_ADD_SPAWN(self.current_wave):
             print(">>> NEW SPAWN ADDED!")
-            self.game.map.generate_new_special_point("spawn")
-            self.game.rebuild_background_list()
-            map_changed = True
+            yield from reveal.iter_revealing(tilemap.iter_new_special_point("spawn"))
             self.game.sound_manager.play_sound("easter_egg", volume=0.5)
 
         # New Goal
         if SHOULD_ADD_GOAL(self.current_wave):
             print(">>> NEW GOAL ADDED!")
-            self.game.map.generate_new_special_point("goal")
-            self.game.rebuild_background_list()
-            map_changed = True
+            yield from reveal.iter_revealing(tilemap.iter_new_special_point("goal"))
 
-        if map_changed:
-            # Important: Rebuild the view and recalculate paths
-            self.game.map.calculate_autotiling()
-            self.game.rebuild_background_list()
-            # Clear existing enemies/towers if necessary or handle logic
-            # (Usually we wait until wave is cleared to expand, so it's safe)
+        # New tiles reach the render list through the reveal, so no full rebuild
+        # (We wait until the wave is cleared to expand, so no enemy is on the map)
+        yield from tilemap.iter_autotiling()
 
     def update(self, delta_time):
 
@@ -96,6 +144,10 @@ class WaveManager:
                 self.state = "BETWEEN_WAVES"
                 self.timer = self.time_between_waves
 
+                # Towers placed during the wave may clash with the plan: redo it
+                if self.planner.is_stale(self.game.map):
+                    self.plan_map_changes(self.current_wave + 1)
+
     def trigger_spawn(self):
         """Tells the GameView to spawn 1 enemy."""
         if not self.game.map.spawns:
@@ -0,0 +1,86 @@
+from src.constants import *
+from src.map.map_analysis import TOWER_RANGES, traffic_grid, coverage_grid, buildable_cells
+from src.utils.helper_functions import run_to_completion
+import numpy as np
+
+
+class CoverageMap:
+    """
+    Precomputed tower placement scores for a live Map.
+    For every buildable cell and tower type, holds the enemy traffic the tower
+    would have in range (see map_analysis.traffic_grid), so placement hints and
+    bots read a cell's score or the best cell instead of searching the map.
+    Recomputed whenever the map's revision changes.
+    """
+
+    def __init__(self, tilemap):
+        self.map = tilemap
+        self.traffic = None     # <-- (height, width) expected visits per enemy
+        self.grids = {}         # <-- tower type -> (height, width) coverage
+        self.best = {}          # <-- tower type -> (x, y) of the best cell, or None
+        self.map_revision = -1
+
+    def is_stale(self):
+        """True if the map changed since the last refresh."""
+        return self.map.revision != self.map_revision
+
+    def refresh(self):
+        """Recomputes every grid right away."""
+        run_to_completion(self.iter_refresh())
+
+    def iter_refresh(self):
+        """Step-wise refresh for the JobScheduler: the traffic, then one tower type per step."""
+        revision = self.map.revision
+        state_grid = self.map.state_grid.copy()
+        buildable = buildable_cells(state_grid, self.map.tower_grid.copy())
+        traffic = traffic_grid(
+            state_grid,
+            [(t.x, t.y) for t in self.map.spawns],
+            [(t.x, t.y) for t in self.map.goals],
+        )
+
+        grids, best = {}, {}
+        for tower_type, radius in TOWER_RANGES.items():
+            yield
+            grid = coverage_grid(traffic, radius, buildable)
+            grids[tower_type] = grid
+
+            y, x = np.unravel_index(np.argmax(grid), grid.shape)
+            best[tower_type] = (int(x), int(y)) if grid[y, x] > 0 else None
+
+        # Discard the result if the map changed while it was being computed
+        if self.map.revision == revision:
+            self.traffic = traffic
+            self.grids = grids
+            self.best = best
+            self.map_revision = revision
+
+    def value_at(self, grid_x, grid_y, tower_type="base"):
+        """
+        Coverage score of one cell (refreshes first if the map changed).
+
+        Args:
+            grid_x (int): Column of the cell
+            grid_y (int): Row of the cell
+            tower_type (str): Key of TOWER_RANGES
+
+        Returns:
+            float: Traffic in range of a tower there (0 if it cannot be built)
+        """
+        if self.is_stale():
+            self.refresh()
+        return float(self.grids[tower_type][grid_y, grid_x])
+
+    def best_cell(self, tower_type="base"):
+        """
+        The buildable cell with the most traffic in range (refreshes first if the map changed).
+
+        Args:
+            tower_type (str): Key of TOWER_RANGES
+
+        Returns:
+            tuple(int, int): (x, y) of the cell, or None if nothing useful can be built
+        """
+        if self.is_stale():
+            self.refresh()
+        return self.best[tower_type]
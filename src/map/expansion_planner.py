@@ -0,0 +1,140 @@
+from src.constants import *
+from src.map.map_io import map_to_bytes, map_data_from_buffer
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import random
+
+
+class MapChangePlan:
+    """
+    The outcome of a wave's map changes, computed on a snapshot of the map.
+    Holds the final grids so the live map can take them over in one step
+    (see Map.apply_change_plan).
+    """
+
+    def __init__(self, wave, add_width, add_height, state_grid, bitmask_grid, spawns, goals,
+                 spawn_added, goal_added):
+        self.wave = wave
+        self.add_width = add_width
+        self.add_height = add_height
+        self.state_grid = state_grid        # <-- final (height, width) state codes
+        self.bitmask_grid = bitmask_grid    # <-- final autotiling masks
+        self.spawns = spawns                # <-- final (x, y) of every spawn
+        self.goals = goals                  # <-- final (x, y) of every goal
+        self.spawn_added = spawn_added
+        self.goal_added = goal_added
+
+    @property
+    def expanded(self):
+        return self.add_width > 0 or self.add_height > 0
+
+
+def plan_map_changes(snapshot, towers, wave, expand, add_spawn, add_goal, seed):
+    """
+    Runs a wave's map mutations on a copy of the map (worker process).
+
+    Args:
+        snapshot (bytes): The map encoded with map_to_bytes
+        towers (np.ndarray): (n, 2) array of the (y, x) cells holding a tower
+        wave (int): The wave the changes belong to
+        expand (bool): Grow the map by MAP_EXPANSION_SIZE on each axis
+        add_spawn (bool): Carve a branch to a new spawn
+        add_goal (bool): Carve a branch to a new goal
+        seed (int): Seed for the copy's random generator
+
+    Returns:
+        MapChangePlan: The resulting grids
+    """
+    tilemap = map_data_from_buffer(snapshot).to_map()
+    tilemap.rng = random.Random(seed)
+    tilemap.tower_grid[towers[:, 0], towers[:, 1]] = True     # <-- new tunnels avoid them
+
+    add_size = MAP_EXPANSION_SIZE if expand else 0
+    if expand:
+        tilemap.expand_map(add_width=add_size, add_height=add_size)
+
+    spawn_count, goal_count = len(tilemap.spawns), len(tilemap.goals)
+    if add_spawn:
+        tilemap.generate_new_special_point("spawn")
+    if add_goal:
+        tilemap.generate_new_special_point("goal")
+    tilemap.calculate_autotiling()
+
+    return MapChangePlan(
+        wave, add_size, add_size,
+        tilemap.state_grid, tilemap.bitmask_grid,
+        [(t.x, t.y) for t in tilemap.spawns],
+        [(t.x, t.y) for t in tilemap.goals],
+        spawn_added=len(tilemap.spawns) > spawn_count,
+        goal_added=len(tilemap.goals) > goal_count,
+    )
+
+
+class ExpansionPlanner:
+    """
+    Computes the next wave's map changes in a background process, so the
+    wave start only has to commit the finished grids.
+    """
+
+    _executor = None    # <-- one worker process shared by every game
+
+    def __init__(self):
+        self.future = None
+        self.wave = None
+        self.revision = None    # <-- map revision the snapshot was taken at
+
+    def request(self, tilemap, wave, expand, add_spawn, add_goal):
+        """
+        Starts planning the changes of `wave` from the map as it is now.
+        Replaces any plan still pending.
+        """
+        self.cancel()
+        if ExpansionPlanner._executor is None:
+            ExpansionPlanner._executor = ProcessPoolExecutor(max_workers=1)
+
+        self.wave = wave
+        self.revision = tilemap.revision
+        self.future = ExpansionPlanner._executor.submit(
+            plan_map_changes, map_to_bytes(tilemap), np.argwhere(tilemap.tower_grid), wave,
+            expand, add_spawn, add_goal, random.getrandbits(31)
+        )
+
+    def is_stale(self, tilemap):
+        """True if a plan is pending but the map changed since its snapshot."""
+        return self.future is not None and tilemap.revision != self.revision
+
+    def take(self, wave):
+        """
+        Returns the plan for `wave` if the worker has finished it. A plan
+        still running is dropped rather than waited for, so the wave start
+        never stalls a frame (the caller then spreads the changes over frames).
+
+        Returns:
+            MapChangePlan: The plan, or None if none was requested, it is not ready or it failed
+        """
+        if self.future is None or self.wave != wave:
+            return None
+
+        future, self.future = self.future, None
+        if not future.done():
+            future.cancel()     # <-- no-op once running: the result is simply ignored
+            print("Map change plan not ready: applying the changes over frames instead")
+            return None
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"Map change planning failed: {e}")
+            return None
+
+    def cancel(self):
+        """Drops the pending plan."""
+        if self.future is not None:
+            self.future.cancel()
+            self.future = None
+
+    @classmethod
+    def shutdown(cls):
+        """Stops the shared worker process (pending plans are dropped). Called on exit."""
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
@@ -0,0 +1,210 @@
+"""
+Enemy routing for maze-building mode (MAZE_MODE).
+
+Every goal gets a distance field over the open tunnel cells. Enemies walk
+down the field one cell at a time instead of following a precomputed route,
+so when a tower blocks a tunnel only the fields are repaired (incrementally,
+around the blocked cell) and every enemy is rerouted at no extra cost.
+"""
+from src.constants import *
+from src.map.map_analysis import distance_field, label_chains
+import numpy as np
+import heapq
+from collections import deque
+
+# Orthogonal steps, in the order ties are broken
+STEPS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+
+class FlowField:
+    """Walking distance from every open cell to one goal (-1 where it is out of reach)."""
+
+    def __init__(self, open_grid, goal):
+        self.goal = goal        # <-- (x, y) of the goal cell
+        self.dist = distance_field(open_grid, goal)
+
+    def block(self, open_grid, cell):
+        """
+        Repairs the field after `cell` was closed (open_grid already updated).
+        Only the cells whose distance went through `cell` are touched:
+        1. Raise: drop the cells left without a neighbour one step closer
+        2. Lower: refill them from the intact cells around, nearest first
+
+        Args:
+            open_grid (np.ndarray): (height, width) bool grid of the open cells
+            cell (tuple(int, int)): (x, y) of the closed cell
+        """
+        dist = self.dist
+        height, width = dist.shape
+        x, y = cell
+        if dist[y, x] < 0:
+            return
+
+        # 1. Raise (breadth-first, so a whole level is dropped before the next is checked)
+        old = {cell: int(dist[y, x])}
+        dist[y, x] = -1
+        queue = deque([cell])
+        while queue:
+            cx, cy = queue.popleft()
+            child_dist = old[(cx, cy)] + 1
+            for sx, sy in STEPS:
+                nx, ny = cx + sx, cy + sy
+                if not (0 <= nx < width and 0 <= ny < height) or dist[ny, nx] != child_dist:
+                    continue
+                supported = any(
+                    0 <= nx + tx < width and 0 <= ny + ty < height and dist[ny + ty, nx + tx] == child_dist - 1
+                    for tx, ty in STEPS
+                )
+                if not supported:
+                    old[(nx, ny)] = child_dist
+                    dist[ny, nx] = -1
+                    queue.append((nx, ny))
+
+        # 2. Lower (Dijkstra with unit steps, seeded by the intact neighbours)
+        heap = []
+        for cx, cy in old:
+            if not open_grid[cy, cx]:
+                continue
+            best = -1
+            for sx, sy in STEPS:
+                nx, ny = cx + sx, cy + sy
+                if 0 <= nx < width and 0 <= ny < height and dist[ny, nx] >= 0:
+                    if best < 0 or dist[ny, nx] < best:
+                        best = int(dist[ny, nx])
+            if best >= 0:
+                heapq.heappush(heap, (best + 1, cx, cy))
+
+        while heap:
+            d, cx, cy = heapq.heappop(heap)
+            if 0 <= dist[cy, cx] <= d:
+                continue
+            dist[cy, cx] = d
+            for sx, sy in STEPS:
+                nx, ny = cx + sx, cy + sy
+                if (0 <= nx < width and 0 <= ny < height and open_grid[ny, nx]
+                        and (dist[ny, nx] < 0 or dist[ny, nx] > d + 1)):
+                    heapq.heappush(heap, (d + 1, nx, ny))
+
+    def next_cell(self, x, y):
+        """
+        The neighbour to step onto from (x, y) on the way to the goal.
+
+        Returns:
+            tuple(int, int): (x, y) of the next cell, (x, y) itself if no neighbour
+                             is closer (cut off), or None at the goal
+        """
+        if (x, y) == self.goal:
+            return None
+
+        dist = self.dist
+        height, width = dist.shape
+        best, best_dist = (x, y), dist[y, x] if dist[y, x] >= 0 else np.iinfo(np.int32).max
+        for sx, sy in STEPS:
+            nx, ny = x + sx, y + sy
+            if 0 <= nx < width and 0 <= ny < height and 0 <= dist[ny, nx] < best_dist:
+                best, best_dist = (nx, ny), dist[ny, nx]
+        return best
+
+
+class RoutePlanner:
+    """
+    One FlowField per goal over the map's open cells (walkable and tower-free).
+    Rebuilt in full when the map's tiles change, repaired in place when a
+    tower blocks a tunnel.
+    """
+
+    def __init__(self, tilemap):
+        self.map = tilemap
+        self.open_grid = None
+        self.fields = {}        # <-- goal Tile -> FlowField
+        self.terrain_revision = -1
+
+    def refresh(self):
+        """Rebuilds every field if the map's tiles changed since the last build."""
+        if self.map.terrain_revision == self.terrain_revision:
+            return
+        self.open_grid = np.isin(self.map.state_grid, WALKABLE_STATE_CODES) & ~self.map.tower_grid
+        self.fields = {goal: FlowField(self.open_grid, (goal.x, goal.y)) for goal in self.map.goals}
+        self.terrain_revision = self.map.terrain_revision
+
+    def distance(self, tile, goal):
+        """Steps from a tile to a goal, or None if the goal is out of reach."""
+        self.refresh()
+        d = int(self.fields[goal].dist[tile.y, tile.x])
+        return d if d >= 0 else None
+
+    def can_block(self, tile, occupied=()):
+        """
+        Checks that closing a tunnel tile leaves every spawn, and every cell
+        holding an enemy, connected to at least one goal.
+
+        Args:
+            tile (Tile): The tile a tower would block
+            occupied (list[tuple(int, int)]): (x, y) of the cells holding enemies
+
+        Returns:
+            bool: True if the tile can be blocked
+        """
+        self.refresh()
+        if (tile.x, tile.y) in occupied or tile in self.map.spawns or tile in self.map.goals:
+            return False
+
+        trial = self.open_grid.copy()
+        trial[tile.y, tile.x] = False
+        labels = label_chains(trial)
+        reachable = {labels[goal.y, goal.x] for goal in self.map.goals}
+
+        cells = [(s.x, s.y) for s in self.map.spawns] + list(occupied)
+        return all(labels[y, x] in reachable for x, y in cells if trial[y, x])
+
+    def block(self, tile):
+        """Closes a tile and repairs every field around it."""
+        self.refresh()
+        self.open_grid[tile.y, tile.x] = False
+        for field in self.fields.values():
+            field.block(self.open_grid, (tile.x, tile.y))
+
+    def next_point(self, goal, world_x, world_y):
+        """
+        Where an enemy at a world position heading for `goal` walks next.
+        If that goal can no longer be reached, the nearest open goal is used.
+
+        Returns:
+            tuple(float, float): World position of the next cell's center, or None at the goal
+        """
+        self.refresh()
+        cell = self.map.world_to_grid(world_x, world_y)
+        if cell is None or not self.fields:
+            return None
+
+        field = self._field_from(goal, cell)
+        if field is None:
+            return self.map.grid_to_world(*cell)     # <-- cut off: wait in place
+
+        step = field.next_cell(*cell)
+        if step is None:
+            return None
+        return self.map.grid_to_world(*step)
+
+    def steps_left(self, goal, world_x, world_y):
+        """
+        Steps still to walk from a world position to `goal` (or the nearest
+        open goal, as next_point walks). 0 when at a goal or cut off.
+        """
+        self.refresh()
+        cell = self.map.world_to_grid(world_x, world_y)
+        if cell is None or not self.fields:
+            return 0
+        field = self._field_from(goal, cell)
+        return 0 if field is None else int(field.dist[cell[1], cell[0]])
+
+    def _field_from(self, goal, cell):
+        """The field an enemy on `cell` heading for `goal` follows, None if every goal is out of reach."""
+        # A goal sealed off by towers sends the enemy to the nearest one still open
+        field = self.fields.get(goal)
+        if field is None or field.dist[cell[1], cell[0]] < 0:
+            open_fields = [f for f in self.fields.values() if f.dist[cell[1], cell[0]] >= 0]
+            if not open_fields:
+                return None
+            field = min(open_fields, key=lambda f: f.dist[cell[1], cell[0]])
+        return field
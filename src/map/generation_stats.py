@@ -0,0 +1,57 @@
+from src.constants import *
+import time
+
+# Why the DFS refused to step onto a tile (see Map._tile_rejection)
+REJECTION_RULES = ("border", "path", "visited", "tower", "adjacency", "cluster")
+
+
+class GenerationStats:
+    """
+    Counters and per-phase timing for the map generator.
+    Disabled by default: the generator then skips every update, so the only
+    cost left is a few `if` checks per search.
+    Phase times are wall time, so they include pauses when a phase runs as a job.
+    """
+
+    def __init__(self, enabled=MAP_STATS_ENABLED):
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self):
+        """Clears every counter."""
+        self.nodes_expanded = 0                             # <-- tiles pushed on the DFS stack
+        self.backtracks = 0                                 # <-- dead ends popped off it
+        self.rejections = dict.fromkeys(REJECTION_RULES, 0)
+        self.attempts = {}                                  # <-- DFS runs per kind of path
+        self.accepted = {}                                  # <-- paths kept per kind of path
+        self.phase_time = {}                                # <-- seconds per phase
+        self.phase_calls = {}
+
+    def add_attempts(self, kind, attempts, accepted):
+        """Records the DFS runs spent on one path of the given kind."""
+        self.attempts[kind] = self.attempts.get(kind, 0) + attempts
+        self.accepted[kind] = self.accepted.get(kind, 0) + (1 if accepted else 0)
+
+    def add_time(self, phase, started):
+        """Adds the time since `started` (a perf_counter value) to a phase."""
+        self.phase_time[phase] = self.phase_time.get(phase, 0.0) + time.perf_counter() - started
+        self.phase_calls[phase] = self.phase_calls.get(phase, 0) + 1
+
+    def as_dict(self):
+        """
+        Returns:
+            dict: A snapshot of every counter, plus attempts per accepted path
+        """
+        return {
+            "nodes_expanded": self.nodes_expanded,
+            "backtracks": self.backtracks,
+            "rejections": dict(self.rejections),
+            "attempts": dict(self.attempts),
+            "accepted": dict(self.accepted),
+            "attempts_per_path": {
+                kind: self.attempts[kind] / self.accepted[kind]
+                for kind in self.attempts if self.accepted.get(kind)
+            },
+            "phase_time": dict(self.phase_time),
+            "phase_calls": dict(self.phase_calls),
+        }
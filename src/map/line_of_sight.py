@@ -0,0 +1,94 @@
+"""
+Grid raycasting between tile centers, used for tower line of sight.
+
+Only walkable tiles (tunnels, spawns, goals) let sight through; rock and
+border tiles block it.
+"""
+from src.constants import *
+import numpy as np
+
+
+def ray_is_clear(walkable, x0, y0, x1, y1):
+    """
+    Walks the cells crossed by the segment between two cell centers
+    (Amanatides-Woo traversal) and checks that none of them blocks.
+    The two end cells are not checked. A ray passing exactly through a cell
+    corner only counts as blocked if both cells beside the corner block.
+
+    Args:
+        walkable (np.ndarray): (height, width) bool grid, True where sight passes
+        x0 (int): Column of the viewing cell
+        y0 (int): Row of the viewing cell
+        x1 (int): Column of the target cell
+        y1 (int): Row of the target cell
+
+    Returns:
+        bool: True if nothing blocks the ray
+    """
+    dx, dy = x1 - x0, y1 - y0
+    step_x = 1 if dx > 0 else -1
+    step_y = 1 if dy > 0 else -1
+
+    # Ray parameter of the next vertical / horizontal cell boundary, and between two
+    # of them, scaled by 2 * |dx| * |dy| so corners compare exactly (integers only)
+    span_x, span_y = max(abs(dx), 1), max(abs(dy), 1)
+    no_crossing = 4 * span_x * span_y     # <-- past the target: that axis never steps
+    t_delta_x = 2 * span_y
+    t_delta_y = 2 * span_x
+    t_max_x = span_y if dx else no_crossing
+    t_max_y = span_x if dy else no_crossing
+
+    x, y = x0, y0
+    while True:
+        if t_max_x < t_max_y:
+            x += step_x
+            t_max_x += t_delta_x
+        elif t_max_y < t_max_x:
+            y += step_y
+            t_max_y += t_delta_y
+        else:
+            # Exactly through a corner: squeezes past unless both sides block
+            if not walkable[y, x + step_x] and not walkable[y + step_y, x]:
+                return False
+            x += step_x
+            y += step_y
+            t_max_x += t_delta_x
+            t_max_y += t_delta_y
+
+        if x == x1 and y == y1:
+            return True
+        if not walkable[y, x]:
+            return False
+
+
+def cells_in_view(state_grid, origin, radius, line_of_sight=True):
+    """
+    Finds the walkable cells in range of a viewer at `origin`.
+
+    Args:
+        state_grid (np.ndarray): (height, width) TILE_STATE_CODES
+        origin (tuple(int, int)): (x, y) of the viewing cell
+        radius (float): Range in pixels (measured between cell centers)
+        line_of_sight (bool): Leave out the cells hidden behind rock
+
+    Returns:
+        tuple(list, int): ([(x, y) of the cells in view], number of hidden cells)
+    """
+    walkable = np.isin(state_grid, WALKABLE_STATE_CODES)
+    height, width = walkable.shape
+    ox, oy = origin
+    r = int(radius // TILE_SIZE)
+
+    # Walkable cells whose center is within range (a window around the origin)
+    x_lo, x_hi = max(0, ox - r), min(width, ox + r + 1)
+    y_lo, y_hi = max(0, oy - r), min(height, oy + r + 1)
+    ys, xs = np.nonzero(walkable[y_lo:y_hi, x_lo:x_hi])
+    xs += x_lo
+    ys += y_lo
+    in_range = (xs - ox) ** 2 + (ys - oy) ** 2 <= (radius / TILE_SIZE) ** 2
+    cells = list(zip(xs[in_range].tolist(), ys[in_range].tolist()))
+    if not line_of_sight:
+        return cells, 0
+
+    visible = [(x, y) for x, y in cells if (x, y) == (ox, oy) or ray_is_clear(walkable, ox, oy, x, y)]
+    return visible, len(cells) - len(visible)
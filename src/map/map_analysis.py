@@ -0,0 +1,320 @@
+"""
+Map quality analytics computed over the state grid with NumPy.
+
+Everything works on the (height, width) grids alone, so maps can be scored
+in worker processes or over a whole seed corpus without building any Tile
+sprites. analyze_map() is the entry point for a live Map.
+"""
+from src.constants import *
+import numpy as np
+
+# Tower types and their range in pixels (coverage is reported per type)
+TOWER_RANGES = {
+    "base": BASE_TOWER_RANGE_RADIUS,
+    "AOE": AOE_RANGE_RADIUS,
+    "laser": LASER_TOWER_RANGE_RADIUS,
+}
+
+
+def neighbour_count(mask, diagonal=False):
+    """
+    Counts, for every cell, how many of its neighbours are set in `mask`.
+
+    Args:
+        mask (np.ndarray): (height, width) bool grid
+        diagonal (bool): Count all 8 neighbours instead of the 4 orthogonal ones
+
+    Returns:
+        np.ndarray: (height, width) uint8 counts
+    """
+    h, w = mask.shape
+    padded = np.pad(mask, 1).astype(np.uint8)
+    count = np.zeros((h, w), dtype=np.uint8)
+    for dy in (0, 1, 2):
+        for dx in (0, 1, 2):
+            if dx == 1 and dy == 1:
+                continue
+            if not diagonal and dx != 1 and dy != 1:
+                continue
+            count += padded[dy:dy + h, dx:dx + w]
+    return count
+
+
+def disk_sum(values, radius):
+    """
+    Sums `values` over a disk around every cell (tile centers within `radius`).
+    Each disk row is a horizontal window read from prefix sums, so the cost
+    is one vectorized pass per row of the disk, whatever its area.
+
+    Args:
+        values (np.ndarray): (height, width) grid of weights
+        radius (float): Disk radius in tiles
+
+    Returns:
+        np.ndarray: (height, width) float64 sums
+    """
+    h, w = values.shape
+    r = int(radius)
+
+    # Pad by r on every side, plus one leading zero column for the prefix sums
+    padded = np.zeros((h + 2 * r, w + 2 * r + 1))
+    padded[r:r + h, r + 1:r + 1 + w] = values
+    prefix = np.cumsum(padded, axis=1)
+
+    out = np.zeros((h, w))
+    for dy in range(-r, r + 1):
+        half = int(np.sqrt(radius * radius - dy * dy))
+        rows = prefix[r + dy:r + dy + h]
+        out += rows[:, r + 1 + half:r + 1 + half + w] - rows[:, r - half:r - half + w]
+    return out
+
+
+def distance_field(walkable, start):
+    """
+    Walking distance (orthogonal steps) from `start` over walkable cells.
+    BFS over flat cell indices: each step handles the whole wavefront at once,
+    and only the frontier cells are touched (tunnels are thin).
+
+    Args:
+        walkable (np.ndarray): (height, width) bool grid
+        start (tuple(int, int)): (x, y) of the start cell
+
+    Returns:
+        np.ndarray: (height, width) int32 distances, -1 where unreachable
+    """
+    h, w = walkable.shape
+    row = w + 2
+    is_walkable = np.pad(walkable, 1).ravel()   # <-- padding keeps neighbours from wrapping
+    offsets = np.array([1, -1, row, -row])
+
+    dist = np.full(is_walkable.size, -1, dtype=np.int32)
+    frontier = np.array([(start[1] + 1) * row + start[0] + 1])
+    dist[frontier] = 0
+
+    step = 0
+    while frontier.size:
+        step += 1
+        grown = np.unique((frontier[:, None] + offsets).ravel())
+        frontier = grown[is_walkable[grown] & (dist[grown] < 0)]
+        dist[frontier] = step
+
+    return dist.reshape(h + 2, row)[1:-1, 1:-1]
+
+
+def label_chains(mask):
+    """
+    Labels the 4-connected components of `mask`.
+    Every cell hooks onto its smallest neighbouring label, then labels are
+    shortened by pointer jumping, so it settles in a few vectorized passes.
+
+    Returns:
+        np.ndarray: (height, width) int64 labels (-1 outside the mask)
+    """
+    h, w = mask.shape
+    row = w + 2
+    flat = np.pad(mask, 1).ravel()
+    cells = np.flatnonzero(flat)
+
+    # Neighbour table in cell order (a missing neighbour points at the cell itself)
+    position = np.full(flat.size, -1, dtype=np.int64)
+    position[cells] = np.arange(cells.size)
+    own = np.arange(cells.size)
+    neighbours = position[cells[:, None] + np.array([1, -1, row, -row])]
+    neighbours = np.where(neighbours < 0, own[:, None], neighbours)
+
+    label = own.copy()
+    while cells.size:
+        smallest = np.minimum(label, label[neighbours].min(axis=1))
+        if np.array_equal(smallest, label):
+            break
+
+        # Hook each root to the smallest label seen by its members, then jump
+        np.minimum.at(label, label, smallest)
+        label = np.minimum(label, smallest)
+        while True:
+            jumped = label[label]
+            if np.array_equal(jumped, label):
+                break
+            label = jumped
+
+    out = np.full(flat.size, -1, dtype=np.int64)
+    out[cells] = label
+    return out.reshape(h + 2, row)[1:-1, 1:-1]
+
+
+def buildable_cells(state_grid, tower_grid=None):
+    """
+    Cells where a tower may stand: empty, touching a path (8 neighbours), no tower.
+    Same rule as Map.buildable_mask.
+    """
+    is_path = state_grid == TILE_STATE_CODES['path']
+    buildable = (state_grid == TILE_STATE_CODES['empty']) & (neighbour_count(is_path, diagonal=True) > 0)
+    if tower_grid is not None:
+        buildable &= ~tower_grid
+    return buildable
+
+
+def traffic_grid(state_grid, spawns, goals):
+    """
+    Expected number of times one enemy steps on each cell on its way to a goal.
+    Follows the game's routing: a uniformly random spawn, then a goal weighted
+    by 1 / route length ** 1.5 (see GameView.get_weighted_goal), then a shortest
+    route. Where several shortest routes tie, the enemy is split evenly over the
+    cells at each step.
+
+    Args:
+        state_grid (np.ndarray): (height, width) TILE_STATE_CODES
+        spawns (list[tuple(int, int)]): (x, y) of every spawn
+        goals (list[tuple(int, int)]): (x, y) of every goal
+
+    Returns:
+        np.ndarray: (height, width) float64 traffic (0 off every route)
+    """
+    walkable = np.isin(state_grid, WALKABLE_STATE_CODES)
+    traffic = np.zeros(state_grid.shape)
+    if not spawns or not goals:
+        return traffic
+
+    goal_fields = [distance_field(walkable, goal) for goal in goals]
+    for spawn in spawns:
+        from_spawn = distance_field(walkable, spawn)
+
+        # 1. Goal odds from the route lengths (unreachable goals are never picked)
+        lengths = np.array([from_spawn[goal[1], goal[0]] for goal in goals], dtype=np.float64)
+        reachable = lengths >= 0
+        if not reachable.any():
+            continue
+        weights = np.zeros(len(goals))
+        weights[reachable] = 1 / (lengths[reachable] + 1) ** 1.5
+        weights /= weights.sum() * len(spawns)
+
+        # 2. Cells on a shortest route, spread evenly over each step
+        for goal_field, length, weight in zip(goal_fields, lengths, weights):
+            if weight == 0:
+                continue
+            on_route = (from_spawn >= 0) & (goal_field >= 0) & (from_spawn + goal_field == length)
+            per_step = np.bincount(from_spawn[on_route], minlength=int(length) + 1)
+            traffic[on_route] += weight / per_step[from_spawn[on_route]]
+    return traffic
+
+
+def coverage_grid(traffic, radius, buildable):
+    """
+    Route traffic a tower of the given range would see from each buildable cell.
+
+    Args:
+        traffic (np.ndarray): (height, width) output of traffic_grid
+        radius (float): Tower range in pixels
+        buildable (np.ndarray): (height, width) bool grid of buildable cells
+
+    Returns:
+        np.ndarray: (height, width) float64 (0 where nothing can be built)
+    """
+    return disk_sum(traffic, radius / TILE_SIZE) * buildable
+
+
+def analyze_grid(state_grid, spawns, goals, tower_grid=None):
+    """
+    Computes the quality metrics of a map from its grids.
+
+    Args:
+        state_grid (np.ndarray): (height, width) TILE_STATE_CODES
+        spawns (list[tuple(int, int)]): (x, y) of every spawn
+        goals (list[tuple(int, int)]): (x, y) of every goal
+        tower_grid (np.ndarray): Optional (height, width) bool grid of placed towers
+
+    Returns:
+        dict: {
+            "path_lengths": {(spawn, goal): tiles on the shortest route, or None},
+            "path_tiles": number of path tiles,
+            "junctions": walkable cells with 3 or more walkable neighbours,
+            "branching_factor": extra exits per walkable tile (sum of degree - 2 over junctions),
+            "corridor_histogram": np.ndarray, count of corridors per length (index = length),
+            "longest_corridor": length of the longest corridor,
+            "buildable_cells": number of cells a tower can be placed on,
+            "coverage": {tower type: fraction of path tiles in range of a buildable cell},
+        }
+    """
+    walkable = np.isin(state_grid, WALKABLE_STATE_CODES)
+    is_path = state_grid == TILE_STATE_CODES['path']
+
+    # 1. Route length for every spawn/goal pair (one distance field per spawn)
+    path_lengths = {}
+    for spawn in spawns:
+        dist = distance_field(walkable, spawn)
+        for goal in goals:
+            d = int(dist[goal[1], goal[0]])
+            path_lengths[(tuple(spawn), tuple(goal))] = d + 1 if d >= 0 else None
+
+    # 2. Junctions and branching
+    degree = neighbour_count(walkable) * walkable
+    junction = degree >= 3
+    walkable_count = int(walkable.sum())
+    extra_exits = int((degree[junction].astype(np.int32) - 2).sum())
+
+    # 3. Corridors: runs of plain path tiles with exactly two walkable neighbours
+    corridor = is_path & (degree == 2)
+    labels = label_chains(corridor)
+    lengths = np.bincount(labels[corridor])
+    lengths = lengths[lengths > 0]
+    histogram = np.bincount(lengths) if lengths.size else np.zeros(1, dtype=np.int64)
+
+    # 4. Buildable cells and what they can reach
+    buildable = buildable_cells(state_grid, tower_grid)
+    path_count = int(is_path.sum())
+    coverage = {}
+    for tower_type, radius in TOWER_RANGES.items():
+        in_range = disk_sum(buildable, radius / TILE_SIZE) > 0
+        covered = int((in_range & is_path).sum())
+        coverage[tower_type] = covered / path_count if path_count else 0.0
+
+    return {
+        "path_lengths": path_lengths,
+        "path_tiles": path_count,
+        "junctions": int(junction.sum()),
+        "branching_factor": extra_exits / walkable_count if walkable_count else 0.0,
+        "corridor_histogram": histogram,
+        "longest_corridor": int(lengths.max()) if lengths.size else 0,
+        "buildable_cells": int(buildable.sum()),
+        "coverage": coverage,
+    }
+
+
+def analyze_map(tilemap):
+    """
+    Computes the quality metrics of a live Map (see analyze_grid).
+
+    Args:
+        tilemap (Map): The map to analyze
+
+    Returns:
+        dict: The metrics
+    """
+    return analyze_grid(
+        tilemap.state_grid,
+        [(t.x, t.y) for t in tilemap.spawns],
+        [(t.x, t.y) for t in tilemap.goals],
+        tilemap.tower_grid,
+    )
+
+
+def rejection_reasons(report):
+    """
+    Checks a report against the MAP_QUALITY_* thresholds.
+
+    Args:
+        report (dict): Output of analyze_grid / analyze_map
+
+    Returns:
+        list[str]: Why the map is rejected (empty if it is acceptable)
+    """
+    reasons = []
+    if any(length is None for length in report["path_lengths"].values()):
+        reasons.append("unreachable goal")
+    if report["buildable_cells"] < MAP_QUALITY_MIN_BUILDABLE:
+        reasons.append("too few buildable cells")
+    if report["coverage"]["base"] < MAP_QUALITY_MIN_COVERAGE:
+        reasons.append("path not coverable")
+    if report["longest_corridor"] > MAP_QUALITY_MAX_CORRIDOR:
+        reasons.append("corridor too long")
+    return reasons
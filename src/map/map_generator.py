@@ -1,10 +1,13 @@
 from src.constants import *
 from src.utils.helper_functions import *
 from src.entities.tile import Tile
+from src.map.generation_stats import GenerationStats
+import numpy as np
 import random
+import time
 
 class Map:
-    def __init__(self, width, height, difficulty=4):
+    def __init__(self, width, height, difficulty=4, seed=None, generate=True):
         """
         Initializes the map with the given width and height.
 
@@ -12,18 +15,89 @@ class Map:
             width (int): The width of the map.
             height (int): The height of the map.
             difficulty (int): The difficulty of the map.
+            seed (int): Seed for the map's random generator (None = random layout).
+            generate (bool): Whether to generate a new layout (False when loading one).
         """
         self.width = width
         self.height = height
         self.difficulty = difficulty
+        self.seed = seed
+        self.rng = random.Random(seed)   # <-- every generation step draws from this
         self.map = None
         self.spawns = []
         self.goals = []
-        self.generate_new_map()
+
+        # Grids mirroring the tiles, indexed [y, x]
+        self.state_grid = None          # <-- TILE_STATE_CODES of every tile
+        self.tower_grid = None          # <-- True where a tower stands
+        self.buildable_mask = None      # <-- True where a tower may be placed
+        self.bitmask_grid = None        # <-- autotiling bitmask of every tile
+
+        # Bumped on every tile or tower change, so views can tell when to refresh
+        self.revision = 0
+        self.terrain_revision = 0       # <-- tile changes only (towers leave it alone)
+
+        # Generator counters and timings (off unless MAP_STATS_ENABLED or enabled by hand)
+        self.stats = GenerationStats()
+
+        if generate:
+            self.generate_new_map()
+
+    @classmethod
+    def from_grids(cls, state_grid, bitmask_grid, spawns, goals, difficulty=4, seed=None):
+        """
+        Builds a map from saved grids instead of generating one.
+
+        Args:
+            state_grid (np.ndarray): (height, width) array of tile state codes
+            bitmask_grid (np.ndarray): (height, width) array of autotiling bitmasks
+            spawns (list[tuple(int, int)]): (x, y) of every spawn
+            goals (list[tuple(int, int)]): (x, y) of every goal
+            difficulty (int): The difficulty of the map.
+            seed (int): Seed the map was generated from, if known.
+
+        Returns:
+            Map: The rebuilt map
+        """
+        height, width = state_grid.shape
+        tilemap = cls(width, height, difficulty=difficulty, seed=seed, generate=False)
+        tilemap.load_grids(state_grid, bitmask_grid, spawns, goals)
+        return tilemap
+
+    def load_grids(self, state_grid, bitmask_grid, spawns, goals):
+        """
+        Replaces the whole map with the given grids (see from_grids).
+        """
+        self.height, self.width = state_grid.shape
+        self.state_grid = np.array(state_grid, dtype=np.uint8)
+        self.bitmask_grid = np.array(bitmask_grid, dtype=np.uint8)
+        self.tower_grid = np.zeros((self.height, self.width), dtype=bool)
+        self.buildable_mask = np.zeros((self.height, self.width), dtype=bool)
+
+        # One Tile per cell, created directly in its final state
+        self.map = [
+            [Tile(x, y, TILE_STATE_NAMES[code]) for x, code in enumerate(row)]
+            for y, row in enumerate(self.state_grid.tolist())
+        ]
+        for y, x in np.argwhere(self.bitmask_grid):
+            self.map[y][x].set_bitmask(int(self.bitmask_grid[y, x]))
+
+        self.spawns = [self.map[y][x] for x, y in spawns]
+        self.goals = [self.map[y][x] for x, y in goals]
+
+        self.refresh_buildable_mask()
+        self.revision += 1
+        self.terrain_revision += 1
 
     def generate_new_map(self):
         """Completely resets the map with new spawn and goal locations."""
         self.map = [[Tile(x, y) for x in range(self.width)] for y in range(self.height)]
+        self.state_grid = np.zeros((self.height, self.width), dtype=np.uint8)
+        self.tower_grid = np.zeros((self.height, self.width), dtype=bool)
+        self.buildable_mask = np.zeros((self.height, self.width), dtype=bool)
+        self.bitmask_grid = np.zeros((self.height, self.width), dtype=np.uint8)
+        self.revision += 1
+        self.terrain_revision += 1
 
         # mark the border
         self.make_border()
@@ -37,23 +111,23 @@ class Map:
             offset=SPAWN_GOAL_DISTANCE_FROM_EDGE
         )
 
-        spawn_tile.set_state('spawn')
+        self.set_tile_state(spawn_tile, 'spawn')
         self.spawns.append(spawn_tile)
 
-        goal_tile.set_state('goal')
+        self.set_tile_state(goal_tile, 'goal')
         self.goals.append(goal_tile)
 
     def make_border(self):
         """Marks the border tiles with a distinct color."""
         # Top and bottom row
         for x in range(self.width):
-            self.map[0][x].set_state('border')
-            self.map[self.height - 1][x].set_state('border')
+            self.set_tile_state(self.map[0][x], 'border')
+            self.set_tile_state(self.map[self.height - 1][x], 'border')
 
         # Left and right column (excluding corners already set)
         for y in range(1, self.height - 1):
-            self.map[y][0].set_state('border')
-            self.map[y][self.width - 1].set_state('border')
+            self.set_tile_state(self.map[y][0], 'border')
+            self.set_tile_state(self.map[y][self.width - 1], 'border')
 
     def generate_opposite_side_positions(self, offset=3, offset_range=2):
         """
@@ -69,17 +143,17 @@ class Map:
         """
         # 1. Randomly decide which corner the spawn starts in
         # True = Low coordinate (Left or Top), False = High coordinate (Right or Bottom)
-        spawn_on_left = random.choice([True, False])
-        spawn_on_top = random.choice([True, False])
+        spawn_on_left = self.rng.choice([True, False])
+        spawn_on_top = self.rng.choice([True, False])
 
         # 2. Define Helper to get a random coordinate based on the side (Low or High)
         def get_coordinate(is_low_side, limit):
             if is_low_side:
                 # "Low" side (Left or Top)
-                return random.randint(offset, offset + offset_range)
+                return self.rng.randint(offset, offset + offset_range)
             else:
                 # "High" side (Right or Bottom)
-                return random.randint(limit - 1 - offset - offset_range, limit - 1 - offset)
+                return self.rng.randint(limit - 1 - offset - offset_range, limit - 1 - offset)
 
         # 3. Calculate Spawn Coordinates
         spawn_x = get_coordinate(spawn_on_left, self.width)
@@ -103,42 +177,71 @@ class Map:
             add_height (int): Number of tiles to add to the height.
             add_new_spawns_goals (bool): Whether to add new spawns and goals.
         """
+        run_to_completion(self.iter_expand_map(add_width, add_height))
+
+    def iter_expand_map(self, add_width=0, add_height=0):
+        """
+        Step-wise expand_map for the JobScheduler.
+        Yields None while the new tiles are being built (the map is untouched
+        until then), then yields every new tile once the map has switched over.
+        """
+        stats = self.stats if self.stats.enabled else None
+        started = time.perf_counter() if stats is not None else 0.0
+
         # Compute new dimensions
         new_width = self.width + add_width
         new_height = self.height + add_height
 
-        # Create empty new map matrix
-        new_map = [[Tile(x, y) for x in range(new_width)] for y in range(new_height)]
+        # Create empty new map matrix (filled below, so no tile is built twice)
+        new_map = [[None] * new_width for _ in range(new_height)]
 
         # Center offset for placing old map inside new one
         x_offset = (new_width - self.width) // 2
         y_offset = (new_height - self.height) // 2
 
-        # Copy old tiles into new map
+        # 1. Build the tiles of the new outer ring (the slow part, spread over steps)
+        new_tiles = []
         for y in range(new_height):
             for x in range(new_width):
                 old_x = x - x_offset
                 old_y = y - y_offset
 
-                if 0 <= old_x < self.width and 0 <= old_y < self.height:    #
-                    new_tile = self.map[old_y][old_x]
-                    new_tile.update_position(x, y)  # updates the tile object's internal x,y
-
-                else:
-                    new_tile = Tile(x, y)
-
-                new_map[y][x] = new_tile
-
-        # Clear all old borders that are now inside the new map
-        for row in new_map:
-            for tile in row:
-                if tile.get_state() == 'border':
-                    tile.clear_state()
+                if not (0 <= old_x < self.width and 0 <= old_y < self.height):
+                    new_map[y][x] = Tile(x, y)
+                    new_tiles.append(new_map[y][x])
+                    if len(new_tiles) % JOB_STEP_NODES == 0:
+                        yield
+
+        # 2. Copy old tiles into new map (from here on, no pauses until it is consistent)
+        for old_y, row in enumerate(self.map):
+            for old_x, old_tile in enumerate(row):
+                old_tile.update_position(old_x + x_offset, old_y + y_offset)  # updates the tile object's internal x,y
+                if old_tile.tower is not None:
+                    old_tile.tower.update_position_for_map_expansion()     # <-- towers, rings and dots move with their tile
+                new_map[old_y + y_offset][old_x + x_offset] = old_tile
+
+        # Carry the grids over into the same centred window
+        new_state_grid = np.zeros((new_height, new_width), dtype=np.uint8)
+        new_state_grid[y_offset:y_offset + self.height, x_offset:x_offset + self.width] = self.state_grid
+        new_tower_grid = np.zeros((new_height, new_width), dtype=bool)
+        new_tower_grid[y_offset:y_offset + self.height, x_offset:x_offset + self.width] = self.tower_grid
+        new_bitmask_grid = np.zeros((new_height, new_width), dtype=np.uint8)
+        new_bitmask_grid[y_offset:y_offset + self.height, x_offset:x_offset + self.width] = self.bitmask_grid
 
         # --- Update map references and size ---
         self.map = new_map
         self.width = new_width
         self.height = new_height
+        self.state_grid = new_state_grid
+        self.tower_grid = new_tower_grid
+        self.bitmask_grid = new_bitmask_grid
+        self.buildable_mask = np.zeros((new_height, new_width), dtype=bool)
+        self.revision += 1
+        self.terrain_revision += 1
+
+        # Clear all old borders that are now inside the new map
+        for y, x in np.argwhere(self.state_grid == TILE_STATE_CODES['border']):
+            self.set_tile_state(self.map[y][x], 'empty')
 
         # --- Update spawn/goal coordinates ---
         self.spawns = [self.map[t.y][t.x] for t in self.spawns]
@@ -146,6 +249,57 @@ class Map:
 
         # --- Rebuild the outer border ---
         self.make_border()
+        self.refresh_buildable_mask()
+        if stats is not None:
+            stats.add_time("expand", started)
+
+        # 3. Hand out the new tiles
+        for tile in new_tiles:
+            yield tile
+
+    def apply_change_plan(self, plan):
+        """
+        Commits map changes computed on a snapshot (see expansion_planner).
+        Only the cells that differ are touched.
+
+        Args:
+            plan (MapChangePlan): The planned grids
+
+        Returns:
+            bool: True if committed, False if the plan no longer fits the map
+                  (a tower now stands where the plan carves a tunnel)
+        """
+        return run_to_completion(self.iter_apply_change_plan(plan))
+
+    def iter_apply_change_plan(self, plan):
+        """apply_change_plan that also yields every new or changed tile."""
+        x_offset, y_offset = plan.add_width // 2, plan.add_height // 2
+        if plan.state_grid.shape != (self.height + plan.add_height, self.width + plan.add_width):
+            return False
+
+        # 1. Conflict check before touching anything (no tower tile may change)
+        tower_ys, tower_xs = np.nonzero(self.tower_grid)
+        planned = plan.state_grid[tower_ys + y_offset, tower_xs + x_offset]
+        if np.any(planned != self.state_grid[tower_ys, tower_xs]):
+            return False
+
+        # 2. Grow the map exactly like the planner did
+        if plan.expanded:
+            yield from self.iter_expand_map(add_width=plan.add_width, add_height=plan.add_height)
+
+        # 3. Copy over the cells that differ
+        for y, x in np.argwhere(self.state_grid != plan.state_grid):
+            self.set_tile_state(self.map[y][x], TILE_STATE_NAMES[int(plan.state_grid[y, x])])
+            yield self.map[y][x]
+
+        changed = self.bitmask_grid != plan.bitmask_grid
+        for y, x in np.argwhere(changed):
+            self.map[y][x].set_bitmask(int(plan.bitmask_grid[y, x]))
+        self.bitmask_grid[changed] = plan.bitmask_grid[changed]
+
+        self.spawns = [self.map[y][x] for x, y in plan.spawns]
+        self.goals = [self.map[y][x] for x, y in plan.goals]
+        return True
 
     def recursive_path_generation(self, start_tile, end_tile):
         """
@@ -160,6 +314,17 @@ class Map:
             Returns:
                 list[Tile]: The path from start to goal
             """
+        return run_to_completion(self.iter_path_generation(start_tile, end_tile))
+
+    def iter_path_generation(self, start_tile, end_tile):
+        """
+        Step-wise recursive_path_generation for the JobScheduler.
+        Yields None every JOB_STEP_NODES search nodes, then every carved tile,
+        and returns the path.
+        """
+        stats = self.stats if self.stats.enabled else None
+        started = time.perf_counter() if stats is not None else 0.0
+
         '''Initialize the map and variables'''
         self.clear_map()
         visited = set()
@@ -170,24 +335,33 @@ class Map:
         shortest_path_length = start_tile.shortest_path_to(end_tile)
 
         '''Generate the first path'''
-        success = self.recursive_path_helper(start_tile, end_tile, visited, path, detour_chance)
+        success = yield from self._iter_path_helper(start_tile, end_tile, visited, path, detour_chance)
 
         '''Generate the path until it satisfy the requirement'''
+        attempts = 1
         while True:
             visited = set()
             path = {}
-            success = self.recursive_path_helper(start_tile, end_tile, visited, path, detour_chance)
+            success = yield from self._iter_path_helper(start_tile, end_tile, visited, path, detour_chance)
+            attempts += 1
             # Check if the path is in a desired range
             if success and (scales[1] * shortest_path_length > len(path) > scales[0] * shortest_path_length):
                 break
 
-        # Color the final path
+        if stats is not None:
+            stats.add_attempts("main_path", attempts, accepted=True)
+
+        # Color the final path (handing out each carved tile)
         for t in path.values():
-            t.set_state('path')
+            self.set_tile_state(t, 'path')
+            yield t
         for spawn in self.spawns:
-            spawn.set_state('spawn')
+            self.set_tile_state(spawn, 'spawn')
         for goal in self.goals:
-            goal.set_state('goal')
+            self.set_tile_state(goal, 'goal')
+
+        if stats is not None:
+            stats.add_time("main_path", started)
         return path
 
         # Note the new argument: parent_tile=None
@@ -197,6 +371,11 @@ class Map:
         Iterative DFS (Depth First Search).
         Uses a stack to simulate recursion, avoiding RecursionError on large maps.
         """
+        return run_to_completion(self._iter_path_helper(
+            start_tile, goal_tile, visited, path, detour_chance, depth, parent_tile))
+
+    def _iter_path_helper(self, start_tile, goal_tile, visited, path, detour_chance, depth=0, parent_tile=None):
+        """Step-wise recursive_path_helper (yields every JOB_STEP_NODES nodes)."""
         # Get initial directions for the start tile
         initial_dirs = self.get_shuffled_directions_toward_goal(start_tile, goal_tile, detour_chance)
 
@@ -207,77 +386,113 @@ class Map:
         visited.add((start_tile.x, start_tile.y))
         path[(start_tile.x, start_tile.y)] = start_tile
 
-        while stack:
-            # Peek at the current context (Do not pop yet, we need to know if we must backtrack)
-            current_context = stack[-1]
-            tile, parent, directions = current_context
+        # Counters stay local and are added to the stats once per search
+        stats = self.stats if self.stats.enabled else None
+        nodes = backtracks = 0
 
-            # 1. Check if we found the goal
-            if tile == goal_tile:
-                return True
+        try:
+            steps = 0
+            while stack:
+                steps += 1
+                if steps % JOB_STEP_NODES == 0:
+                    yield
 
-            # 2. Try to find a valid move from the remaining directions
-            found_valid_move = False
+                # Peek at the current context (Do not pop yet, we need to know if we must backtrack)
+                current_context = stack[-1]
+                tile, parent, directions = current_context
 
-            while directions:
-                direction = directions.pop(0)  # Get the next direction
-                neighbor = self.get_neighboring_tile(tile, direction)
+                # 1. Check if we found the goal
+                if tile == goal_tile:
+                    return True
 
-                if not neighbor:
-                    continue
+                # 2. Try to find a valid move from the remaining directions
+                found_valid_move = False
 
-                # Check if this neighbor is valid
-                if self._check_tile_validity(neighbor, tile, goal_tile, visited, path):
-                    # Valid move found!
+                while directions:
+                    direction = directions.pop(0)  # Get the next direction
+                    neighbor = self.get_neighboring_tile(tile, direction)
 
-                    # Add to path/visited
-                    visited.add((neighbor.x, neighbor.y))
-                    path[(neighbor.x, neighbor.y)] = neighbor
+                    if not neighbor:
+                        continue
 
-                    # Generate directions for this NEW tile
-                    new_dirs = self.get_shuffled_directions_toward_goal(neighbor, goal_tile, detour_chance)
+                    # Check if this neighbor is valid
+                    rejection = self._tile_rejection(neighbor, tile, goal_tile, visited, path)
+                    if rejection is None:
+                        # Valid move found!
+                        nodes += 1
 
-                    # Push new context to stack
-                    stack.append([neighbor, tile, new_dirs])
+                        # Add to path/visited
+                        visited.add((neighbor.x, neighbor.y))
+                        path[(neighbor.x, neighbor.y)] = neighbor
 
-                    found_valid_move = True
-                    break  # Break the inner loop to process the new tile in the outer loop
+                        # Generate directions for this NEW tile
+                        new_dirs = self.get_shuffled_directions_toward_goal(neighbor, goal_tile, detour_chance)
 
-            # 3. If no valid moves were found for this tile (Dead End)
-            if not found_valid_move:
-                # Backtrack: Remove from path and pop from stack
-                del path[(tile.x, tile.y)]
-                stack.pop()
-                # Note: We keep it in 'visited' to prevent revisiting dead ends
+                        # Push new context to stack
+                        stack.append([neighbor, tile, new_dirs])
 
-        return False
+                        found_valid_move = True
+                        break  # Break the inner loop to process the new tile in the outer loop
+
+                    if stats is not None:
+                        stats.rejections[rejection] += 1
+
+                # 3. If no valid moves were found for this tile (Dead End)
+                if not found_valid_move:
+                    # Backtrack: Remove from path and pop from stack
+                    del path[(tile.x, tile.y)]
+                    stack.pop()
+                    backtracks += 1
+                    # Note: We keep it in 'visited' to prevent revisiting dead ends
+
+            return False
+        finally:
+            if stats is not None:
+                stats.nodes_expanded += nodes
+                stats.backtracks += backtracks
 
     def _check_tile_validity(self, tile, parent, goal_tile, visited, path):
         """
         Helper to validate if a tile can be stepped onto.
         Returns True if valid, False if invalid.
         """
+        return self._tile_rejection(tile, parent, goal_tile, visited, path) is None
+
+    def _tile_rejection(self, tile, parent, goal_tile, visited, path):
+        """
+        Same checks as _check_tile_validity, but names the rule that failed.
+
+        Returns:
+            str: One of REJECTION_RULES, or None if the tile is valid
+        """
         # 1. Goal Exception: If it's the goal, it's always valid (even if it's technically a path)
         if tile == goal_tile:
-            return True
+            return None
 
         # 2. Basic State Checks
-        if tile.get_state() in ["path", "border"]:
-            return False
+        state = tile.get_state()
+        if state == "path":
+            return "path"
+        if state == "border":
+            return "border"
 
         # 3. History Check
         if (tile.x, tile.y) in visited:
-            return False
+            return "visited"
+
+        # Never tunnel under a tower
+        if self.tower_grid[tile.y, tile.x]:
+            return "tower"
 
         # 4. Strict Adjacency (The anti-hugging rule)
         if self.check_strict_adjacency(tile, parent, goal_tile, path):
-            return False
+            return "adjacency"
 
         # 5. Cluster Check
         if self.check_2x2_path_cluster(tile, path):
-            return False
+            return "cluster"
 
-        return True
+        return None
 
     def get_shuffled_directions_toward_goal(self, tile, target_tile, detour_chance=0.4):
         """Returns a list of directions toward the goal, shuffled with
@@ -311,12 +526,12 @@ class Map:
 
         unpreferred = [d for d in all_moves if d not in preferred]
 
-        random.shuffle(preferred)
-        random.shuffle(unpreferred)
+        self.rng.shuffle(preferred)
+        self.rng.shuffle(unpreferred)
 
-        if random.random() < detour_chance:
+        if self.rng.random() < detour_chance:
             # Randomize, but keep preferred weighted slightly better or fully random
-            random.shuffle(all_moves)
+            self.rng.shuffle(all_moves)
             return all_moves
         else:
             return preferred + unpreferred
@@ -369,12 +584,149 @@ class Map:
                 res.append(self.map[y + row][x + each])
         return res
 
+    def world_to_grid(self, world_x, world_y):
+        """
+        Converts a world (pixel) position to grid coordinates in constant time.
+
+        Args:
+            world_x (float): World x position
+            world_y (float): World y position
+
+        Returns:
+            tuple(int, int): (grid_x, grid_y), or None if the point is off the map
+        """
+        grid_x = int((world_x - MAP_ORIGIN_X) // TILE_SIZE)
+        grid_y = int((world_y - MAP_ORIGIN_Y) // TILE_SIZE)
+
+        if 0 <= grid_x < self.width and 0 <= grid_y < self.height:
+            return grid_x, grid_y
+        return None
+
+    def grid_to_world(self, grid_x, grid_y):
+        """
+        Converts grid coordinates to the world position of the tile's center.
+
+        Args:
+            grid_x (int): Grid x position
+            grid_y (int): Grid y position
+
+        Returns:
+            tuple(float, float): (world_x, world_y)
+        """
+        world_x = MAP_ORIGIN_X + grid_x * TILE_SIZE + TILE_SIZE / 2
+        world_y = MAP_ORIGIN_Y + grid_y * TILE_SIZE + TILE_SIZE / 2
+        return world_x, world_y
+
+    def get_tile_at(self, world_x, world_y):
+        """
+        Returns the tile under a world position without scanning the map.
+
+        Args:
+            world_x (float): World x position
+            world_y (float): World y position
+
+        Returns:
+            Tile: The tile under the point, or None if the point is off the map
+        """
+        cell = self.world_to_grid(world_x, world_y)
+        if cell is None:
+            return None
+        return self.map[cell[1]][cell[0]]
+
+    def set_tile_state(self, tile, state):
+        """
+        Sets a tile's state and keeps the map grids in sync with it.
+
+        Args:
+            tile (Tile): The tile to change
+            state (str): The new state ('spawn', 'goal', 'border', 'path', 'empty')
+        """
+        tile.set_state(state)
+        self.state_grid[tile.y, tile.x] = TILE_STATE_CODES[state]
+        self.revision += 1
+        self.terrain_revision += 1
+
+        # Only the 3x3 block around the tile can change buildability
+        self._refresh_buildable_region(tile.x - 1, tile.y - 1, tile.x + 2, tile.y + 2)
+
+    def place_tower(self, tile, tower):
+        """
+        Links a tower to a tile and marks the cell as occupied.
+
+        Args:
+            tile (Tile): The tile the tower stands on
+            tower (Tower): The tower to place
+        """
+        tile.link_tower(tower)
+        self.tower_grid[tile.y, tile.x] = True
+        self.buildable_mask[tile.y, tile.x] = False
+        self.revision += 1
+
+    def is_buildable(self, tile):
+        """
+        Checks the buildable mask for a tile (empty, next to a path, no tower).
+
+        Args:
+            tile (Tile): The tile to check
+
+        Returns:
+            bool: True if a tower can be placed on the tile, False otherwise
+        """
+        return bool(self.buildable_mask[tile.y, tile.x])
+
+    def get_buildable_cells(self):
+        """
+        Lists every cell where a tower can currently be placed.
+
+        Returns:
+            list[tuple(int, int)]: (grid_x, grid_y) of every buildable cell
+        """
+        return [(int(x), int(y)) for y, x in np.argwhere(self.buildable_mask)]
+
+    def refresh_buildable_mask(self):
+        """Recomputes the buildable mask over the whole map."""
+        self._refresh_buildable_region(0, 0, self.width, self.height)
+
+    def _refresh_buildable_region(self, x0, y0, x1, y1):
+        """
+        Recomputes the buildable mask inside [x0, x1) x [y0, y1).
+        A cell is buildable if it is empty, has no tower and touches a path
+        tile in any of its 8 surrounding cells.
+        """
+        # Clip the region to the map
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, self.width), min(y1, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        w, h = x1 - x0, y1 - y0
+
+        # Path cells of the region plus a one-tile apron (False outside the map)
+        is_path = np.zeros((h + 2, w + 2), dtype=bool)
+        ax0, ay0 = max(x0 - 1, 0), max(y0 - 1, 0)
+        ax1, ay1 = min(x1 + 1, self.width), min(y1 + 1, self.height)
+        is_path[ay0 - y0 + 1:ay1 - y0 + 1, ax0 - x0 + 1:ax1 - x0 + 1] = (
+            self.state_grid[ay0:ay1, ax0:ax1] == TILE_STATE_CODES['path'])
+
+        # OR together the 8 shifted neighbours
+        near_path = np.zeros((h, w), dtype=bool)
+        for dy in (0, 1, 2):
+            for dx in (0, 1, 2):
+                if dx == 1 and dy == 1:
+                    continue
+                near_path |= is_path[dy:dy + h, dx:dx + w]
+
+        self.buildable_mask[y0:y1, x0:x1] = (
+            (self.state_grid[y0:y1, x0:x1] == TILE_STATE_CODES['empty'])
+            & near_path
+            & ~self.tower_grid[y0:y1, x0:x1]
+        )
+
     def clear_map(self):
         """Clears the map of all paths."""
         for row in self.map:
             for tile in row:
                 if tile.get_state() == 'path':
-                    tile.clear_state()
+                    self.set_tile_state(tile, 'empty')
 
     def check_for_border(self, tile, dist=1):
         """
@@ -493,12 +845,27 @@ class Map:
         return False
 
     def generate_new_special_point(self, pt_type):
+        """
+        Adds a new spawn or goal and carves a branch tunnel connecting it.
+
+        Args:
+            pt_type (str): 'spawn' or 'goal'
+
+        Returns:
+            Tile: The new point, or None if no place was found
+        """
+        return run_to_completion(self.iter_new_special_point(pt_type))
+
+    def iter_new_special_point(self, pt_type):
+        """Step-wise generate_new_special_point (yields None while searching, then every new tile)."""
+        stats = self.stats if self.stats.enabled else None
+        started = time.perf_counter() if stats is not None else 0.0
         points_checked = 0
 
         # Lower loop limit to prevent freezing
         while points_checked < 10:
             # 1. Find valid empty spot
-            new_point = random.choice(random.choice(self.map))
+            new_point = self.rng.choice(self.rng.choice(self.map))
 
             if self.check_for_border(new_point, dist=SPAWN_GOAL_DISTANCE_FROM_EDGE)[0]:
                 continue
@@ -520,7 +887,7 @@ class Map:
             # 3. Connect
             path_connected = False
             for fork_point in candidates:
-                path = self.branch_path_generation(fork_point, new_point)
+                path = yield from self.iter_branch_path_generation(fork_point, new_point)
                 if path:
                     path_connected = True
                     break
@@ -530,14 +897,23 @@ class Map:
 
             # 4. Finalize
             if pt_type == "spawn":
-                new_point.set_state('spawn')
+                self.set_tile_state(new_point, 'spawn')
                 self.spawns.append(new_point)
             else:
-                new_point.set_state('goal')
+                self.set_tile_state(new_point, 'goal')
                 self.goals.append(new_point)
-            return
+            yield new_point
+            if stats is not None:
+                stats.add_attempts(pt_type, points_checked, accepted=True)
+                stats.add_time("special_point", started)
+            return new_point
 
         print(f"Could not generate new {pt_type} (Map might be too crowded)")
+        if stats is not None:
+            stats.add_attempts(pt_type, points_checked, accepted=False)
+            stats.add_time("special_point", started)
+            print(f"  Generator stats: {self.stats.as_dict()}")
+        return None
 
     def set_difficulty(self, difficulty):
         self.difficulty = difficulty
@@ -569,7 +945,7 @@ class Map:
                 if self.check_valid_branch_start(tile, target_point):
                     valid_tiles.append(tile)
 
-        random.shuffle(valid_tiles)
+        self.rng.shuffle(valid_tiles)
         return valid_tiles
 
     def check_valid_branch_start(self, tile, target_tile):
@@ -621,75 +997,97 @@ class Map:
         Generates a branching path with a 'Best Effort' fallback.
         Prioritizes short paths over overly long paths if a perfect match isn't found.
         """
-        scales, detour_chance = get_path_scale_and_detour(self.difficulty)
-        shortest_path_length = start_tile.shortest_path_to(end_tile)
-
-        # Define the allowed range
-        min_len = scales[0] * shortest_path_length
-        max_len = scales[1] * shortest_path_length
-
-        # TRACKING VARIABLES
-        best_path = {}
-        best_score = float('inf')  # Lower score is better
-
-        max_attempts = 5
-        attempts = 0
-
-        while attempts < max_attempts:
-            visited = set()
-            path = {}
-
-            # Run DFS
-            path_found = self.recursive_path_helper(end_tile, start_tile, visited, path, detour_chance)
-
-            if path_found:
-                current_len = len(path)
-
-                # 1. Perfect Match: Return immediately
-                if min_len <= current_len <= max_len:
-                    self._finalize_branch(path, start_tile, end_tile)
-                    return path
-
-                # 2. Calculate Weighted Score
-                score = 0
-
-                if current_len < min_len:
-                    # Undershoot: Linear Penalty (1x)
-                    # A path 5 tiles too short adds 5 to the score.
-                    score = (min_len - current_len)
-                else:
-                    # Overshoot: Heavy Multiplier Penalty (3x)
-                    # A path 5 tiles too long adds 15 to the score.
-                    # This makes the algorithm HATE long paths.
-                    score = (current_len - max_len) * 3
-
-                # 3. Compare to best
-                if score < best_score:
-                    best_score = score
-                    best_path = path.copy()
-
-            attempts += 1
-
-        # Fallback: If we found ANY path, use the best one
-        if best_path:
-            self._finalize_branch(best_path, start_tile, end_tile)
-            return best_path
-
-        return {}
+        return run_to_completion(self.iter_branch_path_generation(start_tile, end_tile))
+
+    def iter_branch_path_generation(self, start_tile, end_tile):
+        """Step-wise branch_path_generation (yields None while searching, then every carved tile)."""
+        stats = self.stats if self.stats.enabled else None
+        started = time.perf_counter() if stats is not None else 0.0
+        runs = 0
+        accepted = False
+
+        try:
+            scales, detour_chance = get_path_scale_and_detour(self.difficulty)
+            shortest_path_length = start_tile.shortest_path_to(end_tile)
+
+            # Define the allowed range
+            min_len = scales[0] * shortest_path_length
+            max_len = scales[1] * shortest_path_length
+
+            # TRACKING VARIABLES
+            best_path = {}
+            best_score = float('inf')  # Lower score is better
+
+            max_attempts = 5
+            attempts = 0
+
+            while attempts < max_attempts:
+                visited = set()
+                path = {}
+
+                # Run DFS
+                path_found = yield from self._iter_path_helper(end_tile, start_tile, visited, path, detour_chance)
+                runs += 1
+
+                if path_found:
+                    current_len = len(path)
+
+                    # 1. Perfect Match: Return immediately
+                    if min_len <= current_len <= max_len:
+                        accepted = True
+                        yield from self._iter_finalize_branch(path, start_tile, end_tile)
+                        return path
+
+                    # 2. Calculate Weighted Score
+                    score = 0
+
+                    if current_len < min_len:
+                        # Undershoot: Linear Penalty (1x)
+                        # A path 5 tiles too short adds 5 to the score.
+                        score = (min_len - current_len)
+                    else:
+                        # Overshoot: Heavy Multiplier Penalty (3x)
+                        # A path 5 tiles too long adds 15 to the score.
+                        # This makes the algorithm HATE long paths.
+                        score = (current_len - max_len) * 3
+
+                    # 3. Compare to best
+                    if score < best_score:
+                        best_score = score
+                        best_path = path.copy()
+
+                attempts += 1
+
+            # Fallback: If we found ANY path, use the best one
+            if best_path:
+                accepted = True
+                yield from self._iter_finalize_branch(best_path, start_tile, end_tile)
+                return best_path
+
+            return {}
+        finally:
+            if stats is not None:
+                stats.add_attempts("branch", runs, accepted)
+                stats.add_time("branch", started)
 
     def _finalize_branch(self, path, start_tile, end_tile):
         """Helper to color the path correctly after generation."""
+        run_to_completion(self._iter_finalize_branch(path, start_tile, end_tile))
+
+    def _iter_finalize_branch(self, path, start_tile, end_tile):
+        """_finalize_branch that yields every tile it carves, in tunnel order."""
         for t in path.values():
             if t.get_state() not in ['spawn', 'goal']:
-                t.set_state('path')
+                self.set_tile_state(t, 'path')
+                yield t
 
         # Restore Start/End states just in case
         if start_tile in self.spawns:
-            start_tile.set_state('spawn')
+            self.set_tile_state(start_tile, 'spawn')
         elif start_tile in self.goals:
-            start_tile.set_state('goal')
+            self.set_tile_state(start_tile, 'goal')
 
-        if end_tile.get_state() == 'path': end_tile.set_state('path')
+        if end_tile.get_state() == 'path': self.set_tile_state(end_tile, 'path')
 
     def get_path_bfs(self, start_tile, end_tile):
         """
@@ -699,11 +1097,20 @@ class Map:
         Returns:
             list[Tile]: A list of Tile objects representing the path.
         """
+        return run_to_completion(self.iter_path_bfs(start_tile, end_tile))
+
+    def iter_path_bfs(self, start_tile, end_tile):
+        """Step-wise get_path_bfs (yields every JOB_STEP_NODES nodes)."""
         # Queue stores tuples of (current_tile, current_path_list)
         queue = [(start_tile, [start_tile])]
         visited = {start_tile}
 
+        steps = 0
         while queue:
+            steps += 1
+            if steps % JOB_STEP_NODES == 0:
+                yield
+
             current_tile, path = queue.pop(0)
 
             # Found the destination? Return the path.
@@ -733,44 +1140,38 @@ class Map:
 
     def calculate_autotiling(self):
         """
-        Iterates over the map and assigns a specific texture variation
-        to path tiles based on their neighbors.
+        Assigns a specific texture variation to path tiles based on their neighbors.
+        The bitmasks are computed for the whole grid at once; only tiles whose
+        bitmask actually changed get their texture updated.
         """
-        for y in range(self.height):
-            for x in range(self.width):
-                tile = self.map[y][x]
-
-                # We only care about making 'path' tiles look like tunnels
-                # Note: You might also want to include 'spawn' and 'goal' in this look
-                if tile.get_state() not in ['path', 'spawn', 'goal']:
-                    continue
-
-                # Calculate the Bitmask
-                # North=1, East=2, South=4, West=8
-                mask = 0
-
-                # Check North
-                n = self.get_neighboring_tile(tile, "up")
-                if n and n.get_state() in ['path', 'spawn', 'goal']:
-                    mask += 1
-
-                # Check East
-                e = self.get_neighboring_tile(tile, "right")
-                if e and e.get_state() in ['path', 'spawn', 'goal']:
-                    mask += 2
-
-                # Check South
-                s = self.get_neighboring_tile(tile, "down")
-                if s and s.get_state() in ['path', 'spawn', 'goal']:
-                    mask += 4
-
-                # Check West
-                w = self.get_neighboring_tile(tile, "left")
-                if w and w.get_state() in ['path', 'spawn', 'goal']:
-                    mask += 8
-
-                # Save this mask to the tile so it knows which image to load
-                tile.set_bitmask(mask)
-
-
-
+        run_to_completion(self.iter_autotiling())
+
+    def iter_autotiling(self):
+        """Step-wise calculate_autotiling (yields every JOB_STEP_NODES retextured tiles)."""
+        stats = self.stats if self.stats.enabled else None
+        started = time.perf_counter() if stats is not None else 0.0
+
+        # We only care about making 'path' tiles look like tunnels
+        # (spawns and goals connect to them too)
+        walkable = np.isin(self.state_grid, WALKABLE_STATE_CODES)
+        padded = np.pad(walkable, 1)
+
+        # Calculate the Bitmask
+        # North=1, East=2, South=4, West=8
+        mask = (
+            padded[2:, 1:-1] * 1        # North (y + 1)
+            + padded[1:-1, 2:] * 2      # East  (x + 1)
+            + padded[:-2, 1:-1] * 4     # South (y - 1)
+            + padded[1:-1, :-2] * 8     # West  (x - 1)
+        ).astype(np.uint8)
+
+        # Save the mask to the tiles that need a different image
+        changed = walkable & (mask != self.bitmask_grid)
+        self.bitmask_grid[changed] = mask[changed]
+        for i, (y, x) in enumerate(np.argwhere(changed)):
+            if i and i % JOB_STEP_NODES == 0:
+                yield
+            self.map[y][x].set_bitmask(int(mask[y, x]))
+
+        if stats is not None:
+            stats.add_time("autotiling", started)
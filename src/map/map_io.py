@@ -0,0 +1,191 @@
+from src.constants import *
+from src.map.map_generator import Map
+from pathlib import Path
+import numpy as np
+import struct
+import mmap
+
+# File layout (little-endian):
+#   header   : MAP_HEADER (magic, version, flags, size, difficulty, seed, counts)
+#   spawns   : n_spawns * (x, y) as uint16
+#   goals    : n_goals * (x, y) as uint16
+#   cells    : one byte per tile, state code in the low nibble, bitmask in the high one
+#              RAW -> width * height bytes, row by row from y = 0
+#              RLE -> uint32 run count, then run values (uint8), then run lengths (uint32)
+MAP_MAGIC = b"STMP"
+MAP_FORMAT_VERSION = 1
+MAP_HEADER = struct.Struct("<4sHHHHBxqHH")
+
+FLAG_RLE = 1        # <-- cells are run-length encoded
+FLAG_HAS_SEED = 2   # <-- the seed field is meaningful
+
+
+class MapData:
+    """
+    Plain grids of a saved map, read without building any Tile sprites.
+    Use to_map() to turn it into a playable Map.
+    """
+
+    def __init__(self, state_grid, bitmask_grid, spawns, goals, difficulty, seed):
+        self.state_grid = state_grid        # <-- (height, width) uint8 state codes
+        self.bitmask_grid = bitmask_grid    # <-- (height, width) uint8 autotiling masks
+        self.spawns = spawns                # <-- list of (x, y)
+        self.goals = goals                  # <-- list of (x, y)
+        self.difficulty = difficulty
+        self.seed = seed
+
+    @property
+    def width(self):
+        return self.state_grid.shape[1]
+
+    @property
+    def height(self):
+        return self.state_grid.shape[0]
+
+    def to_map(self):
+        """Builds a Map (with its Tile sprites) from the grids."""
+        return Map.from_grids(
+            self.state_grid, self.bitmask_grid, self.spawns, self.goals,
+            difficulty=self.difficulty, seed=self.seed
+        )
+
+
+def map_to_bytes(tilemap, rle=False):
+    """
+    Serializes a map into the compact binary format.
+
+    Args:
+        tilemap (Map): The map to save
+        rle (bool): Run-length encode the cells (smaller, for sharing)
+
+    Returns:
+        bytes: The encoded map
+    """
+    flags = FLAG_RLE if rle else 0
+    seed = 0
+    if tilemap.seed is not None:
+        flags |= FLAG_HAS_SEED
+        seed = tilemap.seed
+
+    header = MAP_HEADER.pack(
+        MAP_MAGIC, MAP_FORMAT_VERSION, flags,
+        tilemap.width, tilemap.height, tilemap.difficulty, seed,
+        len(tilemap.spawns), len(tilemap.goals)
+    )
+    spawns = np.array([(t.x, t.y) for t in tilemap.spawns], dtype="<u2")
+    goals = np.array([(t.x, t.y) for t in tilemap.goals], dtype="<u2")
+
+    # Pack state and bitmask into one byte per tile
+    cells = (tilemap.state_grid | (tilemap.bitmask_grid << 4)).astype(np.uint8).ravel()
+
+    if rle:
+        payload = _rle_encode(cells)
+    else:
+        payload = cells.tobytes()
+
+    return header + spawns.tobytes() + goals.tobytes() + payload
+
+
+def map_data_from_buffer(buffer):
+    """
+    Decodes the binary format with NumPy views (no per-tile parsing).
+
+    Args:
+        buffer (bytes | mmap.mmap): The encoded map
+
+    Returns:
+        MapData: The decoded grids
+    """
+    magic, version, flags, width, height, difficulty, seed, n_spawns, n_goals = \
+        MAP_HEADER.unpack_from(buffer, 0)
+    if magic != MAP_MAGIC:
+        raise ValueError("Not a map file (bad magic)")
+    if version != MAP_FORMAT_VERSION:
+        raise ValueError(f"Unsupported map format version: {version}")
+
+    offset = MAP_HEADER.size
+    spawns = np.frombuffer(buffer, dtype="<u2", count=n_spawns * 2, offset=offset).reshape(-1, 2)
+    offset += spawns.nbytes
+    goals = np.frombuffer(buffer, dtype="<u2", count=n_goals * 2, offset=offset).reshape(-1, 2)
+    offset += goals.nbytes
+
+    if flags & FLAG_RLE:
+        cells = _rle_decode(buffer, offset)
+    else:
+        cells = np.frombuffer(buffer, dtype=np.uint8, count=width * height, offset=offset)
+    cells = cells.reshape(height, width)
+
+    return MapData(
+        state_grid=cells & 0x0F,
+        bitmask_grid=cells >> 4,
+        spawns=[tuple(p) for p in spawns.tolist()],
+        goals=[tuple(p) for p in goals.tolist()],
+        difficulty=difficulty,
+        seed=seed if flags & FLAG_HAS_SEED else None,
+    )
+
+
+def save_map(tilemap, path, rle=False):
+    """
+    Writes a map to disk in the compact binary format.
+
+    Args:
+        tilemap (Map): The map to save
+        path (str | Path): Destination file
+        rle (bool): Run-length encode the cells
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(map_to_bytes(tilemap, rle=rle))
+
+
+def read_map_data(path):
+    """
+    Memory-maps a saved map and decodes its grids.
+
+    Args:
+        path (str | Path): The map file
+
+    Returns:
+        MapData: The decoded grids
+    """
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            data = map_data_from_buffer(mm)
+            # Copy out of the mapping so it can be closed
+            data.state_grid = data.state_grid.copy()
+            data.bitmask_grid = data.bitmask_grid.copy()
+    return data
+
+
+def load_map(path):
+    """
+    Loads a saved map as a playable Map.
+
+    Args:
+        path (str | Path): The map file
+
+    Returns:
+        Map: The loaded map
+    """
+    return read_map_data(path).to_map()
+
+
+def _rle_encode(cells):
+    """Run-length encodes a uint8 array (vectorized)."""
+    # Index where each run starts
+    starts = np.flatnonzero(np.concatenate(([True], cells[1:] != cells[:-1])))
+    lengths = np.diff(np.append(starts, len(cells))).astype("<u4")
+    values = cells[starts].astype(np.uint8)
+    return struct.pack("<I", len(starts)) + values.tobytes() + lengths.tobytes()
+
+
+def _rle_decode(buffer, offset):
+    """Decodes _rle_encode output starting at offset."""
+    (n_runs,) = struct.unpack_from("<I", buffer, offset)
+    offset += 4
+    values = np.frombuffer(buffer, dtype=np.uint8, count=n_runs, offset=offset)
+    offset += n_runs
+    lengths = np.frombuffer(buffer, dtype="<u4", count=n_runs, offset=offset)
+    return np.repeat(values, lengths)
@@ -0,0 +1,135 @@
+from src.constants import *
+from src.utils.helper_functions import distance_point_to_segment
+import math
+
+
+class OccupancyGrid:
+    """
+    Enemies bucketed by the tile they stand on.
+    Each enemy moves itself to a new bucket when it crosses into another tile,
+    so spatial queries (tower targeting, splash damage) only visit the enemies
+    on the tiles involved instead of the whole enemy list.
+    """
+
+    def __init__(self):
+        # (x, y) -> {enemy: None}: a dict keeps the buckets in arrival order
+        self.buckets = {}
+
+    @staticmethod
+    def cell_of(world_x, world_y):
+        """The (x, y) grid cell under a world position (may lie off the map)."""
+        return (int((world_x - MAP_ORIGIN_X) // TILE_SIZE),
+                int((world_y - MAP_ORIGIN_Y) // TILE_SIZE))
+
+    def update_enemy(self, enemy, cell=None):
+        """Moves an enemy to the bucket of the tile it now stands on (`cell`, if already known)."""
+        if cell is None:
+            cell = self.cell_of(*enemy.sim_position)
+        if cell == enemy.cell:
+            return
+        self.remove(enemy)
+        self.buckets.setdefault(cell, {})[enemy] = None
+        enemy.cell = cell
+
+    def remove(self, enemy):
+        """Drops an enemy from its bucket (when it dies or reaches a goal)."""
+        bucket = self.buckets.get(enemy.cell)
+        if bucket is not None:
+            bucket.pop(enemy, None)
+            if not bucket:
+                del self.buckets[enemy.cell]
+        enemy.cell = None
+
+    def enemies_at(self, cell):
+        """The enemies on one tile (empty if none)."""
+        return self.buckets.get(cell, ())
+
+    def enemies_near(self, world_x, world_y, radius):
+        """
+        Every enemy whose center lies within `radius` of a world position.
+
+        Args:
+            world_x (float): World x of the center
+            world_y (float): World y of the center
+            radius (float): Radius in pixels
+
+        Returns:
+            list[Enemy]: The enemies in the disk
+        """
+        x_lo, y_lo = self.cell_of(world_x - radius, world_y - radius)
+        x_hi, y_hi = self.cell_of(world_x + radius, world_y + radius)
+        radius_sq = radius * radius
+
+        found = []
+        for y in range(y_lo, y_hi + 1):
+            for x in range(x_lo, x_hi + 1):
+                for enemy in self.buckets.get((x, y), ()):
+                    enemy_x, enemy_y = enemy.sim_position
+                    dx = enemy_x - world_x
+                    dy = enemy_y - world_y
+                    if dx*dx + dy*dy <= radius_sq:
+                        found.append(enemy)
+        return found
+
+    def enemies_along(self, x0, y0, x1, y1, margin):
+        """
+        Every enemy whose center lies within `margin` of a segment.
+        Walks the tiles the segment crosses (DDA traversal) and checks the
+        enemies on them and on their neighbours, which holds every point
+        within half a tile of the segment.
+
+        Args:
+            x0 (float): World x of the segment start
+            y0 (float): World y of the segment start
+            x1 (float): World x of the segment end
+            y1 (float): World y of the segment end
+            margin (float): Distance to the segment in pixels (at most TILE_SIZE / 2)
+
+        Returns:
+            list[Enemy]: The enemies on the segment
+        """
+        cells = set()
+        for cx, cy in self.cells_on_segment(x0, y0, x1, y1):
+            for ny in (cy - 1, cy, cy + 1):
+                for nx in (cx - 1, cx, cx + 1):
+                    if (nx, ny) in self.buckets:
+                        cells.add((nx, ny))
+
+        found = []
+        for cell in cells:
+            for enemy in self.buckets[cell]:
+                if distance_point_to_segment(*enemy.sim_position, x0, y0, x1, y1) <= margin:
+                    found.append(enemy)
+        return found
+
+    @staticmethod
+    def cells_on_segment(x0, y0, x1, y1):
+        """
+        The (x, y) grid cells a world-space segment passes through, in order
+        (Amanatides-Woo traversal).
+        """
+        # Segment in grid units
+        gx0, gy0 = (x0 - MAP_ORIGIN_X) / TILE_SIZE, (y0 - MAP_ORIGIN_Y) / TILE_SIZE
+        gx1, gy1 = (x1 - MAP_ORIGIN_X) / TILE_SIZE, (y1 - MAP_ORIGIN_Y) / TILE_SIZE
+        x, y = math.floor(gx0), math.floor(gy0)
+        end_x, end_y = math.floor(gx1), math.floor(gy1)
+        dx, dy = gx1 - gx0, gy1 - gy0
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+
+        # Segment parameter of the next vertical / horizontal boundary, and between two
+        t_delta_x = abs(1 / dx) if dx else math.inf
+        t_delta_y = abs(1 / dy) if dy else math.inf
+        t_max_x = ((x + 1 - gx0) if dx > 0 else (gx0 - x)) * t_delta_x if dx else math.inf
+        t_max_y = ((y + 1 - gy0) if dy > 0 else (gy0 - y)) * t_delta_y if dy else math.inf
+
+        cells = [(x, y)]
+        while (x, y) != (end_x, end_y) and min(t_max_x, t_max_y) <= 1:
+            if t_max_x < t_max_y:
+                x += step_x
+                t_max_x += t_delta_x
+            else:
+                y += step_y
+                t_max_y += t_delta_y
+            cells.append((x, y))
+        return cells
@@ -0,0 +1,70 @@
+import numpy as np
+
+
+class Polyline:
+    """
+    A route as world points with cumulative arc lengths and per-segment unit
+    directions. Routes are built once and shared by every enemy walking them;
+    an enemy only keeps the distance it travelled and the segment it is on.
+
+    Segment i runs from points[i] to points[i + 1].
+    """
+
+    def __init__(self, points):
+        self._build(np.asarray(points, dtype=np.float64).reshape(-1, 2))
+
+    def _build(self, points):
+        """Derives the segment lengths and directions from the points."""
+        self.points = points
+        steps = np.diff(points, axis=0)
+        seg_lengths = np.hypot(steps[:, 0], steps[:, 1])
+        self.lengths = np.concatenate(([0.0], np.cumsum(seg_lengths)))      # <-- distance to each point
+        self.directions = np.zeros_like(steps)
+        np.divide(steps, seg_lengths[:, None], out=self.directions, where=seg_lengths[:, None] > 0)
+
+    def __len__(self):
+        return len(self.points)
+
+    @property
+    def length(self):
+        """Total arc length."""
+        return float(self.lengths[-1])
+
+    @property
+    def end(self):
+        """The last point, as a tuple."""
+        return tuple(self.points[-1].tolist())
+
+    def segment(self, index):
+        """
+        One segment of the line. Past the last point this is an empty segment
+        sitting on it.
+
+        Returns:
+            tuple: (start point, unit direction, distance at start, distance at end)
+        """
+        if index < len(self.points) - 1:
+            return self.points[index], self.directions[index], self.lengths[index], self.lengths[index + 1]
+        return self.points[-1], (0.0, 0.0), self.lengths[-1], self.lengths[-1]
+
+    def segment_at(self, distance):
+        """Index of the segment holding a distance (binary search)."""
+        index = int(np.searchsorted(self.lengths, distance, side="right")) - 1
+        return min(max(index, 0), max(len(self.points) - 2, 0))
+
+    def point_at(self, distance):
+        """World position at a distance along the line."""
+        start, direction, start_distance, _ = self.segment(self.segment_at(distance))
+        offset = min(distance, self.length) - start_distance
+        return float(start[0] + direction[0] * offset), float(start[1] + direction[1] * offset)
+
+    def extend(self, point):
+        """Appends a point (maze mode grows an enemy's own line one cell at a time)."""
+        self._build(np.vstack((self.points, point)))
+
+    def turn_back(self, distance):
+        """Cuts the line at a distance on its last segment and heads back to the point before."""
+        back = self.points[-2].copy()
+        points = self.points.copy()
+        points[-1] = self.point_at(distance)
+        self._build(np.vstack((points, back)))
@@ -0,0 +1,84 @@
+from src.constants import *
+from PIL import Image
+import numpy as np
+import arcade
+
+
+class CoverageOverlay:
+    """
+    Heatmap of a CoverageMap drawn over the world: one texel per tile,
+    transparent where nothing can be built, with the best cell outlined.
+    The texture is only repainted when the coverage or the tower type changes.
+    """
+
+    _instances = 0
+
+    def __init__(self, coverage):
+        self.coverage = coverage
+        self.visible = False
+
+        self.sprite_list = arcade.SpriteList()
+        self.sprite = None
+        self.texture = None
+        self.painted = (-1, None)     # <-- (coverage revision, tower type) on the texture
+
+        CoverageOverlay._instances += 1
+        self._id = CoverageOverlay._instances
+
+    def toggle(self):
+        """Hide or show the overlay"""
+        self.visible = not self.visible
+
+    def _paint(self, tower_type):
+        """Colors the coverage grid from cold to hot and uploads it."""
+        grid = self.coverage.grids[tower_type]
+        height, width = grid.shape
+
+        # 1. Normalise and blend the two ramp colors
+        peak = grid.max()
+        heat = (grid / peak if peak > 0 else grid)[..., None]
+        low = np.array(COLOR_COVERAGE_LOW[:3], dtype=np.float64)
+        high = np.array(COLOR_COVERAGE_HIGH[:3], dtype=np.float64)
+
+        rgba = np.zeros((height, width, 4), dtype=np.uint8)
+        rgba[..., :3] = low + (high - low) * heat
+        rgba[..., 3] = np.where(grid > 0, COVERAGE_OVERLAY_ALPHA, 0)
+        image = Image.fromarray(np.ascontiguousarray(rgba[::-1]), "RGBA")    # <-- grid y grows upwards
+
+        # 2. Upload, in place when the map kept its size
+        atlas = self.sprite_list.atlas
+        if self.texture is not None and self.texture.image.size == image.size:
+            self.texture.image = image
+            if atlas is not None:
+                atlas.update_texture_image(self.texture)
+        else:
+            if self.texture is not None and atlas is not None:
+                atlas.remove(self.texture)
+            self.sprite_list.clear()
+            self.texture = arcade.Texture(
+                image, hash=f"coverage-{self._id}-{image.width}x{image.height}")
+            self.sprite = arcade.Sprite(self.texture, scale=TILE_SIZE)
+            self.sprite_list.append(self.sprite)
+
+        self.sprite.center_x = MAP_ORIGIN_X + width * TILE_SIZE / 2
+        self.sprite.center_y = MAP_ORIGIN_Y + height * TILE_SIZE / 2
+        self.painted = (self.coverage.map_revision, tower_type)
+
+    def draw(self, tower_type="base"):
+        """
+        Draws the heatmap of one tower type (in world space).
+        Shows the last computed coverage; keeping it fresh is up to the caller.
+
+        Args:
+            tower_type (str): Key of TOWER_RANGES
+        """
+        if not self.visible or tower_type not in self.coverage.grids:
+            return
+        if self.painted != (self.coverage.map_revision, tower_type):
+            self._paint(tower_type)
+        self.sprite_list.draw(pixelated=True)
+
+        best = self.coverage.best.get(tower_type)
+        if best is not None:
+            x, y = self.coverage.map.grid_to_world(*best)
+            arcade.draw_rect_outline(arcade.XYWH(x, y, TILE_SIZE, TILE_SIZE), COLOR_COVERAGE_BEST, 2)
@@ -57,10 +57,19 @@ class IndicatorBar:
         if new_fullness == 0.0:
             self._full_box.visible = False
         else:
-            self._full_box.visible = True
+            self._full_box.visible = self._background_box.visible
             self._full_box.width = self._bar_width * new_fullness * self._scale[0]
             self._full_box.left = self._center_x - (self._bar_width / 2) * self._scale[0]
 
+    @property
+    def visible(self) -> bool:
+        return self._background_box.visible
+
+    @visible.setter
+    def visible(self, value: bool) -> None:
+        self._background_box.visible = value
+        self._full_box.visible = value and self._fullness > 0.0
+
     @property
     def position(self) -> tuple[float, float]:
         return self._center_x, self._center_y
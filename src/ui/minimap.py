@@ -0,0 +1,207 @@
+from src.constants import *
+from src.utils.map_raster import paint_state_grid, resample_indices
+from PIL import Image
+import numpy as np
+import arcade
+
+
+class Minimap:
+    """
+    A small overview of the whole map, painted straight from the map's
+    state grid into a single texture (no per-tile sprites are drawn).
+    Tile data is repainted only when the map changes; enemy dots are
+    refreshed at a capped rate.
+    """
+
+    _instances = 0
+
+    def __init__(self, tilemap, max_size=MINIMAP_SIZE, margin=MINIMAP_MARGIN):
+        self.map = tilemap
+        self.max_size = max_size
+        self.margin = margin
+        self.visible = True
+
+        # One sprite holding the minimap texture
+        self.sprite_list = arcade.SpriteList()
+        self.sprite = None
+        self.texture = None
+        self.pixel_width = 0
+        self.pixel_height = 0
+
+        # Cached layers
+        self.base_rgba = None          # <-- tiles + towers, repainted on map change
+        self.enemy_counts = None       # <-- enemies per minimap pixel
+        self.map_revision = -1
+        self.map_size = (0, 0)
+
+        # Enemy dot refresh throttle
+        self.enemy_interval = 1.0 / MINIMAP_ENEMY_REFRESH_RATE
+        self.enemy_timer = 0.0
+
+        Minimap._instances += 1
+        self._id = Minimap._instances
+
+    def toggle(self):
+        """Hide or show the minimap"""
+        self.visible = not self.visible
+
+    def update(self, delta_time, enemy_list):
+        """
+        Refreshes the minimap texture if the map changed or enemy dots are due.
+
+        Args:
+            delta_time (float): Time elapsed since last frame
+            enemy_list (list): All enemies currently on the map
+        """
+        if not self.visible:
+            return
+
+        dirty = False
+
+        # 1. Tiles: only on map change events
+        if self.map.revision != self.map_revision:
+            self._repaint_tiles()
+            self.enemy_timer = 0.0      # <-- pixel layout may have changed
+            dirty = True
+
+        # 2. Enemies: at most MINIMAP_ENEMY_REFRESH_RATE times a second
+        self.enemy_timer -= delta_time
+        if self.enemy_timer <= 0:
+            self.enemy_timer = self.enemy_interval
+            self._count_enemies(enemy_list)
+            dirty = True
+
+        if dirty:
+            self._upload()
+
+    def _repaint_tiles(self):
+        """Resamples the state grid to minimap pixels and paints the base layer."""
+        width, height = self.map.width, self.map.height
+
+        # Fit the map inside max_size while keeping its aspect ratio
+        scale = self.max_size / max(width, height)
+        px_w = max(1, int(width * scale))
+        px_h = max(1, int(height * scale))
+
+        if (px_w, px_h) != (self.pixel_width, self.pixel_height):
+            self._create_texture(px_w, px_h)
+
+        # Nearest-neighbour resample of the grids, then a single palette lookup
+        rows = resample_indices(height, px_h)
+        cols = resample_indices(width, px_w)
+        states = self.map.state_grid[np.ix_(rows, cols)]
+        towers = self.map.tower_grid[np.ix_(rows, cols)]
+        self.base_rgba = paint_state_grid(states, towers)
+
+        self.map_size = (width, height)
+        self.map_revision = self.map.revision
+
+    def _create_texture(self, px_w, px_h):
+        """(Re)creates the texture and sprite when the minimap size changes."""
+        if self.texture is not None and self.sprite_list.atlas is not None:
+            self.sprite_list.atlas.remove(self.texture)
+        self.sprite_list.clear()
+
+        self.pixel_width, self.pixel_height = px_w, px_h
+        self.texture = arcade.Texture(
+            Image.new("RGBA", (px_w, px_h), (0, 0, 0, 255)),
+            hash=f"minimap-{self._id}-{px_w}x{px_h}"
+        )
+        self.sprite = arcade.Sprite(self.texture)
+        self.sprite.center_x = self.margin + px_w / 2
+        self.sprite.center_y = self.margin + px_h / 2
+        self.sprite_list.append(self.sprite)
+
+    def _count_enemies(self, enemy_list):
+        """Bins enemy positions into minimap pixels."""
+        count = len(enemy_list)
+        if count == 0:
+            self.enemy_counts = None
+            return
+
+        positions = np.array([e.sim_position for e in enemy_list], dtype=np.float32)
+        xs, ys = positions[:, 0], positions[:, 1]
+
+        # World -> minimap pixel (row 0 at the top of the image)
+        width, height = self.map_size
+        px = ((xs - MAP_ORIGIN_X) * (self.pixel_width / (width * TILE_SIZE))).astype(np.int32)
+        py = ((ys - MAP_ORIGIN_Y) * (self.pixel_height / (height * TILE_SIZE))).astype(np.int32)
+        inside = (px >= 0) & (px < self.pixel_width) & (py >= 0) & (py < self.pixel_height)
+        px, py = px[inside], py[inside]
+        row = self.pixel_height - 1 - py
+
+        self.enemy_counts = np.bincount(
+            row * self.pixel_width + px,
+            minlength=self.pixel_width * self.pixel_height
+        ).reshape(self.pixel_height, self.pixel_width)
+
+    def _upload(self):
+        """Blends enemy density over the base layer and writes it to the texture."""
+        rgba = self.base_rgba
+        if self.enemy_counts is not None:
+            rgba = rgba.copy()
+            hit = self.enemy_counts > 0
+
+            # More enemies on a pixel -> more saturated dot
+            weight = np.minimum(self.enemy_counts[hit], 3)[:, None] / 3.0
+            enemy_color = np.array(COLOR_MINIMAP_ENEMY, dtype=np.float32)
+            rgba[hit] = (rgba[hit] * (1.0 - weight) + enemy_color * weight).astype(np.uint8)
+
+        self.texture.image = Image.fromarray(rgba, "RGBA")
+        if self.sprite_list.atlas is not None:
+            self.sprite_list.atlas.update_texture_image(self.texture)
+
+    def contains(self, x, y):
+        """Returns True if the screen point is over the minimap."""
+        return (self.visible and self.sprite is not None
+                and self.margin <= x < self.margin + self.pixel_width
+                and self.margin <= y < self.margin + self.pixel_height)
+
+    def screen_to_world(self, x, y):
+        """
+        Converts a screen point over the minimap into a world position.
+
+        Returns:
+            tuple(float, float): World position, or None if not over the minimap
+        """
+        if not self.contains(x, y):
+            return None
+        width, height = self.map_size
+        world_x = MAP_ORIGIN_X + (x - self.margin) / self.pixel_width * width * TILE_SIZE
+        world_y = MAP_ORIGIN_Y + (y - self.margin) / self.pixel_height * height * TILE_SIZE
+        return world_x, world_y
+
+    def draw(self, camera, view_width, view_height):
+        """
+        Draws the minimap and the camera's view rectangle (in screen space).
+
+        Args:
+            camera (Camera2D): The world camera
+            view_width (float): Window width in pixels
+            view_height (float): Window height in pixels
+        """
+        if not self.visible or self.sprite is None:
+            return
+
+        self.sprite_list.draw()
+
+        left = self.margin
+        bottom = self.margin
+        arcade.draw_lbwh_rectangle_outline(
+            left, bottom, self.pixel_width, self.pixel_height,
+            arcade.color.DARK_GRAY, 2)
+
+        # Camera rectangle: world -> minimap pixels
+        width, height = self.map_size
+        sx = self.pixel_width / (width * TILE_SIZE)
+        sy = self.pixel_height / (height * TILE_SIZE)
+        cam_x, cam_y = camera.position
+        half_w = view_width / (2 * camera.zoom)
+        half_h = view_height / (2 * camera.zoom)
+
+        rect_l = max(left, left + (cam_x - half_w - MAP_ORIGIN_X) * sx)
+        rect_r = min(left + self.pixel_width, left + (cam_x + half_w - MAP_ORIGIN_X) * sx)
+        rect_b = max(bottom, bottom + (cam_y - half_h - MAP_ORIGIN_Y) * sy)
+        rect_t = min(bottom + self.pixel_height, bottom + (cam_y + half_h - MAP_ORIGIN_Y) * sy)
+        if rect_l < rect_r and rect_b < rect_t:
+            arcade.draw_lrbt_rectangle_outline(rect_l, rect_r, rect_b, rect_t, arcade.color.WHITE, 1)
@@ -1,4 +1,20 @@
 import arcade
+def run_to_completion(generator):
+    """
+    Runs a step-wise generator (see JobScheduler) without pausing.
+
+    Parameters:
+        generator (Generator): The resumable task
+
+    Returns:
+        The generator's return value
+    """
+    while True:
+        try:
+            next(generator)
+        except StopIteration as stop:
+            return stop.value
+
 def get_path_scale_and_detour(difficulty):
     """
     Returns a linear scale range and detour chance for a given difficulty level.
@@ -73,10 +89,19 @@ def distance_point_to_segment(px, py, x1, y1, x2, y2):
 from PIL import Image, ImageDraw, ImageFilter
 
 
+# (diameter, color, thickness) -> ring texture: every tower of a type shares its rings
+_ring_textures = {}
+
+
 def make_ring_texture(diameter, color, thickness=3):
     """
     Generates a transparent texture with a colored ring border.
+    Built once per diameter, color and thickness, then served from a cache.
     """
+    key = (diameter, tuple(color), thickness)
+    if key in _ring_textures:
+        return _ring_textures[key]
+
     # Create a transparent image
     img = Image.new("RGBA", (diameter, diameter), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
@@ -89,4 +114,5 @@ def make_ring_texture(diameter, color, thickness=3):
         width=thickness
     )
 
-    return arcade.Texture(name=f"ring_{diameter}_{color}", image=img)
\ No newline at end of file
+    _ring_textures[key] = arcade.Texture(name=f"ring_{diameter}_{color}", image=img)
+    return _ring_textures[key]
\ No newline at end of file
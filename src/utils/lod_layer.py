@@ -0,0 +1,76 @@
+from src.constants import *
+from src.utils.map_raster import paint_state_grid
+from src.utils.helper_functions import run_to_completion
+from PIL import Image
+import arcade
+
+
+class BakedMapLayer:
+    """
+    The whole map baked into one low-resolution texture.
+    Drawn instead of the per-tile sprites when the camera is zoomed out,
+    and re-baked only when the map changes.
+    """
+
+    _instances = 0
+
+    def __init__(self, tilemap, cell_px=LOD_CELL_PIXELS):
+        self.map = tilemap
+        self.cell_px = cell_px
+
+        self.sprite_list = arcade.SpriteList()
+        self.sprite = None
+        self.texture = None
+        self.map_revision = -1
+
+        BakedMapLayer._instances += 1
+        self._id = BakedMapLayer._instances
+
+    def is_stale(self):
+        """True if the map changed since the last bake."""
+        return self.map.revision != self.map_revision
+
+    def bake(self):
+        """Paints the state grid into the texture (one vectorized pass)."""
+        run_to_completion(self.iter_bake())
+
+    def iter_bake(self):
+        """Step-wise bake for the JobScheduler: paints, yields, then uploads."""
+        revision = self.map.revision
+        grid_h, grid_w = self.map.state_grid.shape
+        rgba = paint_state_grid(self.map.state_grid, cell_px=self.cell_px)
+        image = Image.fromarray(rgba, "RGBA")
+        yield
+        atlas = self.sprite_list.atlas
+
+        if self.texture is not None and self.texture.image.size == image.size:
+            # Same size: overwrite the pixels in place
+            self.texture.image = image
+            if atlas is not None:
+                atlas.update_texture_image(self.texture)
+        else:
+            # Map was resized: swap in a new texture
+            if self.texture is not None and atlas is not None:
+                atlas.remove(self.texture)
+            self.sprite_list.clear()
+            self.texture = arcade.Texture(
+                image, hash=f"baked-map-{self._id}-{image.width}x{image.height}")
+            self.sprite = arcade.Sprite(self.texture, scale=TILE_SIZE / self.cell_px)
+            self.sprite_list.append(self.sprite)
+
+        # Center the sprite over the map in world space
+        self.sprite.center_x = MAP_ORIGIN_X + grid_w * TILE_SIZE / 2
+        self.sprite.center_y = MAP_ORIGIN_Y + grid_h * TILE_SIZE / 2
+        self.map_revision = revision
+
+    def draw(self, bake_if_stale=True):
+        """
+        Draws the baked map.
+
+        Args:
+            bake_if_stale (bool): Re-bake right away if the map changed
+                                  (False when a scheduled bake keeps it fresh)
+        """
+        if self.texture is None or (bake_if_stale and self.is_stale()):
+            self.bake()
+        self.sprite_list.draw(pixelated=True)
@@ -0,0 +1,66 @@
+from src.constants import *
+import numpy as np
+
+
+def build_state_palette():
+    """
+    Builds an RGBA lookup table indexed by tile state code.
+
+    Returns:
+        np.ndarray: (n_states, 4) uint8 array, row i is the color of state code i
+    """
+    colors = {
+        "empty": COLOR_EMPTY,
+        "path": COLOR_TUNNEL_FLOOR,
+        "spawn": COLOR_SPAWN,
+        "goal": COLOR_GOAL,
+        "border": COLOR_BORDER,
+    }
+    palette = np.zeros((len(TILE_STATE_CODES), 4), dtype=np.uint8)
+    for state, code in TILE_STATE_CODES.items():
+        r, g, b = colors[state][:3]
+        palette[code] = (r, g, b, 255)
+    return palette
+
+
+STATE_PALETTE = build_state_palette()
+
+
+def paint_state_grid(state_grid, tower_grid=None, cell_px=1, palette=STATE_PALETTE):
+    """
+    Paints a map state grid into an RGBA pixel array in one vectorized pass.
+
+    Args:
+        state_grid (np.ndarray): (height, width) array of tile state codes
+        tower_grid (np.ndarray): Optional (height, width) bool array of towers
+        cell_px (int): Size of one tile in pixels
+        palette (np.ndarray): Lookup table from state code to RGBA
+
+    Returns:
+        np.ndarray: (height * cell_px, width * cell_px, 4) uint8 image,
+        with grid row 0 at the BOTTOM (image row order, ready for PIL)
+    """
+    rgba = palette[state_grid]
+    if tower_grid is not None:
+        rgba[tower_grid] = COLOR_MINIMAP_TOWER
+
+    # Grid y grows upwards, image rows grow downwards
+    rgba = rgba[::-1]
+
+    if cell_px > 1:
+        rgba = np.repeat(np.repeat(rgba, cell_px, axis=0), cell_px, axis=1)
+    return np.ascontiguousarray(rgba)
+
+
+def resample_indices(src_size, dst_size):
+    """
+    Nearest-neighbour index map for resizing one axis of a grid.
+
+    Args:
+        src_size (int): Number of cells in the source axis
+        dst_size (int): Number of pixels in the destination axis
+
+    Returns:
+        np.ndarray: dst_size indices into the source axis
+    """
+    return (np.arange(dst_size) * src_size) // dst_size
@@ -0,0 +1,79 @@
+from src.constants import *
+from collections import deque
+
+
+class TileReveal:
+    """
+    Streams freshly generated tiles into the render list as a "tunnel carving"
+    animation. Tiles are released in the order the generator produced them,
+    at a rate that drains every batch within MAP_REVEAL_DURATION, and each one
+    fades in over MAP_REVEAL_FADE seconds.
+    """
+
+    def __init__(self, duration=MAP_REVEAL_DURATION, fade=MAP_REVEAL_FADE):
+        self.duration = duration
+        self.fade = fade
+
+        self.waiting = deque()      # <-- tiles not shown yet, in carving order
+        self.fading = []            # <-- [tile, age] of tiles being faded in
+        self.rate = 0.0             # <-- tiles released per second
+        self.release = 0.0          # <-- fractional tiles owed to the next frame
+
+    def add(self, tile):
+        """Hides a new or changed tile until its turn in the reveal."""
+        tile.alpha = 0
+        self.waiting.append(tile)
+
+        # Speed up so the whole backlog still finishes within `duration`
+        self.rate = max(self.rate, len(self.waiting) / self.duration)
+
+    def iter_revealing(self, generator):
+        """
+        Wraps a step-wise map generator (see JobScheduler): every tile it yields
+        is queued for the reveal, every step is passed on.
+
+        Returns:
+            The wrapped generator's return value
+        """
+        while True:
+            try:
+                item = next(generator)
+            except StopIteration as stop:
+                return stop.value
+            if item is not None:
+                self.add(item)
+            yield
+
+    @property
+    def active(self):
+        return bool(self.waiting or self.fading)
+
+    def update(self, delta_time, background_list):
+        """
+        Releases the next tiles and advances their fade.
+
+        Args:
+            delta_time (float): Time elapsed since last frame
+            background_list (SpriteList): The list tiles are drawn from
+        """
+        if not self.active:
+            return
+
+        # 1. Release the tiles due this frame
+        self.release += self.rate * delta_time
+        while self.waiting and self.release >= 1:
+            self.release -= 1
+            tile = self.waiting.popleft()
+            if background_list not in tile.sprite_lists:
+                background_list.append(tile)     # <-- brand-new tile (map expansion)
+            self.fading.append([tile, 0.0])
+
+        if not self.waiting:
+            self.rate = 0.0
+            self.release = 0.0
+
+        # 2. Fade released tiles in
+        for entry in self.fading:
+            entry[1] += delta_time
+            entry[0].alpha = int(255 * min(1.0, entry[1] / self.fade))
+        self.fading = [entry for entry in self.fading if entry[1] < self.fade]
@@ -69,20 +69,20 @@ class LaserEffect:
 
 
 class Bullet:
-    def __init__(self, start_x, start_y, target_x, target_y, visual_effect_list, target_enemy, damage):
+    def __init__(self, start_x, start_y, target_x, target_y, flight_time, visual_effect_list):
+        """
+        Cosmetic bullet: flies from start to target in flight_time seconds.
+        The hit itself is scheduled by the tower when it fires.
+        """
         self.visual_effect_list = visual_effect_list
 
-        # Store game logic data
-        self.target_enemy = target_enemy
-        self.damage = damage
-
         self.start_x = start_x
         self.start_y = start_y
         self.current_x = start_x
         self.current_y = start_y
         self.target_x = target_x
         self.target_y = target_y
-        self.speed = BULLET_SPEED
+        self.flight_time = flight_time
 
         self.dir_x, self.dir_y = unit_direction_vector(start_x, start_y, target_x, target_y)
 
@@ -94,21 +94,14 @@ class Bullet:
         if self.can_be_removed:
             return
 
-        move_dist = self.speed * delta_time
-        self.current_x += self.dir_x * move_dist
-        self.current_y += self.dir_y * move_dist
+        # Position is a plain interpolation over the flight time
         self.time_alive += delta_time
+        progress = min(1.0, self.time_alive / self.flight_time) if self.flight_time > 0 else 1.0
+        self.current_x = self.start_x + (self.target_x - self.start_x) * progress
+        self.current_y = self.start_y + (self.target_y - self.start_y) * progress
 
         # Check Arrival
-        distance_traveled = math.hypot(self.current_x - self.start_x, self.current_y - self.start_y)
-        distance_total = math.hypot(self.target_x - self.start_x, self.target_y - self.start_y)
-
-        if distance_traveled >= distance_total:
-            # --- FIX: Deal Damage HERE (Synced with Visuals) ---
-            # We check if the enemy is still alive/valid before hitting them
-            if self.target_enemy and self.target_enemy.health > 0:
-                self.target_enemy.deal_damage(self.damage)
-
+        if progress >= 1.0:
             # Spawn Puff
             self.visual_effect_list.append(
                 SteamPuff(
@@ -134,20 +127,24 @@ class Bullet:
 
 
 class SteamBoom:
-    def __init__(self, tower, visual_effect_list):
+    def __init__(self, start_x, start_y, target_x, target_y, flight_time, visual_effect_list):
+        """
+        Cosmetic AOE shell: flies from the tower to the impact point in flight_time
+        seconds. The blast itself is scheduled by the tower when it fires.
+        """
         # initialize steam boom properties
-        self.tower = tower
-        self.start_x = tower.center_x
-        self.start_y = tower.center_y
-        self.current_x = tower.center_x
-        self.current_y = tower.center_y
-        self.target_x = tower.on_target.center_x
-        self.target_y = tower.on_target.center_y
-        self.speed = BOOM_SPEED
+        self.start_x = start_x
+        self.start_y = start_y
+        self.current_x = start_x
+        self.current_y = start_y
+        self.target_x = target_x
+        self.target_y = target_y
+        self.flight_time = flight_time
+        self.time_alive = 0.0
         self.visual_effect_list = visual_effect_list
 
         # Initialize normalized direction
-        self.dir_x, self.dir_y = 1, 1
+        self.dir_x, self.dir_y = unit_direction_vector(start_x, start_y, target_x, target_y)
 
         # initialize bullet state
         self.can_be_removed = False
@@ -158,11 +155,11 @@ class SteamBoom:
         if self.can_be_removed:
             return
 
-        # Move projectile based on adjusting direction for correct aiming
-        self.dir_x, self.dir_y = unit_direction_vector(
-            self.current_x, self.current_y, self.target_x, self.target_y)
-        self.current_x += self.dir_x * self.speed * delta_time
-        self.current_y += self.dir_y * self.speed * delta_time
+        # Position is a plain interpolation over the flight time
+        self.time_alive += delta_time
+        progress = min(1.0, self.time_alive / self.flight_time) if self.flight_time > 0 else 1.0
+        self.current_x = self.start_x + (self.target_x - self.start_x) * progress
+        self.current_y = self.start_y + (self.target_y - self.start_y) * progress
 
         # Add to trail
         self.trail.append((self.current_x, self.current_y))
@@ -170,16 +167,11 @@ class SteamBoom:
             self.trail.pop(0)
 
         # Check if reached target
-        distance_to_target = math.hypot(self.target_x - self.start_x, self.target_y - self.start_y)
-        distance_traveled = math.hypot(self.current_x - self.start_x, self.current_y - self.start_y)
-        if distance_traveled >= distance_to_target:
+        if progress >= 1.0:
             # Spawn the puff effect at target
             self.visual_effect_list.append(
                 SteamPuff(self.target_x, self.target_y, size=EXPLODE_PUFF_SIZE_AOE)
             )
-            # deal the damage
-            for enemy in self.tower.damage_enemy_list:
-                enemy.deal_damage(self.tower.damage)
             self.can_be_removed = True
 
     def draw(self):
@@ -192,6 +184,10 @@ class SteamBoom:
             arcade.draw_circle_filled(x, y, radius, (200, 200, 255, alpha))
 
         # Draw the “head” of the projectile
+        self.draw_head()
+
+    def draw_head(self):
+        """Draws only the projectile, without its trail."""
         if not self.can_be_removed:
             arcade.draw_circle_filled(self.current_x, self.current_y, 5, (255, 255, 255))
 
@@ -242,24 +238,16 @@ class CooldownEffect:
         self.max_alpha = COOLDOWN_OPACITY_LIMIT
         self.alpha = 0
 
-    def update(self):
-        """
-        Update overlay alpha based on tower cooldown.
+    def draw(self, now):
         """
-        # cooldown goes from full -> 0
-        full_cd = 1.0 / self.tower.frequency
-        cd = self.tower.cooldown
-
-        if cd > 0:
-            ratio = cd / full_cd       # 1 → 0
-            self.alpha = int(self.max_alpha * ratio)
-        else:
-            self.alpha = 0
+        Draw overlay above the tower, its alpha derived from the time the cooldown ends.
 
-    def draw(self):
-        """
-        Draw overlay above the tower.
+        Args:
+            now (float): Sim time (see CooldownQueue)
         """
+        # cooldown goes from full -> 0
+        ratio = self.tower.cooldown_left(now) * self.tower.frequency     # 1 → 0
+        self.alpha = int(self.max_alpha * ratio)
         if self.alpha <= 0:
             return
 
@@ -307,6 +295,15 @@ def draw_line_with_gradient(
 
         arcade.draw_line(x0, y0, x1, y1, color_of_x, width)
 
+def add_cosmetic_effect(visual_effect_list, effect):
+    """
+    Adds a purely visual effect (projectile sprites: the hits are scheduled
+    separately), unless there are already MAX_VISUAL_EFFECTS of them.
+    """
+    if len(visual_effect_list) < MAX_VISUAL_EFFECTS:
+        visual_effect_list.append(effect)
+
+
 def unit_direction_vector(x_start, y_start, x_target, y_target):
     """
     Calculate the unit direction vector from start to target
@@ -314,4 +311,6 @@ def unit_direction_vector(x_start, y_start, x_target, y_target):
     dx = x_target - x_start
     dy = y_target - y_start
     distance = math.hypot(dx, dy)
+    if distance == 0:
+        return 1.0, 0.0     # <-- no direction: any will do
     return dx / distance, dy / distance
\ No newline at end of file
@@ -1,6 +1,7 @@
 from src.utils.helper_functions import *
 from src.map.map_generator import Map
 from src.entities.enemy import Enemy
+from src.entities.enemy_store import EnemyStore
 from src.entities.tower import BaseTower, AOETower, LaserTower
 import arcade.gui
 import random
@@ -11,6 +12,20 @@ from src.utils.visual_effect import Bullet, LaserEffect, SteamBoom, SteamPuff
 from src.utils.shader_handler import OrbShader, BeamShader, LaserShader, SteamShader, VignetteShader
 from src.managers.sound_manager import SoundManager
 from src.ui.feedback import FloatingMessage
+from src.ui.minimap import Minimap
+from src.utils.lod_layer import BakedMapLayer
+from src.managers.map_cache import get_map_cache
+from src.managers.job_scheduler import JobScheduler
+from src.managers.cooldown_queue import CooldownQueue
+from src.managers.timing_wheel import TimingWheel
+from src.managers.damage_buffer import DamageBuffer
+from src.utils.tile_reveal import TileReveal
+from src.map.coverage_map import CoverageMap
+from src.map.flow_field import RoutePlanner
+from src.map.occupancy_grid import OccupancyGrid
+from src.map.polyline import Polyline
+from src.ui.coverage_overlay import CoverageOverlay
+import numpy as np
 
 
 class GameView(arcade.View):
@@ -26,11 +41,31 @@ class GameView(arcade.View):
         arcade.set_background_color(COLOR_BACKGROUND)
 
         self.tile_size = tile_size
-        self.map = Map(grid_width, grid_height)
+        self.scheduler = JobScheduler()     # <-- heavy work spread over frames
+        self.tile_reveal = TileReveal()     # <-- new tunnels appear over several frames
+        self.map = self.create_map(grid_width, grid_height)
+        self.minimap = Minimap(self.map)
+        self.baked_map = BakedMapLayer(self.map)     # <-- drawn instead of tiles when zoomed out
+        self.coverage = CoverageMap(self.map)         # <-- placement scores, see best_cell()
+        self.coverage_overlay = CoverageOverlay(self.coverage)
+
+        # Enemy routes between every spawn and goal, refreshed by a job after map changes
+        self.routes = {}
+        self.routes_revision = -1       # <-- terrain revision the table is up to date with (towers never block these routes)
+        self.route_polylines = {}       # <-- (spawn, goal) -> Polyline for the current route table
+        self.targeting_revision = -1     # <-- terrain revision every tower's target cells are up to date with
+        self.cooldowns = CooldownQueue()     # <-- towers cooling down, woken when their time comes
+        self.impacts = TimingWheel()         # <-- projectile hits, run at their sim time
+        self.idle_towers = []           # <-- ready towers without a target, scanned round robin
+        self.targeting_slice = 0         # <-- round-robin slice of the idle towers doing a full target scan
+        self.occupancy = OccupancyGrid()     # <-- enemies bucketed by tile, for targeting
+        self.enemy_store = EnemyStore()      # <-- enemy state in arrays, advanced in one step a frame
+        self.route_planner = RoutePlanner(self.map)     # <-- flow fields for maze mode
 
         # Game Managers
         self.game_manager = GameManager()
         self.wave_manager = WaveManager(self)
+        self.damage_buffer = DamageBuffer(self.game_manager)     # <-- hits of the frame, applied together
 
         # Sound Manager
         self.sound_manager = SoundManager()
@@ -104,11 +139,6 @@ class GameView(arcade.View):
         self.gui_camera = arcade.camera.Camera2D()
 
 
-        # Initial build
-        if self.map.spawns and self.map.goals:
-            self.map.recursive_path_generation(self.map.spawns[0], self.map.goals[0])
-            self.map.calculate_autotiling()
-
         # Initial Calls
         self.rebuild_background_list()
         self.sound_manager.start_ambience()
@@ -118,6 +148,28 @@ class GameView(arcade.View):
         self.camera_speed = 20
         self.keys_held = set()
 
+    def create_map(self, grid_width, grid_height):
+        """
+        Takes a pregenerated map from the cache, or generates one if the cache is empty.
+        Either way the cache is topped up in the background for the next game.
+
+        Returns:
+            Map: The starting map (path carved and autotiled)
+        """
+        map_cache = get_map_cache()
+        cached = map_cache.take(grid_width, grid_height, MAP_DIFFICULTY)
+
+        if cached is not None:
+            tilemap = cached.to_map()
+        else:
+            tilemap = Map(grid_width, grid_height, difficulty=MAP_DIFFICULTY)
+            if tilemap.spawns and tilemap.goals:
+                tilemap.recursive_path_generation(tilemap.spawns[0], tilemap.goals[0])
+                tilemap.calculate_autotiling()
+
+        map_cache.prefill(grid_width, grid_height, MAP_DIFFICULTY)
+        return tilemap
+
     def setup_ui(self):
         """Builds the Top Bar and the Collapsible Sidebar."""
         self.ui_manager.clear()
@@ -357,9 +409,18 @@ class GameView(arcade.View):
     def on_draw(self):
         self.clear()
 
+        # Level of detail: far out, draw the baked map and skip per-enemy details
+        low_detail = self.camera.zoom < LOD_ZOOM_THRESHOLD
+
         # 1. Draw World
         self.camera.use()
-        self.background_list.draw()
+        if low_detail:
+            self.baked_map.draw(bake_if_stale=False)
+        else:
+            self.background_list.draw()
+
+        # Placement heatmap for the tower being placed (base tower otherwise)
+        self.coverage_overlay.draw(self.selected_tower_type or "base")
 
         # Tower Glows (Behind towers)
         if self.use_shaders:
@@ -373,12 +434,20 @@ class GameView(arcade.View):
 
         # Draw Objects
         self.tower_list.draw()
-        self.enemy_list.draw()
-        self.bar_list.draw()
+        if low_detail:
+            self.draw_enemy_points()
+        else:
+            cam_x, cam_y = self.camera.position
+            half_w = self.window.width / (2 * self.camera.zoom)
+            half_h = self.window.height / (2 * self.camera.zoom)
+            self.enemy_store.sync_visuals((cam_x - half_w, cam_x + half_w, cam_y - half_h, cam_y + half_h))
+            self.enemy_list.draw()
+            self.bar_list.draw()
         self.range_display_list.draw()
 
-        for tower in self.tower_list:
-            tower.cooldown_effect.draw()
+        if not low_detail:
+            for tower in self.tower_list:
+                tower.cooldown_effect.draw(self.cooldowns.now)
 
         # --- PASS 1: VIGNETTE & STEAM (Standard Blend) ---
         if self.use_shaders:
@@ -394,7 +463,7 @@ class GameView(arcade.View):
             self.vignette_shader.render(light_sources, self.camera)
 
             # B. Steam
-            puffs = [x for x in self.visual_effect_list if isinstance(x, SteamPuff)]
+            puffs = [] if low_detail else [x for x in self.visual_effect_list if isinstance(x, SteamPuff)]
             if puffs:
                 self.steam_shader.render(puffs, self.camera)
 
@@ -417,12 +486,31 @@ class GameView(arcade.View):
 
         # 3. Draw Actual Projectile Sprites
         for vis in self.visual_effect_list:
+            if low_detail:
+                # Puffs and trails are invisible at this scale
+                if isinstance(vis, SteamPuff):
+                    continue
+                if isinstance(vis, SteamBoom):
+                    vis.draw_head()
+                    continue
             vis.draw()
 
 
         # 4. Draw Ghost & UI
         if self.selected_tower_type and len(self.ghost_list) > 0:
             wx, wy, _ = self.camera.unproject((self.window._mouse_x, self.window._mouse_y))
+
+            # Snap the ghost onto the hovered tile when over the map
+            # and tint it from the buildable mask (a single lookup)
+            hovered = self.map.world_to_grid(wx, wy)
+            if hovered is not None:
+                wx, wy = self.map.grid_to_world(*hovered)
+                if self.map.buildable_mask[hovered[1], hovered[0]]:
+                    self.ghost_list[0].color = GHOST_VALID_TINT
+                else:
+                    self.ghost_list[0].color = GHOST_INVALID_TINT
+            else:
+                self.ghost_list[0].color = GHOST_INVALID_TINT
             self.ghost_list[0].position = (wx, wy)
             self.ghost_list.draw()
 
@@ -445,6 +533,18 @@ class GameView(arcade.View):
         for msg in self.ui_messages:
             msg.draw()
 
+        # Minimap (screen space)
+        self.minimap.draw(self.camera, self.window.width, self.window.height)
+
+    def draw_enemy_points(self):
+        """Draws every enemy as a point in a single batched draw call."""
+        if not self.enemy_list:
+            return
+        points = self.enemy_store.position[:len(self.enemy_store)].tolist()
+
+        # Keep the points the same size on screen whatever the zoom
+        arcade.draw_points(points, COLOR_MINIMAP_ENEMY, LOD_ENEMY_POINT_SIZE / self.camera.zoom)
+
     def create_ghost_tower(self, tower_type):
         """Creates a semi-transparent sprite for placement preview."""
 
@@ -465,6 +565,14 @@ class GameView(arcade.View):
         self.ghost_list.append(self.ghost_sprite)
 
     def on_update(self, delta_time: float):
+        # Queued heavy work gets its slice of the frame first
+        self.schedule_refresh_jobs()
+        self.scheduler.run()
+        self.tile_reveal.update(delta_time, self.background_list)
+
+        # Minimap keeps up with map edits even while paused
+        self.minimap.update(delta_time, self.enemy_list)
+
         # Check for a paused game.
         if self.paused:
             return
@@ -472,20 +580,18 @@ class GameView(arcade.View):
         # for speeding up game.
         effective_delta = delta_time * self.game_speed
 
-        # Update all enemies
-        self.enemy_list.update(effective_delta)
+        # Update all enemies (one vectorized step)
+        self.enemy_store.update(effective_delta)
 
         if self.game_manager.lives < self.current_lives_tracker:
             self.trigger_damage_effect()
             self.current_lives_tracker = self.game_manager.lives
 
-        # Update all towers
-        self.tower_list.update(effective_delta)
-
-        # Update tower detection
-        for tower in self.tower_list:
-            tower.acquire_target(self.enemy_list)
-            tower.attack_update(effective_delta, self.visual_effect_list, self.sound_manager)
+        # Update tower detection and firing (only the towers whose cooldown ended)
+        self.cooldowns.advance(effective_delta)
+        self.update_ready_towers()
+        self.impacts.advance(self.cooldowns.now)
+        self.damage_buffer.resolve()        # <-- every hit of the frame lands here, once per enemy
 
         # Update visual effects
         for vis in self.visual_effect_list[:]:
@@ -534,18 +640,22 @@ class GameView(arcade.View):
         # (This step is often implicit if buttons consume the event, but good practice)
 
         if button == arcade.MOUSE_BUTTON_LEFT:
+            # Clicking the minimap jumps the camera there
+            jump_to = self.minimap.screen_to_world(x, y)
+            if jump_to is not None:
+                self.camera.position = jump_to
+                return
+
             # Convert mouse pos to world pos
             world_point = self.camera.unproject((x, y))
             world_x, world_y, _ = world_point
 
-            # Get sprites at point
-            sprites = arcade.get_sprites_at_point((world_x, world_y), self.background_list)
+            # Direct grid lookup (no hit test over the whole background list)
+            clicked_tile = self.map.get_tile_at(world_x, world_y)
 
-            if not sprites:
+            if clicked_tile is None:
                 return
 
-            clicked_tile = sprites[0]
-
             # --- LOGIC BRANCH ---
 
             # CASE A: BUILDING MODE (We have a blueprint selected)
@@ -563,6 +673,15 @@ class GameView(arcade.View):
                     clicked_tile.tower.toggle_range_display()
                     print(f"Toggled range for tower at {clicked_tile.grid_pos}")
 
+        elif button == arcade.MOUSE_BUTTON_RIGHT:
+            # Right clicking a tower cycles which enemy it targets
+            world_x, world_y, _ = self.camera.unproject((x, y))
+            clicked_tile = self.map.get_tile_at(world_x, world_y)
+            if clicked_tile is not None and clicked_tile.tower:
+                priority = clicked_tile.tower.cycle_priority()
+                self.sound_manager.play_sound("ui_select", volume=0.5)
+                self.show_message(f"Target: {priority.upper()}", x, y + 20, arcade.color.CYAN)
+
     def try_place_tower(self, tile, t_type="base"):
         # Get mouse coords for the message location
         mx, my = self.window._mouse_x, self.window._mouse_y
@@ -572,12 +691,26 @@ class GameView(arcade.View):
             self.show_message("Occupied!", mx, my + 20, arcade.color.RED)
             return False
 
+        # Tunnels are being carved over several frames: wait for them
+        if self.scheduler.has_jobs("map"):
+            self.sound_manager.play_sound("ui_error", volume=0.6)
+            self.show_message("Tunnels shifting!", mx, my + 20, arcade.color.RED)
+            return False
+
         if not self.game_manager.can_afford(TOWER_COST):
             self.sound_manager.play_sound("ui_error", volume=0.6)
             self.show_message("Need Money!", mx, my + 20, arcade.color.RED)
             return False
 
-        if not tile.is_valid_tower_location(self.map):
+        # Maze mode: a tunnel tile may be blocked if every route stays open
+        if MAZE_MODE and tile.get_state() == "path" and not self.map.tower_grid[tile.y, tile.x]:
+            occupied = [self.map.world_to_grid(*e.sim_position) for e in self.enemy_list]
+            if not self.route_planner.can_block(tile, occupied):
+                self.sound_manager.play_sound("ui_error", volume=0.6)
+                self.show_message("Would seal the tunnels!", mx, my + 20, arcade.color.RED)
+                return False
+
+        elif not tile.is_valid_tower_location(self.map):
             self.sound_manager.play_sound("ui_error", volume=0.6)
             self.show_message("Must be near path!", mx, my + 20, arcade.color.RED)
             return False
@@ -604,11 +737,34 @@ class GameView(arcade.View):
         elif symbol == arcade.key.F:
             self.toggle_speed()
 
+        # Toggle Minimap (M)
+        elif symbol == arcade.key.M:
+            self.minimap.toggle()
+
+        # Toggle Coverage Heatmap (C)
+        elif symbol == arcade.key.C:
+            self.coverage_overlay.toggle()
+
         # Toggle Shaders (H)
         elif symbol == arcade.key.H:
             self.use_shaders = not self.use_shaders
             print(f"Shaders: {'ON' if self.use_shaders else 'OFF'}")
 
+    def on_mouse_scroll(self, x, y, scroll_x, scroll_y):
+        """Zooms the world camera, keeping the point under the cursor fixed."""
+        old_zoom = self.camera.zoom
+        new_zoom = old_zoom * (ZOOM_STEP ** scroll_y)
+        new_zoom = max(ZOOM_MIN, min(ZOOM_MAX, new_zoom))
+        if new_zoom == old_zoom:
+            return
+
+        before_x, before_y, _ = self.camera.unproject((x, y))
+        self.camera.zoom = new_zoom
+        after_x, after_y, _ = self.camera.unproject((x, y))
+
+        cam_x, cam_y = self.camera.position
+        self.camera.position = (cam_x + before_x - after_x, cam_y + before_y - after_y)
+
     def on_key_release(self, symbol, modifiers):
         if symbol in self.keys_held:
             self.keys_held.remove(symbol)
@@ -638,20 +794,31 @@ class GameView(arcade.View):
             if self.map.goals: target_goal = self.map.goals[0]
             else: return
 
-        path_tiles = self.map.get_path_bfs(start_tile, target_goal)
-        if not path_tiles:
-            # Try to heal the map if path is missing
-            self.map.recursive_path_generation(start_tile, target_goal)
-            path_tiles = self.map.get_path_bfs(start_tile, target_goal)
-            if not path_tiles: return
+        # Maze mode: walk the goal's flow field, one step at a time
+        if MAZE_MODE:
+            enemy = Enemy(
+                path=Polyline([(start_tile.center_x, start_tile.center_y)]),     # <-- grows one cell at a time
+                game_manager=self.game_manager,
+                bar_list=self.bar_list,
+                speed=speed,
+                occupancy=self.occupancy,
+                store=self.enemy_store
+            )
+            enemy.route = (self.route_planner, target_goal)
+            self.enemy_list.append(enemy)
+            return
 
-        path_pixels = [(t.center_x, t.center_y) for t in path_tiles]
+        polyline = self.get_route_polyline(start_tile, target_goal)
+        if polyline is None:
+            return
 
         enemy = Enemy(
-            path=path_pixels,
+            path=polyline,
             game_manager=self.game_manager,
             bar_list=self.bar_list,
-            speed=speed # <--- Use the speed passed from WaveManager
+            speed=speed, # <--- Use the speed passed from WaveManager
+            occupancy=self.occupancy,
+            store=self.enemy_store
         )
 
         self.enemy_list.append(enemy)
@@ -665,42 +832,165 @@ class GameView(arcade.View):
         if not self.map.goals:
             return None
 
-        goals = self.map.goals
+        goals = []
         weights = []
 
-        for goal in goals:
-            path = self.map.get_path_bfs(start_tile, goal)
+        for goal in self.map.goals:
+            if MAZE_MODE:
+                steps = self.route_planner.distance(start_tile, goal)
+                length = None if steps is None else steps + 1
+            else:
+                path = self.get_route(start_tile, goal)
+                length = None if path is None else len(path)
 
             # Safety check: If path is None (disconnected), skip this goal
-            if path is None:
+            if length is None:
                 continue
 
-            dist = len(path) ** 1.5
+            dist = length ** 1.5
+            goals.append(goal)
             weights.append(dist)
 
+        # Every goal cut off (maze mode can seal one away)
+        if not goals:
+            return None
+
         # Select one goal based on weights
         weights = [1 / w for w in weights]
         selected_goal = random.choices(goals, weights=weights, k=1)[0]
         return selected_goal
 
+    def get_route(self, start_tile, goal):
+        """
+        Returns the walkable route between two tiles, from the route table
+        when it is up to date with the map, else by a direct BFS.
+        """
+        if self.routes_revision == self.map.terrain_revision and (start_tile, goal) in self.routes:
+            return self.routes[(start_tile, goal)]
+        return self.map.get_path_bfs(start_tile, goal)
+
+    def update_ready_towers(self):
+        """
+        Lets the towers that can fire look for a target and shoot:
+        1. Towers whose cooldown just ended scan at once (the shot goes to the best ranked enemy)
+        2. Towers still idle from earlier frames scan round robin, one slice of them per frame
+        Towers that fire go back into the cooldown queue; cooling towers cost nothing.
+        """
+        now = self.cooldowns.now
+        woken = self.cooldowns.pop_ready()
+        slice_index = self.targeting_slice
+        self.targeting_slice = (slice_index + 1) % TARGETING_SLICES
+
+        fired = False
+        for tower in woken + self.idle_towers[slice_index::TARGETING_SLICES]:
+            tower.acquire_target(self.enemy_list)
+            if tower.fire(now, self.visual_effect_list, self.sound_manager):
+                self.cooldowns.push(tower)
+                fired = True
+
+        # Whoever did not fire waits for a target
+        self.idle_towers.extend(woken)
+        if fired:
+            self.idle_towers = [tower for tower in self.idle_towers if tower.ready_at <= now]
+
+    def get_route_polyline(self, start_tile, goal):
+        """
+        Returns the route between two tiles as a Polyline, shared by every
+        enemy spawned on it while the route table is up to date.
+        """
+        key = (start_tile, goal)
+        if self.routes_revision == self.map.terrain_revision and key in self.route_polylines:
+            return self.route_polylines[key]
+
+        path_tiles = self.get_route(start_tile, goal)
+        if not path_tiles:
+            # Try to heal the map if path is missing
+            self.map.recursive_path_generation(start_tile, goal)
+            path_tiles = self.map.get_path_bfs(start_tile, goal)
+            if not path_tiles: return None
+
+        polyline = Polyline([(t.center_x, t.center_y) for t in path_tiles])
+        if self.routes_revision == self.map.terrain_revision:
+            self.route_polylines[key] = polyline
+        return polyline
+
+    def iter_compute_routes(self):
+        """Step-wise BFS of the route from every spawn to every goal."""
+        revision = self.map.terrain_revision
+        routes = {}
+        for spawn in self.map.spawns:
+            for goal in self.map.goals:
+                routes[(spawn, goal)] = yield from self.map.iter_path_bfs(spawn, goal)
+
+        # Discard the table if the map changed while it was being built
+        if self.map.terrain_revision == revision:
+            self.routes = routes
+            self.route_polylines = {}
+            self.routes_revision = revision
+
+    def schedule_refresh_jobs(self):
+        """Queues the jobs that bring caches up to date after a map change."""
+        map_busy = self.scheduler.has_jobs("map")
+
+        if (self.routes_revision != self.map.terrain_revision and not map_busy
+                and not self.scheduler.has_jobs("routes")):
+            self.scheduler.add(self.iter_compute_routes(), JOB_PRIORITY_NORMAL, tag="routes")
+
+        # The baked map is only drawn while zoomed out
+        if (self.camera.zoom < LOD_ZOOM_THRESHOLD and self.baked_map.is_stale() and not map_busy
+                and not self.scheduler.has_jobs("bake")):
+            self.scheduler.add(self.baked_map.iter_bake(), JOB_PRIORITY_LOW, tag="bake")
+
+        # Tower target cells (and sight lines) follow the tunnels
+        if (self.targeting_revision != self.map.terrain_revision and not map_busy
+                and not self.scheduler.has_jobs("targeting")):
+            self.scheduler.add(self.iter_refresh_targeting(), JOB_PRIORITY_HIGH, tag="targeting")
+
+        # The coverage heatmap is only kept fresh while shown (queries refresh on demand)
+        if (self.coverage_overlay.visible and self.coverage.is_stale() and not map_busy
+                and not self.scheduler.has_jobs("coverage")):
+            self.scheduler.add(self.coverage.iter_refresh(), JOB_PRIORITY_LOW, tag="coverage")
+
+    def iter_refresh_targeting(self):
+        """Step-wise refresh of every tower's target cells: one tower per step."""
+        revision = self.map.terrain_revision
+        for tower in list(self.tower_list):
+            tower.refresh_targeting(self.map)
+            yield
+
+        if self.map.terrain_revision == revision:
+            self.targeting_revision = revision
+
     def rebuild_background_list(self):
         """
         Rebuilds the sprite list for rendering
         """
-        self.background_list.clear()
-        self.tower_list.clear()
-        self.range_display_list.clear()
+        run_to_completion(self.iter_rebuild_background_list())
 
-        for row in self.map.map:
+    def iter_rebuild_background_list(self):
+        """
+        Step-wise rebuild_background_list: one map row per step. Tiles go into
+        a fresh list that replaces the drawn one once it is complete.
+        """
+        background_list = arcade.SpriteList()
+        for i, row in enumerate(self.map.map):
+            if i:
+                yield
             for tile in row:
                 tile.update_texture()
-                self.background_list.append(tile)
-                if tile.tower:
-                    tile.tower.update()
-                    self.tower_list.append(tile.tower)
-                    self.range_display_list.append(tile.tower.range_display)
-                    if TARGET_DOT:
-                        self.range_display_list.append(tile.tower.target_dot)
+                background_list.append(tile)
+
+        # Towers are few: gather them in the final step so none placed meanwhile is lost
+        self.tower_list.clear()
+        self.range_display_list.clear()
+        for y, x in np.argwhere(self.map.tower_grid):
+            tower = self.map.map[y][x].tower
+            self.tower_list.append(tower)
+            self.range_display_list.append(tower.range_display)
+            if TARGET_DOT:
+                self.range_display_list.append(tower.target_dot)
+
+        self.background_list = background_list
 
 
     def add_tower(self, tile, t_type="base"):
@@ -721,10 +1011,22 @@ class GameView(arcade.View):
             print("Invalid tower type!")
             return
 
-        # add tower and link it to the tile
-        tile.link_tower(tower)
+        # Blocking a tunnel: repair the flow fields, and turn back whoever was stepping in
+        if MAZE_MODE and tile.get_state() == "path":
+            self.route_planner.block(tile)
+            for enemy in self.enemy_list:
+                enemy.turn_back_from((tile.center_x, tile.center_y))
 
-        # add tower to the tower list
+        # add tower and link it to the tile
+        self.map.place_tower(tile, tower)
+        tower.occupancy = self.occupancy
+        tower.enemy_store = self.enemy_store
+        tower.impacts = self.impacts
+        tower.damage_buffer = self.damage_buffer
+        tower.refresh_targeting(self.map)
+
+        # add tower to the tower list (ready to fire at once)
+        self.idle_towers.append(tower)
         self.tower_list.append(tower)
         self.range_display_list.append(tower.range_display)
         if TARGET_DOT:
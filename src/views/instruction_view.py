@@ -54,11 +54,16 @@ class InstructionView(arcade.View):
         controls_str = (
             "CONTROLS\n\n"
             "Left Click : Place Tower / Select Tower\n"
+            "Right Click Tower : Cycle Target Priority\n"
             "Hammer Icon : Open Build Menu\n"
             "Arrow Keys : Move Camera\n"
+            "Mouse Wheel : Zoom In / Out\n"
             "P : Pause Game\n"
             "F : Fast Forward (2x)\n"
-            "H : Toggle Shaders"
+            "H : Toggle Shaders\n"
+            "M : Toggle Minimap\n"
+            "C : Toggle Placement Heatmap\n"
+            "ESC : Close Game"
         )
 
         controls = arcade.gui.UILabel(
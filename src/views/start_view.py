@@ -1,6 +1,7 @@
 import arcade
 from src.constants import *
 from src.managers.game_manager import GameManager
+from src.managers.map_cache import get_map_cache
 
 class StartView(arcade.View):
     def __init__(self):
@@ -11,6 +12,10 @@ class StartView(arcade.View):
         gm = GameManager()
         high_score = gm.load_high_score()
 
+        # Start pregenerating maps while the player is still on the menus
+        get_map_cache().prefill(
+            self.window.width // TILE_SIZE, self.window.height // TILE_SIZE, MAP_DIFFICULTY)
+
         self.title_text = arcade.Text(
             "STEAM TUNNELS DEFENSE",
             self.window.width / 2,